@@ -1,3 +1,27 @@
 from django.contrib import admin
 
+from app1.models import CrawlTask, Job, PipelineTask
+
 # Register your models here.
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('title', 'company', 'location', 'search_skill', 'search_location', 'last_seen')
+    list_filter = ('search_skill', 'search_location', 'source')
+    search_fields = ('title', 'company', 'url')
+
+
+@admin.register(PipelineTask)
+class PipelineTaskAdmin(admin.ModelAdmin):
+    list_display = ('task_id', 'status', 'stage', 'filename', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'stage')
+    search_fields = ('task_id', 'filename')
+    exclude = ('upload',)
+
+
+@admin.register(CrawlTask)
+class CrawlTaskAdmin(admin.ModelAdmin):
+    list_display = ('url', 'status', 'page', 'priority', 'jobs_found', 'attempts', 'finished_at')
+    list_filter = ('status', 'host')
+    search_fields = ('url', 'skill', 'location')
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from app1.job_search import lookup_jobs, scrape_jobs
+
+
+class SearchTimeout(Exception):
+    """Raised when a scrape does not finish within the request's timeout"""
+
+
+_executor = None
+_stream_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_scrape_executor():
+    """
+    Return the process-wide thread pool that runs blocking scrapes
+
+    Its size caps how many scrapes one ASGI process runs at a time; more
+    requests than that queue here instead of each holding a thread.
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SCRAPER_ASYNC_WORKERS', 4),
+                    thread_name_prefix='async-scrape',
+                )
+    return _executor
+
+
+def get_stream_executor():
+    """
+    Return the process-wide thread pool that steps streaming responses
+
+    Separate from the scrape executor so slow or numerous streams queue
+    among themselves instead of holding the threads scrapes need.
+    """
+    global _stream_executor
+
+    if _stream_executor is None:
+        with _executor_lock:
+            if _stream_executor is None:
+                _stream_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SCRAPER_STREAM_WORKERS', 8),
+                    thread_name_prefix='async-stream',
+                )
+    return _stream_executor
+
+
+async def search_jobs_async(skill, location="", max_results=20, timeout=None):
+    """
+    search_jobs() for async views
+
+    The cache and Job table lookups are awaited; a scrape runs on the
+    bounded scrape executor and is awaited for at most `timeout` seconds
+    (default settings.RECOMMENDATION_SCRAPE_TIMEOUT). A scrape that times
+    out keeps running and fills the cache for the next request.
+
+    Returns:
+        (jobs, tier) as from search_jobs()
+
+    Raises:
+        SearchTimeout: The scrape did not finish in time
+    """
+    found = await sync_to_async(lookup_jobs)(skill, location, max_results)
+    if found:
+        return found
+
+    if timeout is None:
+        timeout = getattr(settings, 'RECOMMENDATION_SCRAPE_TIMEOUT', 25)
+    loop = asyncio.get_running_loop()
+    scrape = loop.run_in_executor(get_scrape_executor(), _scrape, skill, location, max_results)
+    # Retrieve the outcome even if nobody awaits it any more
+    scrape.add_done_callback(lambda future: future.cancelled() or future.exception())
+    try:
+        return await asyncio.wait_for(asyncio.shield(scrape), timeout)
+    except asyncio.TimeoutError:
+        raise SearchTimeout(f"No results for '{skill}' within {timeout}s")
+
+
+def _scrape(skill, location, max_results):
+    try:
+        return scrape_jobs(skill, location, max_results)
+    finally:
+        # Executor threads outlive requests; don't leave DB connections open
+        connections.close_all()
+
+
+_DONE = object()
+
+
+async def iterate_in_executor(iterator):
+    """
+    Async iterator over a blocking iterator, each step run on the stream executor
+
+    Lets an ASGI StreamingHttpResponse send chunks as a sync generator
+    produces them (Django would otherwise read a sync iterator to the end
+    before sending anything).
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await loop.run_in_executor(get_stream_executor(), _next, iterator)
+        if item is _DONE:
+            return
+        yield item
+
+
+def _next(iterator):
+    try:
+        return next(iterator, _DONE)
+    finally:
+        connections.close_all()
@@ -0,0 +1,199 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class SQLiteCache(BaseCache):
+    """
+    On-disk cache backend shared by every worker process on a host
+
+    All processes open the same SQLite file (WAL mode), so scraped results
+    survive restarts and deploys instead of living in one worker's
+    LocMemCache. Values are pickled and zlib-compressed once they pass
+    COMPRESS_MIN_BYTES. Every CULL_EVERY writes the expired entries are
+    dropped and, when the stored payload has grown past MAX_SIZE bytes (or
+    the table past MAX_ENTRIES rows), the least recently read entries are
+    evicted; in between, writes do not scan the table.
+
+    OPTIONS:
+        MAX_SIZE: Upper bound on stored payload bytes (default 64 MB); it
+                  can be overshot by up to CULL_EVERY writes between culls
+        MAX_ENTRIES: Upper bound on entries (default: no limit)
+        CULL_EVERY: Writes per process between culls (default 100)
+        COMPRESS_MIN_BYTES: Smaller payloads are stored uncompressed (default 512)
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    # Only rewrite the LRU timestamp on read when it is older than this, so a
+    # hot key does not turn every get() into a write
+    touch_interval = 60
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = os.path.abspath(str(location))
+        self._max_size = int(options.get('MAX_SIZE', 64 * 1024 * 1024))
+        self._max_entries = int(options['MAX_ENTRIES']) if 'MAX_ENTRIES' in options else None
+        self._cull_every = max(1, int(options.get('CULL_EVERY', 100)))
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._compress_min = int(options.get('COMPRESS_MIN_BYTES', 512))
+        self._local = threading.local()
+
+    def _connection(self):
+        # Connections must not cross a fork, so tie them to the pid as well
+        # as the thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                ' key TEXT PRIMARY KEY,'
+                ' value BLOB NOT NULL,'
+                ' compressed INTEGER NOT NULL,'
+                ' size INTEGER NOT NULL,'
+                ' expires REAL,'
+                ' accessed REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)')
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _encode(self, value):
+        data = pickle.dumps(value, self.pickle_protocol)
+        if len(data) >= self._compress_min:
+            return zlib.compress(data), 1
+        return data, 0
+
+    def _decode(self, data, compressed):
+        if compressed:
+            data = zlib.decompress(data)
+        return pickle.loads(data)
+
+    def _full_key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def get(self, key, default=None, version=None):
+        key = self._full_key(key, version)
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT value, compressed, expires, accessed FROM cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return default
+
+        value, compressed, expires, accessed = row
+        if expires is not None and expires <= now:
+            self._connection().execute('DELETE FROM cache WHERE key = ? AND expires <= ?', (key, now))
+            return default
+
+        if now - accessed > self.touch_interval:
+            self._connection().execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, key))
+        return self._decode(value, compressed)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._write(key, value, timeout, version, replace=True)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._write(key, value, timeout, version, replace=False)
+
+    def _write(self, key, value, timeout, version, replace):
+        key = self._full_key(key, version)
+        expires = self.get_backend_timeout(timeout)
+        data, compressed = self._encode(value)
+        now = time.time()
+        conn = self._connection()
+
+        with _transaction(conn):
+            if not replace:
+                # add() may overwrite an entry that has already expired
+                row = conn.execute(
+                    'SELECT expires FROM cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and (row[0] is None or row[0] > now):
+                    return False
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, compressed, size, expires, accessed)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (key, data, compressed, len(data), expires, now)
+            )
+            if self._cull_due():
+                self._cull(conn, now)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._full_key(key, version)
+        now = time.time()
+        cursor = self._connection().execute(
+            'UPDATE cache SET expires = ?, accessed = ?'
+            ' WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), now, key, now)
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self._full_key(key, version)
+        cursor = self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self._full_key(key, version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+    def _cull_due(self):
+        with self._writes_lock:
+            self._writes += 1
+            return self._writes % self._cull_every == 0
+
+    def _cull(self, conn, now):
+        conn.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        max_entries = self._max_entries if self._max_entries is not None else entries
+        if size <= self._max_size and entries <= max_entries:
+            return
+        # Keep the most recently read entries that fit in both limits
+        conn.execute(
+            'DELETE FROM cache WHERE key IN ('
+            ' SELECT key FROM ('
+            '  SELECT key,'
+            '   SUM(size) OVER (ORDER BY accessed DESC, key) AS running,'
+            '   ROW_NUMBER() OVER (ORDER BY accessed DESC, key) AS position'
+            '  FROM cache'
+            ' ) WHERE running > ? OR position > ?)',
+            (self._max_size, max_entries)
+        )
+
+
+class _transaction:
+    """BEGIN IMMEDIATE ... COMMIT on an autocommit sqlite3 connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
@@ -0,0 +1,308 @@
+import threading
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from app1.incremental import apply_delta, parse_page
+from app1.job_search import get_http_scraper
+from app1.models import CrawlTask
+from app1.naukri_scrapper import search_cache_key
+from app1.pipeline import worker_name
+
+
+class HostLimiter:
+    """
+    Per-host politeness for one crawler process
+
+    Request starts to a host are spaced at least 1/rate seconds apart and
+    at most `concurrency` requests to it are in flight. back_off() pushes
+    the host's next start out, e.g. after a 429 or a CAPTCHA.
+    """
+
+    def __init__(self, rate=0.5, concurrency=2):
+        """
+        Args:
+            rate: Requests started per second per host (0 = no spacing)
+            concurrency: Requests in flight per host
+        """
+        self.interval = 1.0 / rate if rate else 0
+        self.concurrency = concurrency
+        self._lock = threading.Lock()
+        self._next_start = defaultdict(float)
+        self._slots = defaultdict(lambda: threading.BoundedSemaphore(self.concurrency))
+
+    @contextmanager
+    def slot(self, host):
+        with self._lock:
+            slots = self._slots[host]
+        slots.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start[host])
+                self._next_start[host] = start + self.interval
+            time.sleep(max(0, start - now))
+            yield
+        finally:
+            slots.release()
+
+    def back_off(self, host, seconds):
+        with self._lock:
+            self._next_start[host] = max(self._next_start[host], time.monotonic() + seconds)
+
+
+def shard_key(skill, location=""):
+    """Stable hash of a normalized search; every page of a search lands on one shard"""
+    return zlib.crc32(search_cache_key(skill, location).encode('utf-8'))
+
+
+def enqueue_search(skill, location="", max_results=None, priority=0, recrawl=False):
+    """
+    Add a search's first results page to the frontier
+
+    A search already in the frontier is left alone unless recrawl is set,
+    which queues its first page again.
+
+    Returns:
+        (task, created)
+    """
+    max_results = max_results or getattr(settings, 'CRAWL_MAX_RESULTS', 100)
+    url = get_http_scraper()._build_search_url(skill, location)
+    defaults = {
+        'host': urlsplit(url).netloc,
+        'skill': skill,
+        'location': location,
+        'page': 1,
+        'max_results': max_results,
+        'priority': priority,
+        'shard_key': shard_key(skill, location),
+    }
+    task, created = CrawlTask.objects.get_or_create(url=url, defaults=defaults)
+    if not created and recrawl and task.status != CrawlTask.RUNNING:
+        CrawlTask.objects.filter(id=task.id).update(
+            status=CrawlTask.QUEUED, attempts=0, error='', not_before=None,
+            max_results=max_results, priority=priority,
+        )
+    return task, created
+
+
+def claim_next(worker, shard=0, shards=1):
+    """
+    Atomically take the most urgent queued page of this shard, or return None
+
+    Highest priority first, then oldest. Pages backing off (not_before in
+    the future) are skipped.
+    """
+    now = timezone.now()
+    queued = CrawlTask.objects.filter(status=CrawlTask.QUEUED).filter(
+        Q(not_before__isnull=True) | Q(not_before__lte=now)
+    )
+    if shards > 1:
+        queued = queued.annotate(shard=Mod(F('shard_key'), shards)).filter(shard=shard)
+
+    while True:
+        candidate = queued.order_by('-priority', 'created_at', 'id').values_list('id', flat=True).first()
+        if candidate is None:
+            return None
+
+        claimed = CrawlTask.objects.filter(id=candidate, status=CrawlTask.QUEUED).update(
+            status=CrawlTask.RUNNING, worker=worker, heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return CrawlTask.objects.get(id=candidate)
+
+
+def requeue_stale(timeout=None):
+    """Give pages whose worker died mid-fetch back to the frontier; returns how many"""
+    timeout = timeout or getattr(settings, 'CRAWL_TASK_TIMEOUT', 120)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return CrawlTask.objects.filter(status=CrawlTask.RUNNING, heartbeat_at__lt=cutoff).update(
+        status=CrawlTask.QUEUED, worker='',
+    )
+
+
+def frontier_stats():
+    """Page counts per status"""
+    counts = {status: 0 for status, _ in CrawlTask.STATUS_CHOICES}
+    for row in CrawlTask.objects.values('status').annotate(count=Count('id')):
+        counts[row['status']] = row['count']
+    return counts
+
+
+class Crawler:
+    """
+    Works through the crawl frontier with a small thread pool
+
+    Each page is fetched over plain HTTP (the Selenium tier is left to
+    interactive searches) and parsed incrementally against its last crawl
+    (see app1/incremental.py): only new or changed listings are upserted
+    into the Job table and vanished ones are flagged. The next page of the
+    search is queued while the search is short of max_results. Blocked,
+    CAPTCHA and error responses back off the host and retry the page later,
+    up to max_attempts fetches.
+    """
+
+    def __init__(self, workers=4, shard=0, shards=1, limiter=None, scraper=None,
+                 max_pages=10, max_attempts=3, retry_delay=60, poll=2):
+        """
+        Args:
+            workers: Pages fetched in parallel
+            shard, shards: Only crawl searches whose shard_key % shards == shard
+            limiter: HostLimiter (default: from settings)
+            scraper: HttpNaukriScraper (default: the process-wide one)
+            max_pages: Never follow a search past this page
+            max_attempts: Fetches of one page before it is marked failed
+            retry_delay: Seconds before retrying a failed page (doubles per attempt)
+            poll: Seconds between frontier checks when idle
+        """
+        self.workers = workers
+        self.shard = shard
+        self.shards = shards
+        self.limiter = limiter or HostLimiter(
+            rate=getattr(settings, 'CRAWL_HOST_RATE', 0.5),
+            concurrency=getattr(settings, 'CRAWL_HOST_CONCURRENCY', 2),
+        )
+        self.scraper = scraper or get_http_scraper()
+        self.max_pages = max_pages
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll = poll
+
+        self.name = worker_name()
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._stop = threading.Event()
+        self.stats = defaultdict(int)
+
+    def run(self, until_empty=True):
+        """
+        Crawl until stop() is called or, with until_empty, until this
+        shard's frontier has nothing left to fetch right now
+        """
+        requeue_stale()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='crawl') as executor:
+            for _ in range(self.workers):
+                executor.submit(self._work, until_empty)
+        return dict(self.stats)
+
+    def stop(self):
+        self._stop.set()
+
+    def _work(self, until_empty):
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    task = claim_next(self.name, self.shard, self.shards)
+                    if task is not None:
+                        self._busy += 1
+                    idle = task is None and self._busy == 0
+
+                if task is None:
+                    # Another thread may still queue a next page
+                    if until_empty and idle:
+                        return
+                    time.sleep(0.2 if until_empty else self.poll)
+                    continue
+
+                try:
+                    self.crawl(task)
+                except Exception as e:
+                    print(f"❌ Crawl of {task.url} failed: {e}")
+                    self._retry(task, str(e))
+                finally:
+                    with self._lock:
+                        self._busy -= 1
+        finally:
+            connections.close_all()
+
+    def crawl(self, task):
+        """Fetch one claimed page, store what changed and extend the frontier"""
+        with self.limiter.slot(task.host):
+            html, reason = self.scraper.fetch_page(task.skill, task.location, task.page)
+
+        delta = None
+        if html is not None:
+            delta = parse_page(self.scraper, html, {
+                'page_hash': task.page_hash, 'containers': task.containers,
+            })
+            reason = delta['reason']
+
+        if reason in ('blocked', 'captcha', 'error'):
+            self.limiter.back_off(task.host, self.retry_delay)
+            self._retry(task, reason)
+            return
+
+        counts = apply_delta(delta, task.skill, task.location)
+        listed = len(delta['fingerprints'])
+        found = task.found_before + listed
+        self._bump('pages')
+        self._bump('pages_parsed' if delta['page_changed'] else 'pages_skipped')
+        self._bump('jobs', listed)
+        self._bump('listings_parsed', delta['parsed'])
+        self._bump('listings_skipped', delta['skipped'])
+        self._bump('disappeared', counts['disappeared'])
+
+        with transaction.atomic():
+            CrawlTask.objects.filter(id=task.id).update(
+                status=CrawlTask.DONE, jobs_found=listed, error='', finished_at=timezone.now(),
+                page_hash=delta['page_hash'], containers=delta['containers'],
+            )
+            # An empty page is the end of the results
+            if listed and found < task.max_results and task.page < self.max_pages:
+                self._queue_next_page(task, found)
+
+        state = 'unchanged' if not delta['page_changed'] else f"{delta['parsed']} parsed, {delta['skipped']} unchanged"
+        print(f"🕷️ {task.url}: {listed} jobs, {state} ({found}/{task.max_results})")
+
+    def _queue_next_page(self, task, found):
+        page = task.page + 1
+        try:
+            with transaction.atomic():
+                CrawlTask.objects.create(
+                    url=self.scraper._build_search_url(task.skill, task.location, page),
+                    host=task.host,
+                    skill=task.skill,
+                    location=task.location,
+                    page=page,
+                    max_results=task.max_results,
+                    found_before=found,
+                    # Deeper pages wait behind first pages of other searches
+                    priority=task.priority - 1,
+                    shard_key=task.shard_key,
+                )
+        except IntegrityError:
+            # Crawled before: queue it again with the new running total
+            CrawlTask.objects.filter(
+                url=self.scraper._build_search_url(task.skill, task.location, page)
+            ).exclude(status=CrawlTask.RUNNING).update(
+                status=CrawlTask.QUEUED, attempts=0, error='', not_before=None,
+                max_results=task.max_results, found_before=found, priority=task.priority - 1,
+            )
+
+    def _retry(self, task, error):
+        self._bump('retries')
+        if task.attempts >= self.max_attempts:
+            self._bump('failed')
+            CrawlTask.objects.filter(id=task.id).update(
+                status=CrawlTask.FAILED, error=error, finished_at=timezone.now(),
+            )
+            return
+        delay = self.retry_delay * 2 ** (task.attempts - 1)
+        CrawlTask.objects.filter(id=task.id).update(
+            status=CrawlTask.QUEUED, error=error, worker='',
+            not_before=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def _bump(self, counter, amount=1):
+        with self._lock:
+            self.stats[counter] += amount
@@ -0,0 +1,188 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from queue import LifoQueue, Empty
+
+from django.conf import settings
+
+from app1.naukri_scrapper import SeleniumNaukriScraper
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no browser becomes free within the checkout timeout"""
+
+
+class _PooledScraper:
+    """A warm scraper plus the bookkeeping needed to decide when to recycle it"""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.created_at = time.monotonic()
+
+
+class DriverPool:
+    """
+    Bounded, process-wide pool of warm SeleniumNaukriScraper instances
+
+    Starting Chrome (driver download check, browser launch, CDP setup) costs
+    several seconds, so browsers are kept alive between requests and handed
+    out with checkout()/checkin() or the scraper() context manager.
+    """
+
+    def __init__(self, size=2, max_pages=50, max_age=1800, checkout_timeout=60, headless=True, factory=None):
+        """
+        Args:
+            size: Maximum number of browsers alive at the same time
+            max_pages: Recycle a browser after it has loaded this many pages
+            max_age: Recycle a browser after this many seconds
+            checkout_timeout: Seconds to wait for a free browser
+            headless: Passed through to SeleniumNaukriScraper
+            factory: Callable starting a new scraper (default:
+                     SeleniumNaukriScraper(headless=headless))
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.checkout_timeout = checkout_timeout
+        self.headless = headless
+        self.factory = factory or (lambda: SeleniumNaukriScraper(headless=self.headless))
+
+        # LIFO so the most recently used (hottest) browser is handed out first
+        self._idle = LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'crashed': 0,
+            'timeouts': 0,
+        }
+
+    def checkout(self, timeout=None):
+        """Take a healthy browser from the pool, starting one if none is idle"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            self._bump('timeouts')
+            raise DriverPoolTimeout(f"No browser available after {timeout}s")
+
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except Empty:
+                    return self._spawn()
+
+                if self._is_usable(pooled):
+                    self._bump('reused')
+                    return pooled
+
+                self._discard(pooled, 'crashed')
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, pooled):
+        """Return a browser to the pool, recycling it if it is worn out or broken"""
+        try:
+            if self._closed or not pooled.scraper.is_alive():
+                self._discard(pooled, 'crashed')
+            elif not self._is_fresh(pooled):
+                self._discard(pooled, 'recycled')
+            else:
+                try:
+                    pooled.scraper.reset_session()
+                except Exception as e:
+                    print(f"⚠️ Could not reset browser state: {e}")
+                    self._discard(pooled, 'crashed')
+                else:
+                    self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def scraper(self):
+        """Context manager yielding a warm SeleniumNaukriScraper"""
+        pooled = self.checkout()
+        try:
+            yield pooled.scraper
+        finally:
+            self.checkin(pooled)
+
+    def warm(self, count=1):
+        """Start browsers ahead of the first request"""
+        count = min(count, self.size)
+        started = []
+        try:
+            for _ in range(count):
+                started.append(self.checkout())
+        finally:
+            for pooled in started:
+                self.checkin(pooled)
+
+    def close_all(self):
+        """Quit every idle browser; browsers in use are quit on checkin"""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except Empty:
+                break
+            pooled.scraper.close()
+
+    def _spawn(self):
+        pooled = _PooledScraper(self.factory())
+        self._bump('created')
+        return pooled
+
+    def _is_fresh(self, pooled):
+        if pooled.scraper.pages_loaded >= self.max_pages:
+            return False
+        return time.monotonic() - pooled.created_at < self.max_age
+
+    def _is_usable(self, pooled):
+        return self._is_fresh(pooled) and pooled.scraper.is_alive()
+
+    def _discard(self, pooled, reason):
+        self._bump(reason)
+        pooled.scraper.close()
+
+    def _bump(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide DriverPool, creating it from settings on first use"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DriverPool(
+                    size=getattr(settings, 'SCRAPER_POOL_SIZE', 2),
+                    max_pages=getattr(settings, 'SCRAPER_POOL_MAX_PAGES', 50),
+                    max_age=getattr(settings, 'SCRAPER_POOL_MAX_AGE', 1800),
+                    checkout_timeout=getattr(settings, 'SCRAPER_POOL_CHECKOUT_TIMEOUT', 60),
+                )
+                atexit.register(_pool.close_all)
+
+                prewarm = getattr(settings, 'SCRAPER_POOL_PREWARM', 0)
+                if prewarm:
+                    threading.Thread(target=_pool.warm, args=(prewarm,), daemon=True).start()
+
+    return _pool
+
+
+def pool_stats():
+    """Counters of the process-wide pool, without starting it"""
+    if _pool is None:
+        return {}
+    with _pool._lock:
+        return dict(_pool.stats)
@@ -0,0 +1,251 @@
+import atexit
+import io
+import multiprocessing
+import signal
+import threading
+import time
+import weakref
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from app1.resume_text import ExtractionTimeout, collect_text, iter_text_chunks, join_text
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the timeouts apply
+    resource = None
+
+
+class ExtractionError(Exception):
+    """Raised when a resume yields no text (parse error, limit hit, crashed worker)"""
+
+
+def _init_worker(memory_limit):
+    if resource is not None and memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    def on_timer(signum, frame):
+        raise ExtractionTimeout()
+
+    signal.signal(signal.SIGALRM, on_timer)
+    signal.signal(signal.SIGPROF, on_timer)
+
+
+def _extract(name, data, max_pages, max_chars, timeout, cpu_time):
+    """
+    Extract one file inside a pool process
+
+    Wall-clock (SIGALRM) and CPU (SIGPROF) timers interrupt the parser;
+    whatever text was read before that is returned with 'timed_out' set.
+    """
+    file = io.BytesIO(data)
+    file.name = name
+    chunks = []
+    result = {'timed_out': False, 'truncated': False, 'error': None}
+
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    signal.setitimer(signal.ITIMER_PROF, cpu_time)
+    try:
+        result['truncated'] = collect_text(iter_text_chunks(file, max_pages), chunks, max_chars)
+    except ExtractionTimeout:
+        result['timed_out'] = True
+    except MemoryError:
+        result['error'] = "File needs too much memory to extract"
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.setitimer(signal.ITIMER_PROF, 0)
+
+    result['text'] = join_text(chunks, max_chars)
+    return result
+
+
+def text_or_raise(result, name):
+    """Text of an ExtractionPool.extract() result, raising ExtractionError if there is none"""
+    if result['timed_out']:
+        print(f"⚠️ Extraction of {name} timed out after {result['elapsed']}s; "
+              f"keeping {len(result['text'])} chars")
+        if not result['text']:
+            raise ExtractionError("Timed out reading the file")
+    if result['error']:
+        raise ExtractionError(result['error'])
+    return result['text']
+
+
+class ExtractionPool:
+    """
+    Resume text extraction in separate, resource-limited processes
+
+    A malformed or huge upload can keep PyPDF2 busy for a long time or
+    balloon its memory. Here each file runs in a pool process with an
+    address-space rlimit, wall-clock and CPU timers, and page and character
+    caps, so the request thread only waits up to `timeout` seconds. A
+    worker that ignores its timers (stuck in C code) or dies is killed and
+    the pool is rebuilt.
+
+    A ProcessPoolExecutor cannot lose one process without failing every
+    task in it, so killing a stuck worker also fails the files its
+    siblings were extracting; those are resubmitted to the new pool. Any
+    other crash is retried once before the file is reported.
+    """
+
+    # Resubmissions of a file whose pool broke under it
+    max_attempts = 3
+
+    def __init__(self, workers=2, timeout=10, cpu_time=10, memory_limit=1024 * 1024 * 1024,
+                 max_pages=50, max_chars=100000, grace=2):
+        """
+        Args:
+            workers: Extraction processes
+            timeout: Wall-clock seconds per file
+            cpu_time: CPU seconds per file
+            memory_limit: Address-space limit of each process in bytes (0 = none)
+            max_pages: PDF pages read per file
+            max_chars: Characters kept per file
+            grace: Extra seconds before a silent worker is killed
+        """
+        self.workers = workers
+        self.timeout = timeout
+        self.cpu_time = cpu_time
+        self.memory_limit = memory_limit
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.grace = grace
+
+        self._lock = threading.Lock()
+        self._executor = None
+        # Executors killed because a task in them timed out
+        self._killed = weakref.WeakSet()
+        self.stats = {'extracted': 0, 'timed_out': 0, 'truncated': 0, 'errors': 0, 'recycled': 0, 'retried': 0}
+
+    def extract(self, file):
+        """
+        Extract one uploaded file
+
+        Returns:
+            {'text', 'timed_out', 'truncated', 'error', 'elapsed'}
+        """
+        data = file.read()
+        file.seek(0)
+
+        started = time.perf_counter()
+        result = None
+        crashes = 0
+        for _ in range(self.max_attempts):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(
+                    _extract, file.name, data,
+                    self.max_pages, self.max_chars, self.timeout, self.cpu_time
+                )
+                result = future.result(timeout=self.timeout + self.grace)
+            except FutureTimeout:
+                self._recycle(executor, killed=True)
+                result = {'text': '', 'timed_out': True, 'truncated': False, 'error': None}
+            except (BrokenProcessPool, CancelledError, RuntimeError):
+                # The pool was killed for another file's timeout (or shut
+                # down under this submit), or crashed on a file that may
+                # have been another one: try again on the new pool
+                crashes += executor not in self._killed
+                self._recycle(executor)
+                if crashes < 2:
+                    with self._lock:
+                        self.stats['retried'] += 1
+                    continue
+            break
+        if result is None:
+            result = {'text': '', 'timed_out': False, 'truncated': False, 'error': "Extraction worker crashed"}
+        result['elapsed'] = round(time.perf_counter() - started, 3)
+
+        with self._lock:
+            self.stats['extracted'] += 1
+            self.stats['timed_out'] += result['timed_out']
+            self.stats['truncated'] += result['truncated']
+            self.stats['errors'] += result['error'] is not None
+        return result
+
+    def extract_text(self, file):
+        """
+        Drop-in for extract_text_from_file(); a timeout returns the partial text
+
+        Raises:
+            ExtractionError: Nothing could be extracted
+        """
+        return text_or_raise(self.extract(file), file.name)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # forkserver children start clean instead of copying a
+                # threaded web worker (and its loaded models)
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else None)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context,
+                    initializer=_init_worker, initargs=(self.memory_limit,)
+                )
+            return self._executor
+
+    def _recycle(self, executor, killed=False):
+        with self._lock:
+            if killed:
+                self._killed.add(executor)
+            if self._executor is not executor:
+                return  # another thread already replaced it
+            self._executor = None
+            self.stats['recycled'] += 1
+        # ProcessPoolExecutor cannot cancel a running task; kill its processes
+        for process in list(getattr(executor, '_processes', {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """Return the process-wide ExtractionPool, created from settings on first use"""
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractionPool(
+                    workers=getattr(settings, 'RESUME_EXTRACTION_WORKERS', 2),
+                    timeout=getattr(settings, 'RESUME_EXTRACTION_TIMEOUT', 10),
+                    cpu_time=getattr(settings, 'RESUME_EXTRACTION_CPU_TIME', 10),
+                    memory_limit=getattr(settings, 'RESUME_EXTRACTION_MEMORY_LIMIT', 1024 * 1024 * 1024),
+                    max_pages=getattr(settings, 'RESUME_EXTRACTION_MAX_PAGES', 50),
+                    max_chars=getattr(settings, 'RESUME_EXTRACTION_MAX_CHARS', 100000),
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+
+def close_extraction_pool():
+    """
+    Stop the process-wide pool's workers, if it was started
+
+    atexit covers normal interpreter exit; multiprocessing children skip
+    atexit and must call this before returning.
+    """
+    if _pool is not None:
+        _pool.close()
+
+
+def extraction_stats():
+    """Counters of the process-wide pool, without starting it"""
+    if _pool is None:
+        return {}
+    with _pool._lock:
+        return dict(_pool.stats)
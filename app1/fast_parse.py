@@ -0,0 +1,43 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+from django.conf import settings
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # fast parse mode needs lxml; without it pages use html.parser
+    lxml = None
+
+
+def fast_parse_enabled():
+    """settings.SCRAPER_FAST_PARSE, when lxml is installed"""
+    return lxml is not None and getattr(settings, 'SCRAPER_FAST_PARSE', True)
+
+
+def container_strainer(selectors):
+    """
+    SoupStrainer keeping only tags whose class could match the selectors
+
+    Handles the '.name' and '[class*="name"]' forms the listing container
+    selectors use; the strained tree keeps each matching tag with all its
+    descendants, so field selectors still work inside it.
+    """
+    names = set()
+    for selector in selectors:
+        names.update(re.findall(r'\.([\w-]+)', selector))
+        names.update(re.findall(r'\[class\*="([\w-]+)"\]', selector))
+    pattern = re.compile('|'.join(re.escape(name) for name in sorted(names)))
+    return SoupStrainer(attrs={'class': pattern})
+
+
+def listings_soup(html, strainer):
+    """Parse only the listing containers of a page with lxml"""
+    return BeautifulSoup(html, 'lxml', parse_only=strainer)
+
+
+def visible_text(html):
+    """Page text without scripts and styles, read straight from the HTML with lxml"""
+    document = lxml.html.document_fromstring(html)
+    etree.strip_elements(document, 'script', 'style', 'noscript', with_tail=False)
+    return document.text_content()
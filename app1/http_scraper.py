@@ -0,0 +1,117 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app1.naukri_scrapper import NaukriParser
+
+
+class HttpNaukriScraper(NaukriParser):
+    """
+    Lightweight Naukri.com fetcher using plain HTTP
+
+    Reuses one keep-alive requests.Session (with a pooled adapter) across
+    searches and feeds the response into the same _extract_jobs parser as
+    the Selenium scraper. It never falls back to guessed or sample data:
+    when the page is blocked or has no job containers it reports why, so
+    the caller can escalate to a real browser.
+    """
+
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Connection': 'keep-alive',
+    }
+
+    def __init__(self, base_url="https://www.naukri.com", timeout=10, pool_size=10):
+        """
+        Args:
+            base_url: Site root; point it at a local server to test offline
+            timeout: Seconds per request (connect and read)
+            pool_size: Keep-alive connections kept per host
+        """
+        super().__init__(base_url)
+        self.timeout = timeout
+
+        retry = Retry(total=1, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def search_jobs(self, skill, location="", max_results=20, page=1):
+        """
+        Fetch and parse one search results page
+
+        Returns:
+            (jobs, escalate_reason) where escalate_reason is None when jobs
+            were found, otherwise 'error', 'blocked', 'captcha' or 'empty'
+        """
+        return drain(self.iter_search(skill, location, max_results, page))
+
+    def iter_search(self, skill, location="", max_results=20, page=1):
+        """
+        Generator form of search_jobs(): yields each job as it is parsed
+
+        The escalate reason is the generator's return value (None when any
+        job was yielded), so `reason = yield from scraper.iter_search(...)`
+        gets it.
+        """
+        html, reason = self.fetch_page(skill, location, page)
+        if reason:
+            return reason
+
+        found = 0
+        for soup in self.page_soups(html):
+            for job in self.iter_jobs(soup, max_results, allow_manual=False):
+                found += 1
+                yield job
+            if found:
+                return None
+        return self.page_reason(soup)
+
+    def fetch_page(self, skill, location="", page=1):
+        """
+        Download one search results page without parsing it
+
+        Returns:
+            (html, None) or (None, 'error' / 'blocked')
+        """
+        search_url = self._build_search_url(skill, location, page)
+        print(f"🌐 HTTP fetch: {search_url}")
+
+        try:
+            response = self.session.get(search_url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"⚠️ HTTP fetch failed: {e}")
+            return None, 'error'
+
+        if response.status_code in (403, 429):
+            return None, 'blocked'
+        if response.status_code != 200:
+            return None, 'error'
+        return response.text, None
+
+    def page_reason(self, soup):
+        """Escalate reason for a page without job containers: 'captcha' or 'empty'"""
+        # Raw HTML carries things like <meta name="robots">, so only look at
+        # the visible text when deciding whether we hit a bot wall
+        if self._is_captcha_text(soup.get_text(' ')):
+            return 'captcha'
+        return 'empty'
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+
+def drain(generator):
+    """Run a generator to the end; returns (items, its return value)"""
+    items = []
+    while True:
+        try:
+            items.append(next(generator))
+        except StopIteration as stop:
+            return items, stop.value
@@ -0,0 +1,104 @@
+import hashlib
+
+from app1 import job_store
+from app1.http_scraper import drain
+from app1.job_store import job_fingerprint
+
+
+def page_hash(html):
+    return hashlib.sha1(html.encode('utf-8')).hexdigest()
+
+
+def parse_page(scraper, html, previous=None):
+    """
+    Parse a results page, reusing whatever an earlier crawl already parsed
+
+    An identical page is not parsed at all. Otherwise every listing
+    container is hashed and only containers not seen last time go through
+    _parse_job_element. The whole page is always parsed, never just the
+    first max_results listings: a listing pushed down the page has not
+    disappeared. Callers cut the result down themselves.
+
+    Args:
+        scraper: HttpNaukriScraper (parser and CAPTCHA check)
+        previous: {'page_hash', 'containers': {container hash: fingerprint}}
+                  from the last crawl of this page, or None
+
+    Returns:
+        {
+            'page_hash', 'containers': new {hash: fingerprint} map,
+            'page_changed': False when the page is byte-for-byte the same,
+            'fingerprints': every listing on the page, in page order,
+            'new_jobs': {fingerprint: job} for containers parsed this time,
+            'disappeared': fingerprints listed last time but not now,
+            'parsed', 'skipped': containers parsed / reused,
+            'reason': None, or 'captcha' / 'empty' when there are no listings
+        }
+    """
+    return drain(iter_page(scraper, html, previous))[1]
+
+
+def iter_page(scraper, html, previous=None):
+    """
+    Generator form of parse_page(): yields (fingerprint, job) for each
+    listing in page order as it is reached, job being None for a listing
+    reused from `previous`, and returns parse_page()'s delta
+    """
+    previous = previous or {}
+    known = previous.get('containers') or {}
+    digest = page_hash(html)
+
+    if known and digest == previous.get('page_hash'):
+        fingerprints = list(known.values())
+        for fingerprint in fingerprints:
+            yield fingerprint, None
+        return {
+            'page_hash': digest, 'containers': known, 'page_changed': False,
+            'fingerprints': fingerprints, 'new_jobs': {}, 'disappeared': set(),
+            'parsed': 0, 'skipped': len(fingerprints), 'reason': None,
+        }
+
+    containers = {}
+    fingerprints = []
+    new_jobs = {}
+    for soup in scraper.page_soups(html):
+        for container_hash, job in scraper.iter_job_tuples(soup, None, known=known):
+            if job is None:
+                fingerprint = known[container_hash]
+            else:
+                fingerprint = job_fingerprint(job)
+                new_jobs[fingerprint] = job
+            containers[container_hash] = fingerprint
+            fingerprints.append(fingerprint)
+            yield fingerprint, job
+        if fingerprints:
+            break
+
+    return {
+        'page_hash': digest, 'containers': containers, 'page_changed': True,
+        'fingerprints': fingerprints, 'new_jobs': new_jobs,
+        'disappeared': set(known.values()) - set(fingerprints),
+        'parsed': len(new_jobs), 'skipped': len(fingerprints) - len(new_jobs),
+        'reason': None if fingerprints else scraper.page_reason(soup),
+    }
+
+
+def apply_delta(delta, skill, location=""):
+    """
+    Write only what changed to the Job table
+
+    New or edited listings are upserted, unchanged ones just get last_seen
+    bumped, and listings that vanished are flagged disappeared for this
+    search only (see job_store.mark_disappeared).
+
+    Returns:
+        {'written', 'touched', 'disappeared'} counts
+    """
+    new_jobs = delta['new_jobs']
+    written = job_store.upsert_jobs(list(new_jobs.values()), skill, location) if new_jobs else 0
+    unchanged = [fingerprint for fingerprint in delta['fingerprints'] if fingerprint not in new_jobs]
+    return {
+        'written': written,
+        'touched': job_store.touch_jobs(unchanged),
+        'disappeared': job_store.mark_disappeared(delta['disappeared'], skill, location),
+    }
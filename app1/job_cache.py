@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from app1.naukri_scrapper import search_cache_key
+
+
+def get_entry(skill, location=""):
+    """
+    Return the cached search as {'jobs': [...], 'fetched_at': epoch}, or None
+
+    Entries stay in the cache for JOB_CACHE_TTL seconds but are only fresh
+    for JOB_CACHE_FRESH_FOR; stale entries are still served while a refresh
+    runs (stale-while-revalidate).
+    """
+    entry = cache.get(search_cache_key(skill, location))
+    if isinstance(entry, dict) and entry.get('jobs'):
+        return entry
+    return None
+
+
+def store(skill, location, jobs, page_hash=None, containers=None):
+    """
+    Cache a scrape result and return the stored entry
+
+    page_hash and containers (see app1/incremental.py) let the next refresh
+    skip parsing whatever did not change.
+    """
+    entry = {'jobs': jobs, 'fetched_at': time.time()}
+    if page_hash:
+        entry['page_hash'] = page_hash
+        entry['containers'] = containers or {}
+    cache.set(search_cache_key(skill, location), entry, getattr(settings, 'JOB_CACHE_TTL', 6 * 3600))
+    return entry
+
+
+def age(entry):
+    """Seconds since the entry was scraped"""
+    return time.time() - entry['fetched_at']
+
+
+def is_stale(entry, lead=0):
+    """True once the entry is older than JOB_CACHE_FRESH_FOR minus `lead` seconds"""
+    return age(entry) >= getattr(settings, 'JOB_CACHE_FRESH_FOR', 3600) - lead
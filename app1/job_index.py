@@ -0,0 +1,78 @@
+import re
+
+from django.db import connection
+
+from app1.models import Job
+from app1.naukri_scrapper import normalize_search_term
+
+
+# Column weights for bm25(): title, skills, description, company
+BM25_WEIGHTS = (10.0, 5.0, 1.0, 0.5)
+_WEIGHTS_SQL = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+
+SEARCH_SQL = f"""
+    SELECT app1_job.id, bm25(app1_job_fts, {_WEIGHTS_SQL}) AS rank
+    FROM app1_job_fts
+    JOIN app1_job ON app1_job.id = app1_job_fts.rowid
+    WHERE app1_job_fts MATCH {{p}} AND app1_job.disappeared_at IS NULL {{location_filter}}
+    ORDER BY rank
+    LIMIT {{p}}
+"""
+
+
+def build_match_query(skill):
+    """
+    Turn a search phrase into an FTS5 MATCH expression
+
+    Every word is quoted (so '.net' or 'c++' cannot inject FTS syntax) and
+    OR-ed, letting BM25 rank jobs that match more of the words higher.
+    """
+    words = re.findall(r'\w+', skill.lower())
+    return ' OR '.join(f'"{word}"' for word in words)
+
+
+def search_ids(cursor, skill, location=None, limit=20, placeholder='%s'):
+    """
+    Run the ranked FTS query on a DB-API cursor
+
+    Args:
+        placeholder: '%s' for Django cursors, '?' for plain sqlite3 ones
+
+    Returns:
+        [(job_id, score)] best first, where score is the negated bm25 rank
+        (higher is better)
+    """
+    match = build_match_query(skill)
+    if not match:
+        return []
+
+    params = [match]
+    location_filter = ''
+    if location:
+        location_filter = f'AND app1_job.search_location = {placeholder}'
+        params.append(normalize_search_term(location))
+    params.append(limit)
+
+    cursor.execute(SEARCH_SQL.format(p=placeholder, location_filter=location_filter), params)
+    return [(job_id, -rank) for job_id, rank in cursor.fetchall()]
+
+
+def top_jobs_for_skill(skill, location=None, limit=20):
+    """
+    Top-k stored jobs for a skill, ranked by BM25 over title, skills,
+    description and company
+
+    Returns:
+        Scraper-style job dicts with a 'relevance_score', best first
+    """
+    with connection.cursor() as cursor:
+        ranked = search_ids(cursor, skill, location, limit)
+
+    jobs_by_id = Job.objects.in_bulk([job_id for job_id, _ in ranked])
+    results = []
+    for job_id, score in ranked:
+        if job_id in jobs_by_id:
+            job = jobs_by_id[job_id].as_dict()
+            job['relevance_score'] = round(score, 3)
+            results.append(job)
+    return results
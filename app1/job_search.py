@@ -0,0 +1,390 @@
+import os
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from app1 import job_cache, job_store
+from app1.driver_pool import get_driver_pool, pool_stats
+from app1.http_scraper import HttpNaukriScraper, drain
+from app1.incremental import apply_delta, iter_page
+from app1.job_store import job_fingerprint
+from app1.naukri_scrapper import search_cache_key, selector_stats
+from app1.scraper_service import get_scraper_client
+from app1.singleflight import SingleFlight
+
+
+# How many searches each tier served in this process: cache / http / selenium
+tier_counts = Counter()
+_tier_lock = threading.Lock()
+
+_http_scraper = None
+_http_lock = threading.Lock()
+
+_singleflight = None
+_singleflight_lock = threading.Lock()
+
+# Background revalidation of stale cache entries served to users
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-cache-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+# Classifier category -> Naukri search phrase
+SKILL_MAPPING = {
+    'Data Science': 'data science',
+    'HR': 'human resources',
+    'Design': 'graphic design',
+    'Information Technology': 'software development',
+    'Teacher': 'teaching',
+    'Advocate': 'lawyer',
+    'Business Development': 'business development',
+    'Healthcare': 'healthcare',
+    'Fitness': 'fitness trainer',
+    'Agriculture': 'agriculture',
+    'BPO': 'customer service',
+    'Sales': 'sales',
+    'Mechanical Engineer': 'mechanical engineering',
+    'Java Developer': 'java developer',
+    'Automobile': 'automobile engineering',
+    'Digital Marketing': 'digital marketing',
+    'Civil Engineer': 'civil engineering',
+    'Operations Manager': 'operations management',
+    'Electrical Engineering': 'electrical engineering',
+    'Network Security Engineer': 'network security',
+    'Python Developer': 'python developer',
+    'ERP': 'ERP consultant',
+    'DotNet Developer': '.net developer',
+    'Web Designing': 'web designer',
+}
+
+
+def search_skill_for(category):
+    """Naukri search phrase for a predicted resume category"""
+    return SKILL_MAPPING.get(category, category.lower())
+
+
+def get_http_scraper():
+    """Return the process-wide HttpNaukriScraper so its connections stay warm"""
+    global _http_scraper
+
+    if _http_scraper is None:
+        with _http_lock:
+            if _http_scraper is None:
+                _http_scraper = HttpNaukriScraper(
+                    base_url=getattr(settings, 'NAUKRI_BASE_URL', 'https://www.naukri.com'),
+                    timeout=getattr(settings, 'SCRAPER_HTTP_TIMEOUT', 10),
+                )
+
+    return _http_scraper
+
+
+def get_singleflight():
+    """Return the process-wide SingleFlight that coalesces identical searches"""
+    global _singleflight
+
+    if _singleflight is None:
+        with _singleflight_lock:
+            if _singleflight is None:
+                _singleflight = SingleFlight(
+                    lock_dir=getattr(
+                        settings, 'SCRAPER_LOCK_DIR',
+                        os.path.join(tempfile.gettempdir(), 'job_suggestor_locks')
+                    ),
+                    timeout=getattr(settings, 'SCRAPER_SINGLEFLIGHT_TIMEOUT', 90),
+                )
+
+    return _singleflight
+
+
+def search_jobs(skill, location="", experience="", max_results=20):
+    """
+    Search Naukri.com through the cheapest tier that returns jobs
+
+    Order: shared cache, plain HTTP, then a pooled Selenium browser. The
+    browser is only checked out when the HTTP tier hits a CAPTCHA, an error
+    or a page without job listings.
+
+    A stale cache entry is still returned immediately and refreshed in the
+    background. On a cache miss, jobs persisted by earlier scrapes (seen
+    within JOB_STORE_MAX_AGE) are served the same way.
+
+    Concurrent calls for the same normalized search (in this process or
+    another worker on the host) are coalesced: one caller scrapes, the
+    rest wait for its result.
+
+    Returns:
+        (jobs, tier) where tier is 'cache', 'store', 'http' or 'selenium'
+    """
+    return lookup_jobs(skill, location, max_results) or scrape_jobs(skill, location, max_results)
+
+
+def lookup_jobs(skill, location="", max_results=20):
+    """
+    The cheap tiers of search_jobs(): the cache, then the Job table
+
+    Returns:
+        (jobs, tier) or None when neither has the search
+    """
+    entry = job_cache.get_entry(skill, location)
+    if entry:
+        if job_cache.is_stale(entry):
+            _schedule_refresh(skill, location)
+        _record_tier('cache')
+        return entry['jobs'][:max_results], 'cache'
+
+    stored_jobs = job_store.recent_jobs(
+        skill, location,
+        max_age=getattr(settings, 'JOB_STORE_MAX_AGE', 24 * 3600),
+        limit=max_results,
+    )
+    if stored_jobs:
+        _schedule_refresh(skill, location)
+        _record_tier('store')
+        return stored_jobs, 'store'
+    return None
+
+
+def scrape_jobs(skill, location="", max_results=20):
+    """The scraping tiers of search_jobs(), coalesced with identical searches in flight"""
+    cache_key = search_cache_key(skill, location)
+    jobs, tier = get_singleflight().run(
+        cache_key,
+        lambda: _scrape(skill, location, max_results),
+        lookup=lambda: _lookup_cached(skill, location),
+    )
+    return jobs[:max_results], tier
+
+
+def refresh_search(skill, location="", lead=0):
+    """
+    Re-scrape a search and overwrite its cache entry, unless another caller
+    refreshed it while we waited
+
+    Args:
+        lead: Treat entries that go stale within this many seconds as
+              already stale (used by the pre-warming scheduler)
+
+    Returns:
+        (jobs, tier)
+    """
+    return get_singleflight().run(
+        search_cache_key(skill, location),
+        lambda: _scrape(skill, location),
+        lookup=lambda: _lookup_cached(skill, location, fresh_only=True, lead=lead),
+    )
+
+
+def search_stats():
+    """Per-process counters for tiers, coalesced scrapes, the driver pool and parser selectors"""
+    singleflight = get_singleflight()
+    with _tier_lock:
+        tiers = dict(tier_counts)
+    with singleflight._lock:
+        coalescing = dict(singleflight.stats)
+
+    return {
+        'pid': os.getpid(),
+        'tiers': tiers,
+        'coalescing': coalescing,
+        'driver_pool': pool_stats(),
+        'selectors': selector_stats(),
+    }
+
+
+def _schedule_refresh(skill, location):
+    key = search_cache_key(skill, location)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            refresh_search(skill, location)
+        except Exception as e:
+            print(f"⚠️ Background refresh of '{key}' failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_executor.submit(refresh)
+
+
+def _lookup_cached(skill, location, fresh_only=False, lead=0):
+    entry = job_cache.get_entry(skill, location)
+    if entry and not (fresh_only and job_cache.is_stale(entry, lead)):
+        _record_tier('cache')
+        return entry['jobs'], 'cache'
+    return None
+
+
+def _scrape(skill, location, max_results=0):
+    # Scrape enough for every caller, since the result is shared via the cache
+    max_results = max(max_results, getattr(settings, 'JOB_CACHE_MAX_RESULTS', 20))
+
+    if getattr(settings, 'SCRAPER_HTTP_TIER_ENABLED', True):
+        jobs, reason = _scrape_http(skill, location, max_results)
+        if jobs:
+            _record_tier('http')
+            return jobs, 'http'
+        print(f"🔁 HTTP tier gave no jobs ({reason}), escalating to Selenium")
+
+    return _scrape_selenium(skill, location, max_results)
+
+
+def _scrape_http(skill, location, max_results):
+    """
+    HTTP tier, parsed incrementally against the cached entry
+
+    Returns:
+        (jobs, escalate_reason) like HttpNaukriScraper.search_jobs()
+    """
+    jobs, reason = drain(_iter_http(skill, location))[1]
+    # The cache keeps the whole page so the next refresh can reuse all of it
+    return jobs[:max_results], reason
+
+
+def _iter_http(skill, location):
+    """
+    HTTP tier as a generator: yields every job on the page in order as it
+    is parsed (or reused) and returns (jobs, escalate_reason)
+
+    A refresh of an unchanged page skips parsing entirely, and only
+    listings that changed are parsed and written to the Job table (see
+    app1/incremental.py). The cache entry and Job table end up the same
+    whether the page was streamed or not.
+    """
+    scraper = get_http_scraper()
+    html, reason = scraper.fetch_page(skill, location)
+    if html is None:
+        return [], reason
+
+    previous = job_cache.get_entry(skill, location) or {}
+    old_jobs = {job_fingerprint(job): job for job in previous.get('jobs', [])}
+    containers = previous.get('containers') or {}
+    if not all(fingerprint in old_jobs for fingerprint in containers.values()):
+        containers = {}
+
+    parsing = iter_page(scraper, html, {'page_hash': previous.get('page_hash'), 'containers': containers})
+    jobs = []
+    while True:
+        try:
+            fingerprint, job = next(parsing)
+        except StopIteration as stop:
+            delta = stop.value
+            break
+        jobs.append(job or old_jobs[fingerprint])
+        yield jobs[-1]
+    if delta['reason']:
+        return [], delta['reason']
+
+    job_cache.store(skill, location, jobs, delta['page_hash'], delta['containers'])
+    try:
+        counts = apply_delta(delta, skill, location)
+    except Exception as e:
+        # The cache already has the result; a failed DB write must not fail the search
+        print(f"⚠️ Could not persist jobs: {e}")
+    else:
+        print(f"♻️ {'Page changed' if delta['page_changed'] else 'Page unchanged'}: "
+              f"{delta['parsed']} listings parsed, {delta['skipped']} reused, "
+              f"{counts['disappeared']} disappeared")
+    return jobs, None
+
+
+def _scrape_selenium(skill, location, max_results):
+    # With a scraper service configured, Chrome runs there, not in this worker
+    client = get_scraper_client()
+    if client is not None:
+        jobs = client.search_jobs(skill, location, max_results)
+    else:
+        with get_driver_pool().scraper() as scraper:
+            jobs = scraper.search_jobs(
+                skill=skill,
+                location=location,
+                max_results=max_results
+            )
+
+    # Sample jobs from the scraper's fallback path must not be cached
+    if jobs and not any(job.get('source', '').endswith('(Sample)') for job in jobs):
+        _save(skill, location, jobs)
+    _record_tier('selenium')
+    return jobs, 'selenium'
+
+
+def stream_jobs(skill, location="", max_results=20):
+    """
+    search_jobs() as a generator of (job, tier), for streaming pages
+
+    Cached or stored jobs are yielded straight away. On a miss the scrape
+    is coalesced with identical searches like scrape_jobs(): the leading
+    caller's HTTP tier yields each job as soon as its container is parsed
+    (the full page is still cached once parsing finishes), and every other
+    caller for the same search, in this process or another worker, waits
+    for that result instead of fetching the page again.
+    """
+    found = lookup_jobs(skill, location, max_results)
+    if found:
+        jobs, tier = found
+        for job in jobs:
+            yield job, tier
+        return
+
+    with get_singleflight().flight(
+        search_cache_key(skill, location),
+        lookup=lambda: _lookup_cached(skill, location),
+    ) as flight:
+        if flight.leader:
+            flight.result = yield from _stream_scrape(skill, location, max_results)
+            return
+
+    jobs, tier = flight.result or scrape_jobs(skill, location, max_results)
+    for job in jobs[:max_results]:
+        yield job, tier
+
+
+def _stream_scrape(skill, location, max_results):
+    # _scrape() that yields the HTTP tier's jobs as they are parsed; returns (jobs, tier)
+    fetch_results = max(max_results, getattr(settings, 'JOB_CACHE_MAX_RESULTS', 20))
+    if getattr(settings, 'SCRAPER_HTTP_TIER_ENABLED', True):
+        jobs, reason = yield from _tagged(_iter_http(skill, location), 'http', max_results)
+        if jobs:
+            _record_tier('http')
+            return jobs, 'http'
+        print(f"🔁 HTTP tier gave no jobs ({reason}), escalating to Selenium")
+
+    jobs, tier = _scrape_selenium(skill, location, fetch_results)
+    for job in jobs[:max_results]:
+        yield job, tier
+    return jobs, tier
+
+
+def _tagged(parsed, tier, limit):
+    # Yield (job, tier) for the first `limit` jobs and return the parser
+    # generator's return value
+    found = 0
+    while True:
+        try:
+            job = next(parsed)
+        except StopIteration as stop:
+            return stop.value
+        found += 1
+        if found <= limit:
+            yield job, tier
+
+
+def _save(skill, location, jobs):
+    job_cache.store(skill, location, jobs)
+    try:
+        job_store.upsert_jobs(jobs, skill, location)
+    except Exception as e:
+        # The cache already has the result; a failed DB write must not fail the search
+        print(f"⚠️ Could not persist jobs: {e}")
+
+
+def _record_tier(tier):
+    with _tier_lock:
+        tier_counts[tier] += 1
+    print(f"📡 Search served by {tier} tier")
@@ -0,0 +1,146 @@
+import hashlib
+from datetime import timedelta
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
+
+from django.utils import timezone
+
+from app1.models import Job
+from app1.naukri_scrapper import normalize_search_term
+
+
+UPDATE_FIELDS = [
+    'title', 'company', 'location', 'experience', 'salary', 'description',
+    'skills', 'posted_date', 'url', 'source', 'search_skill',
+    'search_location', 'last_seen', 'disappeared_at', 'updated_at',
+]
+
+
+def normalize_url(url):
+    """Lowercase scheme/host and drop query, fragment and trailing slash"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+
+def job_fingerprint(job):
+    """
+    Stable identity for a scraped job
+
+    Real posting URLs identify a job on their own (tracking parameters are
+    dropped). The parser invents a /job-details?title=... URL when a card
+    has no link, so those jobs are identified by their content instead.
+    """
+    url = job.get('url', '')
+    if url and '/job-details?' not in url:
+        return _url_fingerprint(url)
+
+    basis = 'content:' + '|'.join(
+        ' '.join(str(job.get(field, '')).lower().split())
+        for field in ('title', 'company', 'location', 'experience')
+    )
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=65536)
+def _url_fingerprint(url):
+    # Rankers fingerprint the same candidate URLs on every request
+    return hashlib.sha1(('url:' + normalize_url(url)).encode('utf-8')).hexdigest()
+
+
+def upsert_jobs(jobs, skill, location="", batch_size=500):
+    """
+    Insert new jobs and refresh existing ones in batches
+
+    first_seen is only set on insert; every other column, including
+    last_seen, is overwritten with the latest scrape.
+
+    Returns:
+        Number of distinct jobs written
+    """
+    now = timezone.now()
+    search_skill = normalize_search_term(skill)
+    search_location = normalize_search_term(location)
+
+    # The same posting can show up twice on one page; one row per fingerprint
+    rows = {}
+    for job in jobs:
+        fingerprint = job_fingerprint(job)
+        rows[fingerprint] = Job(
+            fingerprint=fingerprint,
+            title=job.get('title', '')[:255],
+            company=job.get('company', '')[:255],
+            location=job.get('location', '')[:255],
+            experience=job.get('experience', '')[:100],
+            salary=job.get('salary', '')[:100],
+            description=job.get('description', ''),
+            skills=job.get('skills', []),
+            posted_date=job.get('posted_date', '')[:100],
+            url=job.get('url', '')[:1000],
+            source=job.get('source', '')[:100],
+            search_skill=search_skill,
+            search_location=search_location,
+            first_seen=now,
+            last_seen=now,
+            disappeared_at=None,
+            updated_at=now,
+        )
+
+    Job.objects.bulk_create(
+        list(rows.values()),
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['fingerprint'],
+        update_fields=UPDATE_FIELDS,
+    )
+    return len(rows)
+
+
+def touch_jobs(fingerprints):
+    """
+    Mark jobs as seen again without rewriting them
+
+    Used for listings a re-crawl found unchanged; only last_seen moves, so
+    the full-text index is not touched. Returns the number of rows updated.
+    """
+    if not fingerprints:
+        return 0
+    return Job.objects.filter(fingerprint__in=list(fingerprints)).update(
+        last_seen=timezone.now(), disappeared_at=None,
+    )
+
+
+def mark_disappeared(fingerprints, skill, location=""):
+    """
+    Flag jobs a re-crawl of this search no longer found
+
+    Only jobs last listed by the same search are flagged: a job another
+    search returned since is still listed there. Returns the number newly
+    flagged.
+    """
+    if not fingerprints:
+        return 0
+    return Job.objects.filter(
+        fingerprint__in=list(fingerprints),
+        search_skill=normalize_search_term(skill),
+        search_location=normalize_search_term(location),
+        disappeared_at__isnull=True,
+    ).update(disappeared_at=timezone.now())
+
+
+def recent_jobs(skill, location="", max_age=None, limit=20):
+    """
+    Jobs last seen for this search, newest first, as scraper-style dicts
+
+    Args:
+        max_age: Ignore jobs not seen for this many seconds (None = any age)
+    """
+    queryset = Job.objects.filter(
+        search_skill=normalize_search_term(skill),
+        search_location=normalize_search_term(location),
+        disappeared_at__isnull=True,
+    )
+    if max_age is not None:
+        queryset = queryset.filter(last_seen__gte=timezone.now() - timedelta(seconds=max_age))
+
+    return [job.as_dict() for job in queryset.order_by('-last_seen', 'id')[:limit]]
@@ -0,0 +1,66 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from app1.management.commands.bench_job_search import synthetic_jobs
+from app1.ml_models import classify_texts, get_models
+from app1.ranking import job_text
+
+
+def classify_one_by_one(texts, models):
+    """The old predict_category loop: predict and predict_proba per resume"""
+    results = []
+    for text in texts:
+        matrix = models.vectorizer.transform([text])
+        label = models.encoder.inverse_transform([models.model.predict(matrix)[0]])[0]
+        probabilities = models.model.predict_proba(matrix)[0]
+        results.append({
+            'category': label,
+            'confidence': round(max(probabilities) * 100, 2),
+            'all_probabilities': {
+                category: round(prob * 100, 2)
+                for category, prob in zip(models.encoder.classes_, probabilities)
+            },
+        })
+    return results
+
+
+class Command(BaseCommand):
+    help = "Resumes/second of classify_texts() batches against the per-file predict loop"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1, 10, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        models = get_models()
+        rng = random.Random(options['seed'])
+        jobs = synthetic_jobs(2000, options['seed'])
+
+        self.stdout.write(f"{'resumes':>8} {'loop/s':>10} {'batch/s':>10} {'speedup':>8} {'same labels':>12}")
+        for size in options['sizes']:
+            # A resume is a few job descriptions' worth of text
+            texts = [' '.join(job_text(job) for job in rng.sample(jobs, 5)) for _ in range(size)]
+
+            loop_time = self._median_of(options['repeat'], lambda: classify_one_by_one(texts, models))
+            batch_time = self._median_of(options['repeat'], lambda: classify_texts(texts, models))
+
+            same = all(
+                a['category'] == b['category']
+                for a, b in zip(classify_one_by_one(texts, models), classify_texts(texts, models))
+            )
+            self.stdout.write(
+                f"{size:>8} {size / loop_time:>10.0f} {size / batch_time:>10.0f} "
+                f"{loop_time / batch_time:>7.1f}x {str(same):>12}"
+            )
+
+    def _median_of(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
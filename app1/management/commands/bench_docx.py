@@ -0,0 +1,78 @@
+import io
+import statistics
+import time
+import tracemalloc
+
+import docx
+from django.core.management.base import BaseCommand
+
+from app1.resume_text import extract_text_from_file
+
+
+def synthetic_resume(paragraphs, table_rows):
+    """A .docx with `paragraphs` paragraphs and a 2-column skills table"""
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(
+            f"{i}. Delivered project {i} using Python, Django and PostgreSQL for a client team."
+        )
+    table = document.add_table(rows=table_rows, cols=2)
+    for i, row in enumerate(table.rows):
+        row.cells[0].text = f"Skill group {i}"
+        row.cells[1].text = "Docker, Kubernetes, AWS, Terraform"
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_text(file):
+    """The previous extractor: the full object model, body paragraphs only"""
+    text = ""
+    for paragraph in docx.Document(file).paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+class Command(BaseCommand):
+    help = "Speed and peak memory of the streaming .docx extractor against python-docx"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paragraphs', nargs='+', type=int, default=[100, 1000, 10000])
+        parser.add_argument('--table-rows', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'paragraphs':>10} {'size':>8} {'docx ms':>9} {'stream ms':>10} {'speedup':>8} "
+            f"{'docx peak':>10} {'stream peak':>12} {'docx chars':>11} {'stream chars':>13}"
+        )
+        for paragraphs in options['paragraphs']:
+            data = synthetic_resume(paragraphs, options['table_rows'])
+
+            old_time, old_peak, old_text = self._measure(python_docx_text, data, options['repeat'])
+            new_time, new_peak, new_text = self._measure(extract_text_from_file, data, options['repeat'])
+
+            self.stdout.write(
+                f"{paragraphs:>10} {len(data) / 1024:>6.0f}KB {old_time * 1e3:>9.1f} {new_time * 1e3:>10.1f} "
+                f"{old_time / new_time:>7.1f}x {old_peak / 2**20:>8.1f}MB {new_peak / 2**20:>10.1f}MB "
+                f"{len(old_text):>11} {len(new_text):>13}"
+            )
+
+    def _measure(self, extract, data, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = extract(self._file(data))
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        extract(self._file(data))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return statistics.median(timings), peak, text
+
+    def _file(self, data):
+        file = io.BytesIO(data)
+        file.name = 'resume.docx'
+        return file
@@ -0,0 +1,83 @@
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from app1.management.commands.bench_job_search import synthetic_jobs
+from app1.ml_models import get_models
+from app1.ranking import job_text
+from app1.retrieval_index import JobVectorIndex
+
+
+class Command(BaseCommand):
+    help = "Recall and latency of JobVectorIndex against brute-force scoring of every job"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000])
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--k', type=int, default=20)
+        parser.add_argument('--candidate-factor', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        vectorizer = get_models().vectorizer
+
+        k = options['k']
+        self.stdout.write(
+            f"{'jobs':>8} {'build':>8} {'load':>8} {'index p50':>10} {'index p95':>10} "
+            f"{'brute p50':>10} {'brute p95':>10} {'recall@' + str(k):>10}"
+        )
+
+        for size in options['sizes']:
+            jobs = synthetic_jobs(size, options['seed'])
+            matrix = vectorizer.transform([job_text(job) for job in jobs]).astype(np.float32).tocsr()
+            fingerprints = [f'{i:040x}' for i in range(size)]
+
+            rng = random.Random(options['seed'] + size)
+            resumes = vectorizer.transform([
+                ' '.join(job_text(job) for job in rng.sample(jobs, 3))
+                for _ in range(options['queries'])
+            ]).astype(np.float32).tocsr()
+
+            with tempfile.TemporaryDirectory() as path:
+                started = time.perf_counter()
+                index = JobVectorIndex(matrix.shape[1])
+                index.add(fingerprints, matrix)
+                index.save(path)
+                build = time.perf_counter() - started
+
+                started = time.perf_counter()
+                index = JobVectorIndex.load(path)
+                load = time.perf_counter() - started
+
+                index_times, brute_times, recalls = [], [], []
+                for q in range(resumes.shape[0]):
+                    query = resumes[q]
+
+                    started = time.perf_counter()
+                    hits = index.search(query, k=k, candidate_factor=options['candidate_factor'])
+                    index_times.append(time.perf_counter() - started)
+
+                    started = time.perf_counter()
+                    scores = matrix.dot(query.T).toarray().ravel()
+                    exact = np.argpartition(-scores, k - 1)[:k]
+                    brute_times.append(time.perf_counter() - started)
+
+                    expected = {fingerprints[i] for i in exact if scores[i] > 0}
+                    found = {fingerprint for fingerprint, _ in hits}
+                    recalls.append(len(found & expected) / max(len(expected), 1))
+
+            self.stdout.write(
+                f"{size:>8} {build:>7.2f}s {load * 1e3:>6.1f}ms "
+                f"{statistics.median(index_times) * 1e3:>8.2f}ms {_p95(index_times) * 1e3:>8.2f}ms "
+                f"{statistics.median(brute_times) * 1e3:>8.2f}ms {_p95(brute_times) * 1e3:>8.2f}ms "
+                f"{statistics.mean(recalls):>10.3f}"
+            )
+
+
+def _p95(timings):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
@@ -0,0 +1,120 @@
+import importlib
+import json
+import random
+import sqlite3
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from app1.job_index import search_ids
+from app1.job_search import SKILL_MAPPING
+from app1.views import JobRecommendationsView
+
+
+TITLE_WORDS = [
+    'Senior', 'Junior', 'Lead', 'Principal', 'Associate', 'Staff', 'Trainee',
+    'Engineer', 'Developer', 'Analyst', 'Consultant', 'Manager', 'Executive',
+    'Specialist', 'Architect', 'Designer', 'Officer',
+]
+SKILL_WORDS = [
+    'python', 'django', 'java', 'spring', 'sql', 'react', 'aws', 'docker',
+    'excel', 'sales', 'marketing', 'seo', 'autocad', 'sap', 'erp', 'hr',
+    'recruitment', 'networking', 'linux', 'testing', 'selenium', 'hadoop',
+    'spark', 'tableau', 'accounting', 'teaching', 'design', 'figma',
+]
+FILLER_WORDS = [
+    'team', 'client', 'experience', 'project', 'delivery', 'strong', 'skills',
+    'communication', 'role', 'business', 'growth', 'opportunity', 'office',
+]
+
+
+def synthetic_jobs(count, seed):
+    """Random but reproducible job dicts shaped like the scraper output"""
+    rng = random.Random(seed)
+    phrases = list(SKILL_MAPPING.values())
+    jobs = []
+    for i in range(count):
+        phrase = rng.choice(phrases)
+        skills = rng.sample(SKILL_WORDS, 4)
+        jobs.append({
+            'title': f"{rng.choice(TITLE_WORDS)} {phrase.title()} {rng.choice(TITLE_WORDS)}",
+            'company': f"Company {rng.randrange(count // 10 + 1)}",
+            'description': ' '.join(rng.choice(FILLER_WORDS + skills) for _ in range(30)),
+            'skills': skills,
+        })
+    return jobs
+
+
+class Command(BaseCommand):
+    help = "Compare FTS5/BM25 job search against JobRecommendationsView._match_jobs_with_skill"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000])
+        parser.add_argument('--queries', type=int, default=20)
+        parser.add_argument('--limit', type=int, default=15)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        fts_migration = importlib.import_module('app1.migrations.0002_job_fts')
+        queries = random.Random(options['seed']).choices(
+            list(SKILL_MAPPING.values()), k=options['queries']
+        )
+        matcher = JobRecommendationsView()
+
+        self.stdout.write(
+            f"{'jobs':>8} {'ingest/job':>12} {'fts p50':>10} {'fts p95':>10} "
+            f"{'substr p50':>11} {'substr p95':>11} {'speedup':>8}"
+        )
+
+        for size in options['sizes']:
+            jobs = synthetic_jobs(size, options['seed'])
+
+            conn = sqlite3.connect(':memory:')
+            conn.execute(
+                'CREATE TABLE app1_job (id INTEGER PRIMARY KEY, title TEXT, skills TEXT,'
+                ' description TEXT, company TEXT, search_location TEXT, disappeared_at TEXT)'
+            )
+            for statement in fts_migration.FORWARD_SQL:
+                conn.execute(statement)
+
+            started = time.perf_counter()
+            with conn:
+                conn.executemany(
+                    'INSERT INTO app1_job (title, skills, description, company, search_location)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    (
+                        (job['title'], json.dumps(job['skills']), job['description'], job['company'], 'bangalore')
+                        for job in jobs
+                    )
+                )
+            ingest = (time.perf_counter() - started) / size
+
+            cursor = conn.cursor()
+            fts_times = self._time_each(
+                queries, lambda q: search_ids(cursor, q, limit=options['limit'], placeholder='?')
+            )
+            substring_times = self._time_each(
+                queries, lambda q: matcher._match_jobs_with_skill(jobs, q)[:options['limit']]
+            )
+            conn.close()
+
+            fts_p50 = statistics.median(fts_times)
+            substring_p50 = statistics.median(substring_times)
+            self.stdout.write(
+                f"{size:>8} {ingest * 1e6:>10.1f}us {fts_p50 * 1e3:>8.2f}ms "
+                f"{self._p95(fts_times) * 1e3:>8.2f}ms {substring_p50 * 1e3:>9.2f}ms "
+                f"{self._p95(substring_times) * 1e3:>9.2f}ms {substring_p50 / fts_p50:>7.1f}x"
+            )
+
+    def _time_each(self, queries, run):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def _p95(self, timings):
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
@@ -0,0 +1,121 @@
+import contextlib
+import io
+import os
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from app1.fast_parse import fast_parse_enabled, visible_text
+from app1.naukri_scrapper import NaukriParser
+
+
+ROOT_FIXTURES = ['selenium_page.html', 'naukri_response.html', 'debug_naukri_page.html']
+
+
+def synthetic_results_page(listings, seed, layout='tuple'):
+    """
+    A results page with `listings` job containers in one of two layouts,
+    wrapped in the kind of head, scripts and navigation a real page carries
+
+    Args:
+        layout: 'tuple' (article.jobTuple) or 'wrapper' (.srp-jobtuple-wrapper)
+    """
+    rnd = random.Random(seed)
+    cards = []
+    for i in range(listings):
+        words = ' '.join(rnd.choice(['python', 'django', 'sql', 'aws', 'teams', 'apis']) for _ in range(rnd.randint(5, 60)))
+        if layout == 'tuple':
+            cards.append(
+                f'<article class="jobTuple bgWhite"><div class="jobTupleHeader">'
+                f'<a class="title fw500" href="/job-listings-{seed}-{i}">Python Developer {i}</a>'
+                f'<a class="subTitle ellipsis">Acme Systems {i}</a></div><ul>'
+                f'<li class="experience"><span class="expwdth">{rnd.randint(1, 5)}-{rnd.randint(6, 9)} Yrs</span></li>'
+                f'<li class="salary"><span class="sal">{rnd.randint(3, 20)} Lacs PA</span></li>'
+                f'<li class="location"><span class="locWdth">Pune, Bangalore</span></li></ul>'
+                f'<div class="job-description fs12">{words}</div>'
+                f'<ul class="tags has-description"><li>python</li><li>django</li><li>sql</li></ul>'
+                f'<div class="type"><span class="fleft postedDate">{i % 30} Days Ago</span></div></article>'
+            )
+        else:
+            cards.append(
+                f'<div class="srp-jobtuple-wrapper" data-job-id="{seed}{i}"><div class="cust-job-tuple">'
+                f'<h2><a class="title" href="https://www.naukri.com/job-{seed}-{i}">Data Engineer {i}</a></h2>'
+                f'<div class="row2"><a class="comp-name">Globex {i}</a></div>'
+                f'<div class="row3"><span class="exp">{i % 10} Yrs</span><span class="loc">Hyderabad</span></div>'
+                f'<div class="row4"><span class="job-desc">{words}</span></div>'
+                f'<ul class="tags-gt"><li class="tag-li">spark</li><li class="tag-li">aws</li></ul>'
+                f'<div class="row6"><span class="job-post-day">Just Now</span></div></div></div>'
+            )
+
+    head = (
+        '<head><meta name="robots" content="index, follow">'
+        + '<link rel="stylesheet" href="/static/app.css">' * 100
+        + '<script>' + 'window.__data.push({"k": 1});' * 3000 + '</script></head>'
+    )
+    navigation = ''.join(
+        f'<div class="row"><a href="/{skill}-jobs">{skill.title()} jobs in India</a></div>'
+        for skill in ['python', 'java', 'sales', 'design', 'hr'] * 40
+    )
+    return f'<html>{head}<body>{navigation}<div class="list">{"".join(cards)}</div></body></html>'
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse time of the lxml fast-parse mode against a full html.parser parse "
+        "over saved HTML pages (default: the snapshots at the repo root)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="HTML files (default: the root snapshots)")
+        parser.add_argument('--synthetic', type=int, default=3,
+                            help="Also add this many generated 20-listing pages (0 = none)")
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with override_settings(SCRAPER_FAST_PARSE=True):
+            if not fast_parse_enabled():
+                raise CommandError("lxml is not installed; fast parse mode is unavailable")
+
+        pages = []
+        for path in options['files'] or [os.path.join(settings.BASE_DIR, name) for name in ROOT_FIXTURES]:
+            if not os.path.exists(path):
+                self.stderr.write(f"⚠️ Skipping missing {path}")
+                continue
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((os.path.basename(path), f.read()))
+        for i in range(options['synthetic']):
+            pages.append((f"synthetic-{i}", synthetic_results_page(20, i, ('tuple', 'wrapper')[i % 2])))
+
+        parser = NaukriParser()
+        self.stdout.write(
+            f"{'page':>24} {'size':>7} {'full ms':>8} {'fast ms':>8} {'speedup':>8} "
+            f"{'jobs':>5} {'same':>5} {'captcha raw':>12} {'captcha vis':>12}"
+        )
+        for name, html in pages:
+            full_time, full_jobs = self._measure(parser, html, False, options['repeat'])
+            fast_time, fast_jobs = self._measure(parser, html, True, options['repeat'])
+            raw_time = self._time(lambda: parser._is_captcha_text(html), options['repeat'])
+            visible_time = self._time(lambda: parser._is_captcha_text(visible_text(html)), options['repeat'])
+
+            self.stdout.write(
+                f"{name[:24]:>24} {len(html) / 1024:>5.0f}KB {full_time * 1e3:>8.2f} {fast_time * 1e3:>8.2f} "
+                f"{full_time / fast_time:>7.1f}x {len(fast_jobs):>5} {str(full_jobs == fast_jobs):>5} "
+                f"{raw_time * 1e3:>10.2f}ms {visible_time * 1e3:>10.2f}ms"
+            )
+
+    def _measure(self, parser, html, fast, repeat):
+        with override_settings(SCRAPER_FAST_PARSE=fast), contextlib.redirect_stdout(io.StringIO()):
+            jobs = parser.extract_from_html(html, 20, allow_manual=False)
+            return self._time(lambda: parser.extract_from_html(html, 20, allow_manual=False), repeat), jobs
+
+    def _time(self, function, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
@@ -0,0 +1,200 @@
+import contextlib
+import io
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from glob import glob
+
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app1.management.commands.bench_parse_modes import ROOT_FIXTURES, synthetic_results_page
+from app1.naukri_scrapper import NaukriParser, get_selector_engine
+
+
+FIELDS = ['title', 'company', 'location', 'experience', 'salary', 'description', 'skills', 'posted_date', 'url']
+
+# What _parse_job_element leaves in a field it found nothing for
+FIELD_DEFAULTS = {
+    'title': 'Not specified', 'company': 'Not specified', 'location': 'Not specified',
+    'experience': 'Not specified', 'salary': 'Not disclosed', 'description': '',
+    'skills': [], 'posted_date': 'Recently',
+}
+
+
+def field_rates(jobs):
+    """Share of jobs in which each field was actually extracted"""
+    filled = Counter()
+    for job in jobs:
+        for field in FIELDS:
+            value = job.get(field)
+            if field == 'url':
+                # An unlinked title gets a made-up job-details search URL
+                filled[field] += bool(value) and '/job-details?title=' not in value
+            else:
+                filled[field] += value != FIELD_DEFAULTS[field]
+    return {field: round(filled[field] / len(jobs), 3) if jobs else 0.0 for field in FIELDS}
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline benchmark of the Naukri parser on saved HTML pages: jobs/sec, "
+        "per-field extraction rate and peak memory, without a browser. With "
+        "--baseline, fails when throughput or extraction regresses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="HTML files (default: the root snapshots)")
+        parser.add_argument('--fixtures', help="Also benchmark every .html file in this directory")
+        parser.add_argument('--synthetic', type=int, default=4,
+                            help="Also add this many generated 20-listing pages (0 = none)")
+        parser.add_argument('--max-results', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+        parser.add_argument('--save-baseline', help="Write this run's results to this JSON file")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Allowed throughput drop against the baseline (0.2 = 20%%)")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            if not os.path.exists(options['baseline']):
+                raise CommandError(f"Baseline {options['baseline']} does not exist")
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        pages = self._pages(options)
+        if not pages:
+            raise CommandError("No pages to benchmark")
+
+        parser = NaukriParser()
+        results = {}
+        all_jobs = []
+        self.stdout.write(
+            f"{'page':>24} {'size':>7} {'ms/page':>8} {'jobs':>5} {'jobs/s':>8} "
+            f"{'elem us':>8} {'manual ms':>10} {'links':>6} {'peak':>8}"
+        )
+        for name, html in pages:
+            result, jobs = self._measure(parser, html, options['max_results'], options['repeat'])
+            results[name] = result
+            all_jobs.extend(jobs)
+            self.stdout.write(
+                f"{name[:24]:>24} {result['size'] / 1024:>5.0f}KB {result['ms_per_page']:>8.2f} {result['jobs']:>5} "
+                f"{result['jobs_per_sec']:>8.0f} {result['element_us']:>8.0f} {result['manual_ms']:>10.2f} "
+                f"{result['manual_jobs']:>6} {result['peak_kb'] / 1024:>6.1f}MB"
+            )
+
+        seconds = sum(result['ms_per_page'] for result in results.values()) / 1e3
+        total = {
+            'pages_per_sec': round(len(results) / seconds, 1),
+            'jobs_per_sec': round(len(all_jobs) / seconds, 1),
+            'jobs': len(all_jobs),
+            'fields': field_rates(all_jobs),
+        }
+        self.stdout.write(
+            f"\nAll pages: {total['jobs']} jobs, {total['jobs_per_sec']:.0f} jobs/s, "
+            f"{total['pages_per_sec']:.0f} pages/s"
+        )
+        self.stdout.write("Field extraction rate: " + ", ".join(
+            f"{field} {rate:.0%}" for field, rate in total['fields'].items()
+        ))
+
+        report = {'threshold': options['threshold'], 'total': total, 'pages': results}
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f"💾 Baseline saved to {options['save_baseline']}")
+
+        if baseline is not None:
+            regressions = self._compare(report, baseline, options['threshold'])
+            if regressions:
+                for regression in regressions:
+                    self.stderr.write(f"❌ {regression}")
+                raise CommandError(f"{len(regressions)} parser regression(s) against {options['baseline']}")
+            self.stdout.write(f"✅ No regressions against {options['baseline']}")
+
+    def _pages(self, options):
+        paths = list(options['files']) or [os.path.join(settings.BASE_DIR, name) for name in ROOT_FIXTURES]
+        if options['fixtures']:
+            paths += sorted(glob(os.path.join(options['fixtures'], '*.html')))
+
+        pages = []
+        for path in paths:
+            if not os.path.exists(path):
+                self.stderr.write(f"⚠️ Skipping missing {path}")
+                continue
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((os.path.basename(path), f.read()))
+        for i in range(options['synthetic']):
+            pages.append((f"synthetic-{i}", synthetic_results_page(20, i, ('tuple', 'wrapper')[i % 2])))
+        return pages
+
+    def _measure(self, parser, html, max_results, repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            # The whole pipeline as the scrapers run it, manual fallback included
+            jobs = parser.extract_from_html(html, max_results)
+            page_time = self._time(lambda: parser.extract_from_html(html, max_results), repeat)
+
+            soup = BeautifulSoup(html, 'html.parser')
+            layout, elements = next(
+                ((selector, found) for selector, found in get_selector_engine().iter_containers(soup) if found),
+                (None, []),
+            )
+            elements = elements[:max_results]
+            element_time = self._time(
+                lambda: [parser._parse_job_element(element, layout=layout) for element in elements], repeat
+            )
+            manual_jobs = parser._manual_extraction(soup, max_results)
+            manual_time = self._time(lambda: parser._manual_extraction(soup, max_results), repeat)
+
+            tracemalloc.start()
+            parser.extract_from_html(html, max_results)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        return {
+            'size': len(html),
+            'jobs': len(jobs),
+            'ms_per_page': round(page_time * 1e3, 3),
+            'jobs_per_sec': round(len(jobs) / page_time, 1),
+            'element_us': round(element_time / len(elements) * 1e6, 1) if elements else 0.0,
+            'manual_ms': round(manual_time * 1e3, 3),
+            'manual_jobs': len(manual_jobs),
+            'peak_kb': round(peak / 1024, 1),
+            'fields': field_rates(jobs),
+        }, jobs
+
+    def _time(self, function, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    def _compare(self, report, baseline, threshold):
+        """Regressions against the baseline: slower pages, fewer jobs, fields no longer extracted"""
+        regressions = []
+        old_total = baseline['total']
+        if report['total']['jobs_per_sec'] < old_total['jobs_per_sec'] * (1 - threshold):
+            regressions.append(
+                f"throughput {report['total']['jobs_per_sec']:.0f} jobs/s, "
+                f"baseline {old_total['jobs_per_sec']:.0f} jobs/s"
+            )
+
+        for name, result in report['pages'].items():
+            old = baseline['pages'].get(name)
+            if old is None:
+                continue
+            if result['ms_per_page'] > old['ms_per_page'] / (1 - threshold):
+                regressions.append(f"{name}: {result['ms_per_page']:.2f} ms/page, baseline {old['ms_per_page']:.2f}")
+            if result['jobs'] < old['jobs']:
+                regressions.append(f"{name}: {result['jobs']} jobs, baseline {old['jobs']}")
+            for field, rate in result['fields'].items():
+                if rate < old['fields'].get(field, 0.0):
+                    regressions.append(f"{name}: {field} extracted for {rate:.0%} of jobs, baseline {old['fields'][field]:.0%}")
+        return regressions
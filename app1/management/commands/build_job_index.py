@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from app1.models import Job
+from app1.ml_models import get_models
+from app1.ranking import job_text
+from app1.retrieval_index import JobVectorIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Bring the TF-IDF retrieval index up to date with the Job table: add new "
+        "jobs, re-vectorize edited ones, drop disappeared ones (incremental unless --full)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Rebuild from scratch")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        vectorizer = get_models().vectorizer
+
+        path = settings.JOB_VECTOR_INDEX_DIR
+        try:
+            index = None if options['full'] else JobVectorIndex.load(path)
+        except FileNotFoundError:
+            index = None
+        if index is None:
+            index = JobVectorIndex(len(vectorizer.vocabulary_))
+
+        # Read before the Job table so rows written during the build are
+        # picked up again next time
+        started = timezone.now()
+        indexed = index.fingerprints()
+        active = dict(Job.objects.filter(disappeared_at__isnull=True).values_list('fingerprint', 'id'))
+
+        removed = index.discard(indexed - active.keys())
+        changed = set()
+        if index.built_at:
+            changed = set(Job.objects.filter(
+                disappeared_at__isnull=True, updated_at__gt=parse_datetime(index.built_at),
+            ).values_list('fingerprint', flat=True)) & indexed
+            index.discard(changed)
+
+        job_ids = sorted(active[fingerprint] for fingerprint in (active.keys() - indexed) | changed)
+        added = 0
+        batch_size = options['batch_size']
+        for start in range(0, len(job_ids), batch_size):
+            batch = list(Job.objects.filter(id__in=job_ids[start:start + batch_size]).order_by('id'))
+            matrix = vectorizer.transform([job_text(job.as_dict()) for job in batch])
+            added += index.add([job.fingerprint for job in batch], matrix)
+
+        index.save(path, built_at=started.isoformat())
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Added {added - len(changed)} jobs, refreshed {len(changed)}, removed {removed}; "
+            f"index now holds {len(index)} jobs (generation {index.generation})"
+        ))
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app1.ml_models import classify_texts, get_models
+from app1.resume_text import RESUME_EXTENSIONS, extract_text_from_file
+
+
+_done_hashes = frozenset()
+_limits = {}
+
+
+def _init_worker(done_hashes, max_pages, max_chars):
+    global _done_hashes, _limits
+    _done_hashes = done_hashes
+    _limits = {'max_pages': max_pages, 'max_chars': max_chars}
+
+
+def extract_resume(path):
+    """
+    Hash and extract one resume file (runs in a pool process)
+
+    Returns:
+        {'sha256', 'text', 'extract_ms'}, with 'skipped' set when the
+        content was already scored or 'error' when extraction failed
+    """
+    started = time.perf_counter()
+    record = {'sha256': None, 'text': ''}
+    try:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+            record['sha256'] = digest.hexdigest()
+            if record['sha256'] in _done_hashes:
+                record['skipped'] = True
+                return record
+            f.seek(0)
+            record['text'] = extract_text_from_file(f, **_limits)
+        if not record['text']:
+            record['error'] = 'No text found'
+    except Exception as e:
+        record['error'] = str(e)
+    record['extract_ms'] = round((time.perf_counter() - started) * 1e3, 1)
+    return record
+
+
+def resume_files(directory):
+    """Resume paths under `directory`, walked lazily in a stable order"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def scored_hashes(output):
+    """Content hashes already classified in an earlier run's JSONL output"""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a run killed mid-write leaves a partial last line
+            if record.get('category') and record.get('sha256'):
+                done.add(record['sha256'])
+    return done
+
+
+class Command(BaseCommand):
+    help = (
+        "Classify every resume under a directory and append one JSON line per "
+        "file to --output; files whose content was already scored are skipped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--output', default='classified_resumes.jsonl')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                            help="Text extraction processes")
+        parser.add_argument('--batch-size', type=int, default=64,
+                            help="Resumes vectorized and classified together")
+        parser.add_argument('--max-in-flight', type=int, default=0,
+                            help="Files being extracted at once (default: 4 per worker)")
+        parser.add_argument('--probabilities', action='store_true',
+                            help="Include every category's probability")
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f"Not a directory: {directory}")
+
+        get_models()
+        done = frozenset(scored_hashes(options['output']))
+        max_in_flight = options['max_in_flight'] or options['workers'] * 4
+        self.counts = {'classified': 0, 'skipped': 0, 'failed': 0}
+        self.batch = []
+        self.include_probabilities = options['probabilities']
+        started = time.perf_counter()
+
+        print(f"🔍 Classifying resumes under {directory} ({len(done)} already scored)")
+
+        # Only max_in_flight files are pending at a time and texts are
+        # written out every batch, so memory does not grow with the archive
+        with open(options['output'], 'a') as self.out, ProcessPoolExecutor(
+            max_workers=options['workers'], initializer=_init_worker, initargs=(
+                done,
+                getattr(settings, 'RESUME_EXTRACTION_MAX_PAGES', 50),
+                getattr(settings, 'RESUME_EXTRACTION_MAX_CHARS', 100000),
+            )
+        ) as pool:
+            pending = {}
+            for path in resume_files(directory):
+                if len(pending) >= max_in_flight:
+                    self._collect(pending, options['batch_size'], directory)
+                pending[pool.submit(extract_resume, path)] = path
+            while pending:
+                self._collect(pending, options['batch_size'], directory)
+            self._flush()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {self.counts['classified']} classified, {self.counts['skipped']} skipped, "
+            f"{self.counts['failed']} failed in {elapsed:.1f}s -> {options['output']}"
+        ))
+
+    def _collect(self, pending, batch_size, directory):
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            path = pending.pop(future)
+            record = {'file': os.path.relpath(path, directory), **future.result()}
+
+            if record.pop('skipped', False):
+                self.counts['skipped'] += 1
+            elif 'error' in record:
+                self.counts['failed'] += 1
+                record.pop('text')
+                self._write(record)
+            else:
+                self.batch.append(record)
+                if len(self.batch) >= batch_size:
+                    self._flush()
+
+    def _flush(self):
+        if not self.batch:
+            return
+        started = time.perf_counter()
+        predictions = classify_texts([record.pop('text') for record in self.batch])
+        classify_ms = round((time.perf_counter() - started) * 1e3 / len(self.batch), 2)
+
+        for record, prediction in zip(self.batch, predictions):
+            record['category'] = prediction['category']
+            record['confidence'] = prediction['confidence']
+            if self.include_probabilities:
+                record['all_probabilities'] = prediction['all_probabilities']
+            record['classify_ms'] = classify_ms
+            self._write(record)
+        self.counts['classified'] += len(self.batch)
+        self.batch = []
+        self.out.flush()
+
+    def _write(self, record):
+        self.out.write(json.dumps(record) + '\n')
@@ -0,0 +1,94 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app1.crawler import Crawler, HostLimiter, enqueue_search, frontier_stats
+from app1.job_search import search_skill_for
+from app1.ml_models import ModelLoadError, get_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Crawl several result pages per search through the SQLite crawl "
+        "frontier, with per-host rate and concurrency limits (see app1/crawler.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skills', nargs='+',
+                            help="Search phrases to seed (default: every classifier category)")
+        parser.add_argument('--locations', nargs='+',
+                            default=getattr(settings, 'JOB_CACHE_PREWARM_LOCATIONS', ['bangalore']),
+                            help="Locations to seed (default: settings.JOB_CACHE_PREWARM_LOCATIONS)")
+        parser.add_argument('--max-results', type=int, default=getattr(settings, 'CRAWL_MAX_RESULTS', 100),
+                            help="Jobs to collect per search, following pagination")
+        parser.add_argument('--priority', type=int, default=0, help="Priority of the seeded searches")
+        parser.add_argument('--no-seed', action='store_true', help="Only work through the existing frontier")
+        parser.add_argument('--recrawl', action='store_true', help="Queue already crawled searches again")
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'CRAWL_WORKERS', 4),
+                            help="Pages fetched in parallel")
+        parser.add_argument('--rate', type=float, default=getattr(settings, 'CRAWL_HOST_RATE', 0.5),
+                            help="Requests started per second per host (0 = unlimited)")
+        parser.add_argument('--host-concurrency', type=int, default=getattr(settings, 'CRAWL_HOST_CONCURRENCY', 2),
+                            help="Requests in flight per host")
+        parser.add_argument('--max-pages', type=int, default=getattr(settings, 'CRAWL_MAX_PAGES', 10),
+                            help="Deepest results page followed per search")
+        parser.add_argument('--shard', default='0/1',
+                            help="'i/n': only crawl searches in shard i of n (for running on several nodes)")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling the frontier instead of exiting when it is empty")
+
+    def handle(self, *args, **options):
+        try:
+            shard, shards = (int(part) for part in options['shard'].split('/'))
+        except ValueError:
+            raise CommandError("--shard must look like 0/4")
+        if not 0 <= shard < shards:
+            raise CommandError("--shard index must be below the shard count")
+
+        if not options['no_seed']:
+            seeded = 0
+            for skill in self._skills(options):
+                for location in options['locations']:
+                    _, created = enqueue_search(
+                        skill, location, options['max_results'],
+                        priority=options['priority'], recrawl=options['recrawl'],
+                    )
+                    seeded += created
+            self.stdout.write(f"🌱 Seeded {seeded} new searches")
+
+        crawler = Crawler(
+            workers=options['workers'],
+            shard=shard,
+            shards=shards,
+            limiter=HostLimiter(rate=options['rate'], concurrency=options['host_concurrency']),
+            max_pages=options['max_pages'],
+            max_attempts=getattr(settings, 'CRAWL_MAX_ATTEMPTS', 3),
+            retry_delay=getattr(settings, 'CRAWL_RETRY_DELAY', 60),
+        )
+        signal.signal(signal.SIGTERM, lambda signum, frame: crawler.stop())
+        try:
+            stats = crawler.run(until_empty=not options['loop'])
+        except KeyboardInterrupt:
+            crawler.stop()
+            stats = dict(crawler.stats)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Crawled {stats.get('pages', 0)} pages, {stats.get('jobs', 0)} jobs, "
+            f"{stats.get('retries', 0)} retries, {stats.get('failed', 0)} failed"
+        ))
+        self.stdout.write(
+            f"♻️ Pages parsed {stats.get('pages_parsed', 0)}, skipped unchanged {stats.get('pages_skipped', 0)}; "
+            f"listings parsed {stats.get('listings_parsed', 0)}, reused {stats.get('listings_skipped', 0)}, "
+            f"disappeared {stats.get('disappeared', 0)}"
+        )
+        self.stdout.write(f"📊 Frontier: {frontier_stats()}")
+
+    def _skills(self, options):
+        if options['skills']:
+            return options['skills']
+        try:
+            encoder = get_models().encoder
+        except ModelLoadError as e:
+            raise CommandError(str(e))
+        return sorted({search_skill_for(category) for category in encoder.classes_})
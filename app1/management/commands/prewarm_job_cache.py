@@ -0,0 +1,114 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app1 import job_cache
+from app1.job_search import refresh_search, search_skill_for
+from app1.ml_models import ModelLoadError, get_models
+
+
+class RateLimiter:
+    """Let at most `per_minute` calls start per minute, spaced evenly"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        time.sleep(max(0, start - now))
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the job-search cache for every classifier category and "
+        "configured location before entries go stale"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--locations', nargs='+',
+            default=getattr(settings, 'JOB_CACHE_PREWARM_LOCATIONS', ['bangalore']),
+            help="Locations to warm (default: settings.JOB_CACHE_PREWARM_LOCATIONS)",
+        )
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'JOB_CACHE_PREWARM_CONCURRENCY', 2),
+            help="Searches scraped in parallel",
+        )
+        parser.add_argument(
+            '--rate', type=float,
+            default=getattr(settings, 'JOB_CACHE_PREWARM_RATE', 20),
+            help="Maximum scrapes started per minute (0 = unlimited)",
+        )
+        parser.add_argument(
+            '--lead', type=int,
+            default=getattr(settings, 'JOB_CACHE_PREWARM_LEAD', 600),
+            help="Refresh entries that go stale within this many seconds",
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Keep running, re-checking every --interval seconds",
+        )
+        parser.add_argument(
+            '--interval', type=int,
+            default=getattr(settings, 'JOB_CACHE_PREWARM_INTERVAL', 300),
+            help="Seconds between passes with --loop",
+        )
+
+    def handle(self, *args, **options):
+        searches = [
+            (skill, location)
+            for skill in self._category_skills()
+            for location in options['locations']
+        ]
+        self.stdout.write(f"🔥 Pre-warming {len(searches)} (category, location) searches")
+
+        limiter = RateLimiter(options['rate'])
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            while True:
+                started = time.monotonic()
+                results = list(executor.map(
+                    lambda search: self._warm(search, options['lead'], limiter),
+                    searches
+                ))
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ Pass done in {time.monotonic() - started:.1f}s: "
+                    f"{results.count('refreshed')} refreshed, "
+                    f"{results.count('fresh')} already fresh, "
+                    f"{results.count('failed')} failed"
+                ))
+
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+
+    def _category_skills(self):
+        try:
+            encoder = get_models().encoder
+        except ModelLoadError as e:
+            raise CommandError(str(e))
+        return sorted({search_skill_for(category) for category in encoder.classes_})
+
+    def _warm(self, search, lead, limiter):
+        skill, location = search
+        entry = job_cache.get_entry(skill, location)
+        if entry and not job_cache.is_stale(entry, lead):
+            return 'fresh'
+
+        limiter.wait()
+        try:
+            jobs, tier = refresh_search(skill, location, lead=lead)
+        except Exception as e:
+            self.stderr.write(f"❌ {skill} / {location}: {e}")
+            return 'failed'
+
+        self.stdout.write(f"  {skill} / {location}: {len(jobs)} jobs ({tier})")
+        return 'refreshed'
@@ -0,0 +1,89 @@
+import multiprocessing
+import signal
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app1.extraction_pool import close_extraction_pool
+from app1.pipeline import claim_next, requeue_stale, run_task, worker_name
+
+
+def work(poll, once):
+    """
+    Claim and run tasks until stopped (or, with once, until the queue is empty)
+
+    Every worker also requeues stale tasks on start and then every half
+    PIPELINE_TASK_TIMEOUT, so a task whose worker died is picked up again
+    whether the workers run in one process or many.
+    """
+    name = worker_name()
+    print(f"🔧 Pipeline worker {name} started")
+    check_every = getattr(settings, 'PIPELINE_TASK_TIMEOUT', 300) / 2
+    last_check = None
+    try:
+        while True:
+            if last_check is None or time.monotonic() - last_check > check_every:
+                requeued, failed = requeue_stale()
+                if requeued or failed:
+                    print(f"🔄 Requeued {requeued} stale tasks, failed {failed}")
+                last_check = time.monotonic()
+
+            task = claim_next(name)
+            if task is None:
+                if once:
+                    return
+                time.sleep(poll)
+                continue
+            run_task(task)
+    finally:
+        close_extraction_pool()
+
+
+class Command(BaseCommand):
+    help = "Run background workers for queued resume uploads (see app1/pipeline.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=getattr(settings, 'PIPELINE_WORKERS', 2))
+        parser.add_argument('--poll', type=float, default=getattr(settings, 'PIPELINE_POLL_INTERVAL', 0.5),
+                            help="Seconds between queue checks when idle")
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty")
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 1:
+            work(options['poll'], options['once'])
+            return
+
+        # Children must not share the parent's SQLite connection
+        connections.close_all()
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        context = multiprocessing.get_context('fork')
+        workers = [self._start(context, options) for _ in range(options['processes'])]
+
+        try:
+            while workers:
+                time.sleep(1)
+                for i, process in enumerate(workers):
+                    if process.is_alive():
+                        continue
+                    if options['once']:
+                        workers[i] = None
+                    else:
+                        print(f"⚠️ Pipeline worker {process.pid} exited ({process.exitcode}); restarting")
+                        workers[i] = self._start(context, options)
+                workers = [process for process in workers if process is not None]
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join(5)
+
+    def _start(self, context, options):
+        # Not daemonic: workers start their own extraction processes
+        process = context.Process(target=work, args=(options['poll'], options['once']))
+        process.start()
+        return process
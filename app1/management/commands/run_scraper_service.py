@@ -0,0 +1,51 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app1.driver_pool import get_driver_pool
+from app1.scraper_service import ScraperService, ScraperServiceError
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the Selenium scraper service that web workers reach through "
+        "SCRAPER_SERVICE_ADDRESS (see app1/scraper_service.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--address', default=getattr(settings, 'SCRAPER_SERVICE_ADDRESS', None) or '127.0.0.1:8790',
+                            help="'host:port' or a Unix socket path")
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'SCRAPER_POOL_SIZE', 2),
+                            help="Searches run at once (default: settings.SCRAPER_POOL_SIZE)")
+        parser.add_argument('--queue', type=int, default=getattr(settings, 'SCRAPER_SERVICE_MAX_QUEUE', 8),
+                            help="Searches allowed to wait for a free slot before clients get 'busy'")
+        parser.add_argument('--queue-timeout', type=float, default=getattr(settings, 'SCRAPER_SERVICE_QUEUE_TIMEOUT', 30),
+                            help="Seconds a queued search waits for a slot")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] > getattr(settings, 'SCRAPER_POOL_SIZE', 2):
+            self.stdout.write(self.style.WARNING(
+                "⚠️ --concurrency is above SCRAPER_POOL_SIZE; extra searches will wait for a browser"
+            ))
+
+        service = ScraperService(
+            options['address'],
+            concurrency=options['concurrency'],
+            max_queue=options['queue'],
+            queue_timeout=options['queue_timeout'],
+            secret=getattr(settings, 'SCRAPER_SERVICE_SECRET', None),
+        )
+        signal.signal(signal.SIGTERM, lambda signum, frame: service.shutdown())
+
+        # Start the browsers before the first search arrives
+        get_driver_pool()
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        except ScraperServiceError as e:
+            raise CommandError(str(e))
+        finally:
+            get_driver_pool().close_all()
+            self.stdout.write("🛑 Scraper service stopped")
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('company', models.CharField(default='Not specified', max_length=255)),
+                ('location', models.CharField(default='Not specified', max_length=255)),
+                ('experience', models.CharField(default='Not specified', max_length=100)),
+                ('salary', models.CharField(default='Not disclosed', max_length=100)),
+                ('description', models.TextField(blank=True, default='')),
+                ('skills', models.JSONField(blank=True, default=list)),
+                ('posted_date', models.CharField(default='Recently', max_length=100)),
+                ('url', models.CharField(blank=True, default='', max_length=1000)),
+                ('source', models.CharField(default='Naukri.com', max_length=100)),
+                ('search_skill', models.CharField(max_length=100)),
+                ('search_location', models.CharField(blank=True, default='', max_length=100)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['search_skill', 'search_location', '-last_seen'], name='job_search_recent_idx'), models.Index(fields=['last_seen'], name='job_last_seen_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations
+
+
+# External-content FTS5 index over app1_job, kept in sync by triggers so
+# every upsert from job_store updates the index incrementally. The update
+# trigger only reindexes when an indexed column actually changed, so
+# refreshing last_seen does not touch the index.
+FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE app1_job_fts USING fts5(
+        title, skills, description, company,
+        content='app1_job', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER app1_job_fts_ai AFTER INSERT ON app1_job BEGIN
+        INSERT INTO app1_job_fts(rowid, title, skills, description, company)
+        VALUES (new.id, new.title, new.skills, new.description, new.company);
+    END
+    """,
+    """
+    CREATE TRIGGER app1_job_fts_ad AFTER DELETE ON app1_job BEGIN
+        INSERT INTO app1_job_fts(app1_job_fts, rowid, title, skills, description, company)
+        VALUES ('delete', old.id, old.title, old.skills, old.description, old.company);
+    END
+    """,
+    """
+    CREATE TRIGGER app1_job_fts_au AFTER UPDATE ON app1_job
+    WHEN old.title IS NOT new.title OR old.skills IS NOT new.skills
+      OR old.description IS NOT new.description OR old.company IS NOT new.company
+    BEGIN
+        INSERT INTO app1_job_fts(app1_job_fts, rowid, title, skills, description, company)
+        VALUES ('delete', old.id, old.title, old.skills, old.description, old.company);
+        INSERT INTO app1_job_fts(rowid, title, skills, description, company)
+        VALUES (new.id, new.title, new.skills, new.description, new.company);
+    END
+    """,
+    "INSERT INTO app1_job_fts(app1_job_fts) VALUES ('rebuild')",
+]
+
+BACKWARD_SQL = [
+    "DROP TRIGGER IF EXISTS app1_job_fts_au",
+    "DROP TRIGGER IF EXISTS app1_job_fts_ad",
+    "DROP TRIGGER IF EXISTS app1_job_fts_ai",
+    "DROP TABLE IF EXISTS app1_job_fts",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app1', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FORWARD_SQL), _run(BACKWARD_SQL)),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app1', '0003_pipelinetask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=500, unique=True)),
+                ('host', models.CharField(max_length=255)),
+                ('skill', models.CharField(max_length=100)),
+                ('location', models.CharField(blank=True, default='', max_length=100)),
+                ('page', models.PositiveIntegerField(default=1)),
+                ('max_results', models.PositiveIntegerField(default=100)),
+                ('found_before', models.PositiveIntegerField(default=0)),
+                ('jobs_found', models.PositiveIntegerField(default=0)),
+                ('priority', models.IntegerField(default=0)),
+                ('shard_key', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('worker', models.CharField(blank=True, default='', max_length=100)),
+                ('not_before', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-priority', 'created_at'], name='crawl_frontier_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app1', '0004_crawltask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crawltask',
+            name='containers',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='crawltask',
+            name='page_hash',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='disappeared_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import threading
+from collections import namedtuple
+
+import joblib
+import numpy as np
+from django.conf import settings
+
+
+ARTIFACTS = {
+    'model': 'resume_classifier_model.pkl',
+    'vectorizer': 'tfidf_vectorizer.pkl',
+    'encoder': 'label_encoder.pkl',
+}
+
+Models = namedtuple('Models', ['model', 'vectorizer', 'encoder'])
+
+
+class ModelLoadError(Exception):
+    """Raised when a trained artifact is missing or cannot be unpickled"""
+
+
+def models_dir():
+    return getattr(
+        settings, 'ML_MODELS_DIR',
+        os.path.join(settings.BASE_DIR, 'job_suggestor', 'trained_models')
+    )
+
+
+def load_models(path=None, mmap=None):
+    """
+    Load the classifier, TF-IDF vectorizer and label encoder
+
+    With mmap (default settings.ML_MODELS_MMAP) the numpy arrays inside the
+    artifacts (classifier coefficients, idf weights) are memory-mapped
+    read-only instead of copied onto the heap, so every worker process
+    shares one physical copy through the page cache. That needs the
+    artifacts to be uncompressed joblib dumps (joblib.dump(obj, path) with
+    the default compress=0); compressed ones are loaded normally.
+
+    Raises:
+        ModelLoadError: An artifact is missing or broken
+    """
+    path = path or models_dir()
+    if mmap is None:
+        mmap = getattr(settings, 'ML_MODELS_MMAP', True)
+
+    print(f"🔍 Loading models from: {path}")
+
+    loaded = {}
+    for name, filename in ARTIFACTS.items():
+        try:
+            loaded[name] = joblib.load(os.path.join(path, filename), mmap_mode='r' if mmap else None)
+        except Exception as e:
+            raise ModelLoadError(f"Could not load {name} from {filename}: {e}") from e
+
+    models = Models(**loaded)
+    mapped = isinstance(getattr(models.model, 'coef_', None), np.memmap)
+    print(f"✅ Models loaded successfully! ({'memory-mapped' if mapped else 'in memory'})")
+    print(f"📊 Categories: {list(models.encoder.classes_)}")
+    return models
+
+
+def classify_texts(texts, models=None):
+    """
+    Classify many resumes with one vectorize and one predict_proba pass
+
+    Labels come from the argmax of the probabilities (what model.predict
+    does internally), so inference runs once per batch.
+
+    Returns:
+        One dict per text, in order: 'category', 'confidence' and
+        'all_probabilities' (percentages)
+    """
+    if not texts:
+        return []
+    models = models or get_models()
+
+    probabilities = models.model.predict_proba(models.vectorizer.transform(texts))
+    best = probabilities.argmax(axis=1)
+    categories = models.encoder.inverse_transform(models.model.classes_).tolist()
+    percentages = np.round(probabilities * 100, 2).tolist()
+
+    return [
+        {
+            'category': categories[column],
+            'confidence': row[column],
+            'all_probabilities': dict(zip(categories, row)),
+        }
+        for column, row in zip(best.tolist(), percentages)
+    ]
+
+
+def artifacts_version(path=None):
+    """
+    Short hash of the artifacts' sizes and modification times
+
+    Changes whenever a model is retrained and replaced, so it can key
+    anything derived from the models' output.
+    """
+    path = path or models_dir()
+    stamp = []
+    for filename in sorted(ARTIFACTS.values()):
+        try:
+            info = os.stat(os.path.join(path, filename))
+        except OSError:
+            continue
+        stamp.append(f'{filename}:{info.st_size}:{info.st_mtime_ns}')
+    return hashlib.sha1('|'.join(stamp).encode('utf-8')).hexdigest()[:12]
+
+
+_models = None
+_models_lock = threading.Lock()
+
+
+def get_models():
+    """
+    Process-wide Models, loaded on first use
+
+    Call it before forking (gunicorn preload_app, see gunicorn.conf.py) so
+    workers inherit the loaded models instead of each unpickling its own.
+    """
+    global _models
+
+    if _models is None:
+        with _models_lock:
+            if _models is None:
+                _models = load_models()
+    return _models
+
+
+def memory_usage():
+    """
+    Resident memory of this process in KB, from /proc/self/status
+
+    'rss' splits into 'rss_anon' (private heap) and 'rss_file' (file pages
+    such as memory-mapped model arrays, shared with the other workers).
+    """
+    fields = {'VmRSS': 'rss', 'RssAnon': 'rss_anon', 'RssFile': 'rss_file', 'RssShmem': 'rss_shmem'}
+    usage = {'pid': os.getpid()}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in fields:
+                    usage[fields[key]] = int(value.split()[0])
+    except OSError:
+        import resource
+        usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage
@@ -1,3 +1,152 @@
 from django.db import models
 
 # Create your models here.
+
+
+class Job(models.Model):
+    """
+    A scraped job posting, deduplicated by fingerprint
+
+    Rows are written by app1.job_store.upsert_jobs from the dicts produced
+    by NaukriParser._parse_job_element.
+    """
+    fingerprint = models.CharField(max_length=40, unique=True)
+
+    title = models.CharField(max_length=255)
+    company = models.CharField(max_length=255, default='Not specified')
+    location = models.CharField(max_length=255, default='Not specified')
+    experience = models.CharField(max_length=100, default='Not specified')
+    salary = models.CharField(max_length=100, default='Not disclosed')
+    description = models.TextField(blank=True, default='')
+    skills = models.JSONField(default=list, blank=True)
+    posted_date = models.CharField(max_length=100, default='Recently')
+    url = models.CharField(max_length=1000, blank=True, default='')
+    source = models.CharField(max_length=100, default='Naukri.com')
+
+    # Normalized search that last returned this job (see normalize_search_term)
+    search_skill = models.CharField(max_length=100)
+    search_location = models.CharField(max_length=100, blank=True, default='')
+
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+    # Set when a re-crawl of the page that listed the job no longer shows it
+    disappeared_at = models.DateTimeField(null=True, blank=True)
+    # Last time upsert_jobs rewrote the row (last_seen also moves on touch)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['search_skill', 'search_location', '-last_seen'], name='job_search_recent_idx'),
+            models.Index(fields=['last_seen'], name='job_last_seen_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} @ {self.company}"
+
+    def as_dict(self):
+        """Job in the same dict shape the scrapers return"""
+        return {
+            'title': self.title,
+            'company': self.company,
+            'location': self.location,
+            'experience': self.experience,
+            'salary': self.salary,
+            'description': self.description,
+            'skills': self.skills,
+            'posted_date': self.posted_date,
+            'url': self.url,
+            'source': self.source,
+        }
+
+
+class PipelineTask(models.Model):
+    """
+    One uploaded resume moving through extraction, classification and job
+    search in a background worker (see app1/pipeline.py)
+
+    The table is the queue: workers claim 'queued' rows with a conditional
+    UPDATE, record each finished stage in `result`, and heartbeat while
+    running so a crashed worker's task can be picked up again.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    task_id = models.CharField(max_length=32, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    stage = models.CharField(max_length=20, blank=True, default='')
+
+    filename = models.CharField(max_length=255)
+    upload = models.BinaryField(null=True)
+    location = models.CharField(max_length=100, blank=True, default='')
+
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='pipeline_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} ({self.status}{f', {self.stage}' if self.stage else ''})"
+
+
+class CrawlTask(models.Model):
+    """
+    One results page in the crawl frontier (see app1/crawler.py)
+
+    Crawl workers claim the highest-priority 'queued' page whose not_before
+    has passed, fetch it, and queue the next page of the same search until
+    max_results jobs were found. shard_key is a hash of the search, so
+    nodes can split the frontier with --shard.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    url = models.CharField(max_length=500, unique=True)
+    host = models.CharField(max_length=255)
+    skill = models.CharField(max_length=100)
+    location = models.CharField(max_length=100, blank=True, default='')
+    page = models.PositiveIntegerField(default=1)
+
+    # Jobs wanted for the whole search, and found on the pages before this one
+    max_results = models.PositiveIntegerField(default=100)
+    found_before = models.PositiveIntegerField(default=0)
+    jobs_found = models.PositiveIntegerField(default=0)
+
+    # From the last crawl, so an unchanged page or listing is not parsed
+    # again: hash of the whole page and {container hash: job fingerprint}
+    page_hash = models.CharField(max_length=40, blank=True, default='')
+    containers = models.JSONField(default=dict, blank=True)
+
+    priority = models.IntegerField(default=0)
+    shard_key = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    worker = models.CharField(max_length=100, blank=True, default='')
+
+    not_before = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-priority', 'created_at'], name='crawl_frontier_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
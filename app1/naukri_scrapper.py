@@ -1,34 +1,460 @@
 # jobs/selenium_naukri_scraper.py
-import time
+import hashlib
+import threading
 import random
+from collections import Counter
 from urllib.parse import quote_plus
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-from django.core.cache import cache
-import os
+from django.conf import settings
 
-class SeleniumNaukriScraper:
+from app1.fast_parse import container_strainer, fast_parse_enabled, listings_soup, visible_text
+from app1.page_readiness import PageReadiness
+from app1.selector_engine import SelectorEngine
+
+
+def normalize_search_term(value):
+    """Lowercase, trim and hyphenate a search term the way Naukri URLs do"""
+    if value is None:
+        return ''
+    return '-'.join(str(value).lower().split())
+
+
+def search_cache_key(skill, location=""):
+    """
+    Cache key shared by every tier that searches Naukri
+    
+    Terms are normalized with the same rules as _build_search_url, so
+    'Bangalore ' and 'bangalore' hit the same entry. Experience is not part
+    of the key because it does not change the page that gets scraped.
+    """
+    return "naukri_sel_{}_{}".format(
+        normalize_search_term(skill),
+        normalize_search_term(location),
+    )
+
+
+class NaukriParser:
+    """
+    Turns Naukri.com search pages into job dicts.
+
+    Holds everything that does not need a browser, so the Selenium scraper
+    and the plain HTTP fetcher share one parser.
+    """
+    
+    # Listing containers Naukri actually uses; readiness waits key off these
+    job_tuple_selectors = [
+        'article.jobTuple',
+        'article[class*="jobTuple"]',
+        'div[class*="jobTuple"]',
+        '.srp-jobtuple-wrapper',
+        '.jobTuple',
+    ]
+    
+    job_selectors = job_tuple_selectors + [
+        '[data-job-id]',
+        '.job-list',
+        '.job-card',
+        '.job-item',
+        '.list',
+        
+        
+        '.row',
+        '.job-segment',
+        '.srp-tuple',
+    ]
+    
+    # Fallbacks per field, tried in order (see app1/selector_engine.py)
+    field_selectors = {
+        'title': ['.title', 'a.title', '.job-title', 'h2 a', 'a[class*="title"]', '.srp-title', '.jobTitle'],
+        'company': ['.subTitle', '.comp-name', '.company-name', 'a[class*="subTitle"]', '.comp-dtls', '.company'],
+        'location': ['.locWdth', '.location', '.loc', '.city', '[class*="loc"]'],
+        'experience': ['.expwdth', '.experience', '.exp', '[class*="exp"]', '.yrs'],
+        'salary': ['.sal', '.salary', '[class*="sal"]', '.ctc'],
+        'description': ['.job-description', '.desc', '.description', '.job-desc'],
+        'skills': ['.tags', '.skills', '.key-skills', '[class*="skill"]'],
+        'posted_date': ['.fleft.postedDate', '.posted-date', '.date', '[class*="date"]'],
+    }
+    
+    captcha_indicators = [
+        'captcha', 'security check', 'robot', 'not a robot',
+        'recaptcha', 'verify you are human', 'cloudflare'
+    ]
+    
+    def __init__(self, base_url="https://www.naukri.com"):
+        self.base_url = base_url
+    
+    def _build_search_url(self, skill, location, page=1):
+        """Build Naukri search URL (page 2 onwards end in '-<page>')"""
+        skill_clean = normalize_search_term(skill)
+        
+        if location and location.strip():
+            location_clean = normalize_search_term(location)
+            url = f"{self.base_url}/{skill_clean}-jobs-in-{location_clean}"
+        else:
+            url = f"{self.base_url}/{skill_clean}-jobs"
+        
+        if page > 1:
+            url += f"-{page}"
+        return url
+    
+    def _is_captcha_text(self, page_text):
+        """Check page text for CAPTCHA / bot-wall markers"""
+        page_text = page_text.lower()
+        return any(indicator in page_text for indicator in self.captcha_indicators)
+    
+    def page_soups(self, html):
+        """
+        Soups of a page to extract from, in order
+        
+        In fast-parse mode (settings.SCRAPER_FAST_PARSE with lxml installed)
+        the first holds only the listing containers, built by lxml through
+        a SoupStrainer; the whole page is only parsed with html.parser if
+        that finds no jobs. Consume lazily and stop once jobs are found.
+        """
+        if fast_parse_enabled():
+            yield listings_soup(html, self._container_strainer())
+        yield BeautifulSoup(html, 'html.parser')
+    
+    def extract_from_html(self, html, max_results, allow_manual=True):
+        """_extract_jobs() on raw HTML, parsing no more of it than needed"""
+        for soup in self.page_soups(html):
+            jobs = self._extract_jobs(soup, max_results, allow_manual=False)
+            if jobs:
+                return jobs
+        
+        if allow_manual:
+            print("🔄 No jobs found with selectors, trying manual extraction...")
+            return self._manual_extraction(soup, max_results)
+        return []
+    
+    @classmethod
+    def _container_strainer(cls):
+        # Only the real listing containers: catch-alls like '.row' would
+        # keep most of the page
+        if cls.__dict__.get('_strainer') is None:
+            cls._strainer = container_strainer(cls.job_tuple_selectors)
+        return cls._strainer
+    
+    def _extract_jobs(self, soup, max_results, allow_manual=True):
+        """
+        Extract job listings from HTML
+        
+        Args:
+            soup: Parsed search results page
+            max_results: Maximum jobs to return
+            allow_manual: Fall back to scanning every link when no job
+                          container matches. The HTTP tier turns this off so
+                          an unrendered page escalates to Selenium instead of
+                          returning navigation links as jobs.
+        """
+        return list(self.iter_jobs(soup, max_results, allow_manual))
+    
+    def iter_jobs(self, soup, max_results, allow_manual=True):
+        """
+        Yield job listings one at a time as they are parsed
+        
+        Same rules as _extract_jobs(): the first selector that produces
+        any jobs wins. Streaming callers can show each job as soon as its
+        container is parsed instead of after the whole page.
+        """
+        found = 0
+        for _, job in self.iter_job_tuples(soup, max_results):
+            found += 1
+            yield job
+        
+    
+        if not found and allow_manual:
+            print("🔄 No jobs found with selectors, trying manual extraction...")
+            yield from self._manual_extraction(soup, max_results)
+    
+    def iter_job_tuples(self, soup, max_results, known=None):
+        """
+        Yield (container_hash, job) for each listing container
+        
+        Args:
+            max_results: Stop after this many listings (None = every one)
+            known: Container hashes from an earlier crawl. A container whose
+                   hash is in it is not parsed again and yields job None.
+                   When known is None no hashes are computed and every
+                   container_hash is None.
+        """
+        found = 0
+        
+        print("🔍 Extracting job listings...")
+        
+        for selector, job_elements in get_selector_engine().iter_containers(soup):
+            print(f"  Trying selector '{selector}': found {len(job_elements)} elements")
+            
+            if job_elements and len(job_elements) > 0:
+                print(f"  ✅ Using selector: {selector}")
+                
+                for i, element in enumerate(job_elements[:max_results]):
+                    container_hash = None
+                    if known is not None:
+                        container_hash = hashlib.sha1(str(element).encode('utf-8')).hexdigest()
+                        if container_hash in known:
+                            found += 1
+                            yield container_hash, None
+                            continue
+                    try:
+                        job = self._parse_job_element(element, layout=selector)
+                    except Exception as e:
+                        print(f"    ✗ Failed to parse job {i+1}: {e}")
+                        continue
+                    if job:
+                        found += 1
+                        yield container_hash, job
+                
+            
+                if found:
+                    get_selector_engine().container_won(selector)
+                    return
+    
+    def _parse_job_element(self, element, layout=None):
+        """
+        Parse individual job element
+        
+        Args:
+            layout: Container selector the element was found with; the
+                    selector engine remembers winning field selectors per
+                    layout
+        """
+        engine = get_selector_engine()
+        counts = Counter()
+        try:
+            job = {
+                'title': 'Not specified',
+                'company': 'Not specified',
+                'location': 'Not specified',
+                'experience': 'Not specified',
+                'salary': 'Not disclosed',
+                'description': '',
+                'skills': [],
+                'posted_date': 'Recently',
+                'url': '',
+                'source': 'Naukri.com'
+            }
+            
+            
+            title_elem = engine.find(element, 'title', layout, counts=counts)
+            if title_elem is not None:
+                job['title'] = title_elem.text.strip()
+                
+                
+                if title_elem.name == 'a':
+                    url = title_elem.get('href', '')
+                    if url:
+                        if not url.startswith('http'):
+                            url = self.base_url + url if url.startswith('/') else self.base_url + '/' + url
+                        job['url'] = url
+            
+            
+            for field in ('company', 'location', 'experience', 'salary', 'posted_date'):
+                field_elem = engine.find(element, field, layout, counts=counts)
+                if field_elem is not None:
+                    job[field] = field_elem.text.strip()
+            
+            
+            desc_elem = engine.find(element, 'description', layout, counts=counts)
+            if desc_elem is not None:
+                desc = desc_elem.text.strip()
+                job['description'] = desc[:200] + '...' if len(desc) > 200 else desc
+            
+            
+            # The first skills container wins even when it holds no tags
+            skills_elem = engine.find(element, 'skills', layout, accept=_any_tag, counts=counts)
+            if skills_elem is not None:
+                skill_tags = skills_elem.find_all(['li', 'span', 'div'])
+                skills = [tag.text.strip() for tag in skill_tags if tag.text.strip()]
+                if skills:
+                    job['skills'] = skills
+            
+            
+            if not job['url']:
+                job['url'] = f"{self.base_url}/job-details?title={quote_plus(job['title'])}"
+            
+            return job
+            
+        except Exception as e:
+            print(f"❌ Error parsing job element: {e}")
+            return None
+        finally:
+            engine.record(counts)
+    
+    def _manual_extraction(self, soup, max_results):
+        """Manual extraction when selectors fail"""
+        jobs = []
+        
+        print("🔄 Attempting manual extraction from page...")
+        
+        
+        all_links = soup.find_all('a', href=True)
+        job_links = []
+        
+        for link in all_links:
+            href = link.get('href', '')
+            text = link.text.strip()
+            
+            
+            if ('job' in href.lower() or 'jobs' in href.lower() or 
+                'view' in href.lower() or 'listing' in href.lower()):
+                
+                
+                if text and len(text) > 10 and len(text) < 100:
+                    job_links.append({
+                        'href': href,
+                        'title': text,
+                        'parent': link.parent
+                    })
+        
+        print(f"  Found {len(job_links)} potential job links")
+        
+        
+        for link_info in job_links[:max_results]:
+            try:
+                job = {
+                    'title': link_info['title'],
+                    'company': 'Not specified',
+                    'location': 'Not specified',
+                    'experience': 'Not specified',
+                    'salary': 'Not disclosed',
+                    'description': '',
+                    'skills': [],
+                    'posted_date': 'Recently',
+                    'url': link_info['href'],
+                    'source': 'Naukri.com'
+                }
+                
+                
+                parent = link_info['parent']
+                if parent:
+                    
+                    for elem in parent.find_all(['div', 'span', 'p']):
+                        text = elem.text.strip()
+                        if text and len(text) < 50 and 'company' not in text.lower():
+                            job['company'] = text
+                            break
+                
+                
+                if job['url'] and not job['url'].startswith('http'):
+                    job['url'] = self.base_url + (job['url'] if job['url'].startswith('/') else '/' + job['url'])
+                
+                jobs.append(job)
+                
+            except Exception as e:
+                print(f"    ✗ Failed to process link: {e}")
+                continue
+        
+        return jobs
+    
+    def _fallback_extraction(self, skill, location):
+        """Fallback method when everything else fails"""
+        print("🔄 Using fallback extraction (sample data)...")
+        
+        
+        sample_titles = [
+            f'{skill.title()} Developer',
+            f'Senior {skill.title()} Engineer',
+            f'{skill.title()} Specialist',
+            f'Junior {skill.title()} Developer',
+            f'Full Stack {skill.title()} Developer'
+        ]
+        
+        sample_companies = [
+            'Tech Solutions Inc.',
+            'Software Corp',
+            'Digital Innovations Ltd.',
+            'Global Tech Services',
+            'Startup Ventures'
+        ]
+        
+        sample_locations = [
+            location.title() if location else 'Bangalore',
+            location.title() if location else 'Bangalore',
+            location.title() if location else 'Bangalore',
+            'Remote',
+            f'{location.title() if location else "Bangalore"} / Hybrid'
+        ]
+        
+        sample_jobs = []
+        for i in range(min(5, len(sample_titles))):
+            job = {
+                'title': sample_titles[i],
+                'company': sample_companies[i],
+                'location': sample_locations[i],
+                'experience': f'{i+1}-{i+4} years',
+                'salary': f'₹{3+i},00,000 - ₹{6+i},00,000 PA',
+                'description': f'Looking for {skill} professional with relevant experience. Good problem-solving skills required.',
+                'skills': [skill, 'Python', 'Django', 'REST API', 'MySQL'],
+                'posted_date': f'{i+1} day(s) ago',
+                'url': f'{self.base_url}/job-listing-{i+1}',
+                'source': 'Naukri.com (Sample)'
+            }
+            sample_jobs.append(job)
+        
+        return sample_jobs
+    
+
+_selector_engine = None
+_selector_engine_lock = threading.Lock()
+
+
+def get_selector_engine():
+    """Return the process-wide SelectorEngine for NaukriParser's selectors"""
+    global _selector_engine
+    
+    if _selector_engine is None:
+        with _selector_engine_lock:
+            if _selector_engine is None:
+                _selector_engine = SelectorEngine(
+                    NaukriParser.field_selectors,
+                    NaukriParser.job_selectors,
+                    memo_containers=NaukriParser.job_tuple_selectors,
+                )
+    return _selector_engine
+
+
+def selector_stats():
+    """Per-field hit rates of the selector engine, without creating it"""
+    if _selector_engine is None:
+        return {}
+    return _selector_engine.hit_rates()
+
+
+def _any_tag(tag):
+    return True
+
+
+class SeleniumNaukriScraper(NaukriParser):
     """
     Selenium-based Naukri.com scraper that works with real browser
     """
     
-    def __init__(self, headless=True):  # Changed default to True
+    def __init__(self, headless=True, search_budget=None, base_url=None):  # Changed default to True
         """
         Initialize Selenium driver
         
         Args:
             headless: Run browser in background (True) or visible (False)
                       Changed default to True so browser doesn't show
+            search_budget: Max seconds spent waiting on one search page
+                           (defaults to settings.SCRAPER_SEARCH_BUDGET)
+            base_url: Site root (defaults to settings.NAUKRI_BASE_URL, so
+                      both tiers can point at the same local server)
         """
-        self.base_url = "https://www.naukri.com"
+        super().__init__(base_url or getattr(settings, 'NAUKRI_BASE_URL', 'https://www.naukri.com'))
         self.headless = headless
+        if search_budget is None:
+            search_budget = getattr(settings, 'SCRAPER_SEARCH_BUDGET', 20)
+        self.search_budget = search_budget
         self.driver = None
+        self.pages_loaded = 0
+        self.last_timings = {}
         self._init_driver()
     
     def _init_driver(self):
@@ -106,13 +532,6 @@ class SeleniumNaukriScraper:
         print(f"Location: {location}")
         print(f"Max Results: {max_results}")
         
-        
-        cache_key = f"naukri_sel_{skill}_{location}_{experience}"
-        cached_jobs = cache.get(cache_key)
-        if cached_jobs:
-            print("📦 Returning cached results")
-            return cached_jobs[:max_results]
-        
         jobs = []
         
         try:
@@ -120,23 +539,38 @@ class SeleniumNaukriScraper:
             search_url = self._build_search_url(skill, location)
             print(f"🌐 Opening: {search_url}")
             
+            readiness = PageReadiness(self.driver, budget=self.search_budget)
             
-            self.driver.get(search_url)
+            with readiness.phase('load'):
+                self.driver.get(search_url)
+            self.pages_loaded += 1
             
             
-            time.sleep(random.uniform(3, 5))
+            with readiness.phase('wait_for_jobs'):
+                state = readiness.wait_for_jobs(self.job_tuple_selectors)
             
             
-            if self._check_captcha():
+            # Pulled once and reused for parsing unless the page changes
+            page_source = None
+            if state is None:
+                page_source = self.driver.page_source
+            
+            if state == 'captcha' or (state is None and self._check_captcha(page_source)):
                 print("🚫 CAPTCHA detected! Trying to handle...")
-                self._handle_captcha()
-                time.sleep(5)
+                with readiness.phase('captcha'):
+                    self._handle_captcha()
+                    state = readiness.wait_for_jobs(self.job_tuple_selectors)
+                page_source = None
             
             
-            self._simulate_human_scrolling()
+            if state == 'jobs':
+                with readiness.phase('lazy_load'):
+                    self._simulate_human_scrolling(readiness)
+                page_source = None
             
             
-            page_source = self.driver.page_source
+            if page_source is None:
+                page_source = self.driver.page_source
             
             
             with open('selenium_page.html', 'w', encoding='utf-8') as f:
@@ -144,18 +578,14 @@ class SeleniumNaukriScraper:
             print("💾 Saved page source to selenium_page.html")
             
             
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
+            with readiness.phase('parse'):
+                jobs = self.extract_from_html(page_source, max_results)
             
-            jobs = self._extract_jobs(soup, max_results)
+            self.last_timings = readiness.timings
+            print(f"⏱️ Phase timings (s): {self.last_timings}")
             
             print(f"\n✅ Successfully extracted {len(jobs)} jobs")
             
-    
-            if jobs:
-                cache.set(cache_key, jobs, 7200)  # 2 hours
-                print("💾 Results cached")
-            
         except Exception as e:
             print(f"❌ Error during scraping: {e}")
             import traceback
@@ -172,28 +602,22 @@ class SeleniumNaukriScraper:
         
         return jobs[:max_results]
     
-    def _build_search_url(self, skill, location):
-        """Build Naukri search URL"""
-        skill_clean = skill.strip().lower().replace(' ', '-')
+    def _check_captcha(self, page_source=None):
+        """
+        Check if CAPTCHA is present
         
-        if location and location.strip():
-            location_clean = location.strip().lower().replace(' ', '-')
-            return f"{self.base_url}/{skill_clean}-jobs-in-{location_clean}"
-        else:
-            return f"{self.base_url}/{skill_clean}-jobs"
-    
-    def _check_captcha(self):
-        """Check if CAPTCHA is present"""
+        Args:
+            page_source: Page HTML the caller already pulled from the driver
+        """
         try:
-            page_text = self.driver.page_source.lower()
-            captcha_indicators = [
-                'captcha', 'security check', 'robot', 'not a robot',
-                'recaptcha', 'verify you are human', 'cloudflare'
-            ]
-            
-            for indicator in captcha_indicators:
-                if indicator in page_text:
-                    return True
+            if page_source is None:
+                page_source = self.driver.page_source
+            # Fast-parse mode reads only the visible text, like the
+            # readiness check, so <meta name="robots"> is no false alarm
+            if fast_parse_enabled():
+                page_source = visible_text(page_source)
+            if self._is_captcha_text(page_source):
+                return True
             
             
             iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
@@ -213,10 +637,6 @@ class SeleniumNaukriScraper:
             print("🔄 Attempting to handle CAPTCHA...")
             
             
-            self.driver.refresh()
-            time.sleep(5)
-            
-            
             user_agents = [
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
@@ -229,370 +649,47 @@ class SeleniumNaukriScraper:
             })
             
             
+            # refresh() returns once the new document has loaded; the caller
+            # then waits for job tuples instead of sleeping
             self.driver.delete_all_cookies()
             self.driver.refresh()
-            time.sleep(5)
+            self.pages_loaded += 1
             
             print("✅ CAPTCHA handling attempted")
             
         except Exception as e:
             print(f"⚠️ CAPTCHA handling failed: {e}")
     
-    def _simulate_human_scrolling(self):
-        """Simulate human-like scrolling behavior"""
-        print("🔄 Simulating human scrolling...")
+    def _simulate_human_scrolling(self, readiness):
+        """Scroll through the results until lazily loaded job tuples stop appearing"""
+        print("🔄 Scrolling to load all job tuples...")
         
         try:
-            
-            total_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            
-            current_position = 0
-            scroll_increment = random.randint(300, 800)
-            
-            while current_position < total_height:
-            
-                self.driver.execute_script(f"window.scrollTo(0, {current_position});")
-                
-                
-                time.sleep(random.uniform(0.5, 2.0))
-                
-                
-                current_position += scroll_increment
-            
-        
+            count = readiness.wait_for_stable_count(self.job_tuple_selectors)
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(random.uniform(1, 2))
             
-            print("✅ Scrolling simulation complete")
+            print(f"✅ Scrolling complete: {count} job tuples on page")
             
         except Exception as e:
-            print(f"⚠️ Scrolling simulation failed: {e}")
-    
-    def _extract_jobs(self, soup, max_results):
-        """Extract job listings from HTML"""
-        jobs = []
-        
-        print("🔍 Extracting job listings...")
-        
-        
-        job_selectors = [
-            
-            'article.jobTuple',
-            'article[class*="jobTuple"]',
-            'div[class*="jobTuple"]',
-            '.srp-jobtuple-wrapper',
-            '.jobTuple',
-            
-        
-            '[data-job-id]',
-            '.job-list',
-            '.job-card',
-            '.job-item',
-            '.list',
-            
-            
-            '.row',
-            '.job-segment',
-            '.srp-tuple',
-        ]
-        
-        for selector in job_selectors:
-            job_elements = soup.select(selector)
-            print(f"  Trying selector '{selector}': found {len(job_elements)} elements")
-            
-            if job_elements and len(job_elements) > 0:
-                print(f"  ✅ Using selector: {selector}")
-                
-                for i, element in enumerate(job_elements[:max_results]):
-                    try:
-                        job = self._parse_job_element(element)
-                        if job:
-                            jobs.append(job)
-                    except Exception as e:
-                        print(f"    ✗ Failed to parse job {i+1}: {e}")
-                        continue
-                
-            
-                if jobs:
-                    break
-        
+            print(f"⚠️ Scrolling failed: {e}")
     
-        if not jobs:
-            print("🔄 No jobs found with selectors, trying manual extraction...")
-            jobs = self._manual_extraction(soup, max_results)
-        
-        return jobs
-    
-    def _parse_job_element(self, element):
-        """Parse individual job element"""
+    def is_alive(self):
+        """Check that the browser still answers commands"""
+        if not self.driver:
+            return False
         try:
-            job = {
-                'title': 'Not specified',
-                'company': 'Not specified',
-                'location': 'Not specified',
-                'experience': 'Not specified',
-                'salary': 'Not disclosed',
-                'description': '',
-                'skills': [],
-                'posted_date': 'Recently',
-                'url': '',
-                'source': 'Naukri.com'
-            }
-            
-            
-            title_selectors = [
-                '.title', 
-                'a.title',
-                '.job-title',
-                'h2 a',
-                'a[class*="title"]',
-                '.srp-title',
-                '.jobTitle'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = element.select_one(selector)
-                if title_elem and title_elem.text.strip():
-                    job['title'] = title_elem.text.strip()
-                    
-                    
-                    if title_elem.name == 'a':
-                        url = title_elem.get('href', '')
-                        if url:
-                            if not url.startswith('http'):
-                                url = self.base_url + url if url.startswith('/') else self.base_url + '/' + url
-                            job['url'] = url
-                    break
-            
-            
-            company_selectors = [
-                '.subTitle',
-                '.comp-name',
-                '.company-name',
-                'a[class*="subTitle"]',
-                '.comp-dtls',
-                '.company'
-            ]
-            
-            for selector in company_selectors:
-                company_elem = element.select_one(selector)
-                if company_elem and company_elem.text.strip():
-                    job['company'] = company_elem.text.strip()
-                    break
-            
-        
-            location_selectors = [
-                '.locWdth',
-                '.location',
-                '.loc',
-                '.city',
-                '[class*="loc"]'
-            ]
-            
-            for selector in location_selectors:
-                loc_elem = element.select_one(selector)
-                if loc_elem and loc_elem.text.strip():
-                    job['location'] = loc_elem.text.strip()
-                    break
-            
-            
-            exp_selectors = [
-                '.expwdth',
-                '.experience',
-                '.exp',
-                '[class*="exp"]',
-                '.yrs'
-            ]
-            
-            for selector in exp_selectors:
-                exp_elem = element.select_one(selector)
-                if exp_elem and exp_elem.text.strip():
-                    job['experience'] = exp_elem.text.strip()
-                    break
-            
-            
-            salary_selectors = [
-                '.sal',
-                '.salary',
-                '[class*="sal"]',
-                '.ctc'
-            ]
-            
-            for selector in salary_selectors:
-                sal_elem = element.select_one(selector)
-                if sal_elem and sal_elem.text.strip():
-                    job['salary'] = sal_elem.text.strip()
-                    break
-            
-            
-            desc_selectors = [
-                '.job-description',
-                '.desc',
-                '.description',
-                '.job-desc'
-            ]
-            
-            for selector in desc_selectors:
-                desc_elem = element.select_one(selector)
-                if desc_elem and desc_elem.text.strip():
-                    desc = desc_elem.text.strip()
-                    job['description'] = desc[:200] + '...' if len(desc) > 200 else desc
-                    break
-            
-            
-            skills_selectors = [
-                '.tags',
-                '.skills',
-                '.key-skills',
-                '[class*="skill"]'
-            ]
-            
-            for selector in skills_selectors:
-                skills_elem = element.select_one(selector)
-                if skills_elem:
-                    skill_tags = skills_elem.find_all(['li', 'span', 'div'])
-                    skills = [tag.text.strip() for tag in skill_tags if tag.text.strip()]
-                    if skills:
-                        job['skills'] = skills
-                    break
-            
-            
-            date_selectors = [
-                '.fleft.postedDate',
-                '.posted-date',
-                '.date',
-                '[class*="date"]'
-            ]
-            
-            for selector in date_selectors:
-                date_elem = element.select_one(selector)
-                if date_elem and date_elem.text.strip():
-                    job['posted_date'] = date_elem.text.strip()
-                    break
-            
-            
-            if not job['url']:
-                job['url'] = f"{self.base_url}/job-details?title={quote_plus(job['title'])}"
-            
-            return job
-            
-        except Exception as e:
-            print(f"❌ Error parsing job element: {e}")
-            return None
-    
-    def _manual_extraction(self, soup, max_results):
-        """Manual extraction when selectors fail"""
-        jobs = []
-        
-        print("🔄 Attempting manual extraction from page...")
-        
-        
-        all_links = soup.find_all('a', href=True)
-        job_links = []
-        
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.text.strip()
-            
-            
-            if ('job' in href.lower() or 'jobs' in href.lower() or 
-                'view' in href.lower() or 'listing' in href.lower()):
-                
-                
-                if text and len(text) > 10 and len(text) < 100:
-                    job_links.append({
-                        'href': href,
-                        'title': text,
-                        'parent': link.parent
-                    })
-        
-        print(f"  Found {len(job_links)} potential job links")
-        
-        
-        for link_info in job_links[:max_results]:
-            try:
-                job = {
-                    'title': link_info['title'],
-                    'company': 'Not specified',
-                    'location': 'Not specified',
-                    'experience': 'Not specified',
-                    'salary': 'Not disclosed',
-                    'description': '',
-                    'skills': [],
-                    'posted_date': 'Recently',
-                    'url': link_info['href'],
-                    'source': 'Naukri.com'
-                }
-                
-                
-                parent = link_info['parent']
-                if parent:
-                    
-                    for elem in parent.find_all(['div', 'span', 'p']):
-                        text = elem.text.strip()
-                        if text and len(text) < 50 and 'company' not in text.lower():
-                            job['company'] = text
-                            break
-                
-                
-                if job['url'] and not job['url'].startswith('http'):
-                    job['url'] = self.base_url + (job['url'] if job['url'].startswith('/') else '/' + job['url'])
-                
-                jobs.append(job)
-                
-            except Exception as e:
-                print(f"    ✗ Failed to process link: {e}")
-                continue
-        
-        return jobs
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
     
-    def _fallback_extraction(self, skill, location):
-        """Fallback method when everything else fails"""
-        print("🔄 Using fallback extraction (sample data)...")
-        
-        
-        sample_titles = [
-            f'{skill.title()} Developer',
-            f'Senior {skill.title()} Engineer',
-            f'{skill.title()} Specialist',
-            f'Junior {skill.title()} Developer',
-            f'Full Stack {skill.title()} Developer'
-        ]
-        
-        sample_companies = [
-            'Tech Solutions Inc.',
-            'Software Corp',
-            'Digital Innovations Ltd.',
-            'Global Tech Services',
-            'Startup Ventures'
-        ]
-        
-        sample_locations = [
-            location.title() if location else 'Bangalore',
-            location.title() if location else 'Bangalore',
-            location.title() if location else 'Bangalore',
-            'Remote',
-            f'{location.title() if location else "Bangalore"} / Hybrid'
-        ]
-        
-        sample_jobs = []
-        for i in range(min(5, len(sample_titles))):
-            job = {
-                'title': sample_titles[i],
-                'company': sample_companies[i],
-                'location': sample_locations[i],
-                'experience': f'{i+1}-{i+4} years',
-                'salary': f'₹{3+i},00,000 - ₹{6+i},00,000 PA',
-                'description': f'Looking for {skill} professional with relevant experience. Good problem-solving skills required.',
-                'skills': [skill, 'Python', 'Django', 'REST API', 'MySQL'],
-                'posted_date': f'{i+1} day(s) ago',
-                'url': f'{self.base_url}/job-listing-{i+1}',
-                'source': 'Naukri.com (Sample)'
-            }
-            sample_jobs.append(job)
-        
-        return sample_jobs
+    def reset_session(self):
+        """Clear cookies and site storage so the next user starts clean"""
+        self.driver.delete_all_cookies()
+        self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+            'origin': self.base_url,
+            'storageTypes': 'all'
+        })
+        self.driver.get('about:blank')
     
     def close(self):
         """Close the browser driver"""
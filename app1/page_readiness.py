@@ -0,0 +1,106 @@
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Returns 'jobs' once any listing container is in the DOM, 'captcha' when a
+# bot wall is showing, otherwise null so WebDriverWait keeps polling
+_JOBS_OR_CAPTCHA_JS = """
+if (document.querySelector(arguments[0])) { return 'jobs'; }
+if (document.querySelector('iframe[src*="captcha"]')) { return 'captcha'; }
+var text = (document.title + ' ' + (document.body ? document.body.innerText.slice(0, 2000) : '')).toLowerCase();
+if (text.indexOf('verify you are human') !== -1 || text.indexOf('not a robot') !== -1) { return 'captcha'; }
+return null;
+"""
+
+# Scrolls one viewport and reports [job count, reached bottom]
+_SCROLL_AND_COUNT_JS = """
+window.scrollBy(0, window.innerHeight);
+var atBottom = window.innerHeight + window.scrollY >= document.body.scrollHeight - 2;
+return [document.querySelectorAll(arguments[0]).length, atBottom];
+"""
+
+
+class PageReadiness:
+    """
+    Event-driven waits for a search results page
+
+    Replaces fixed sleeps: every wait returns as soon as the page reaches
+    the state we need, and all waits for one search share a single time
+    budget. Per-phase wall-clock timings are collected in `timings`.
+    """
+
+    def __init__(self, driver, budget=20, poll=0.25):
+        """
+        Args:
+            driver: Selenium WebDriver already pointed at the page
+            budget: Total seconds all waits for this search may use
+            poll: Seconds between DOM checks
+        """
+        self.driver = driver
+        self.poll = poll
+        self.deadline = time.monotonic() + budget
+        self.timings = {}
+
+    def remaining(self):
+        """Seconds left in the budget"""
+        return max(0.0, self.deadline - time.monotonic())
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block and record it under `name`"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(self.timings.get(name, 0) + time.monotonic() - start, 3)
+
+    def wait_for_jobs(self, selectors):
+        """
+        Wait until a job container or a CAPTCHA shows up
+
+        Returns:
+            'jobs', 'captcha', or None when the budget ran out first
+        """
+        selector = ", ".join(selectors)
+        timeout = self.remaining()
+        if timeout <= 0:
+            return None
+
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(
+                lambda d: d.execute_script(_JOBS_OR_CAPTCHA_JS, selector)
+            )
+        except TimeoutException:
+            return None
+
+    def wait_for_stable_count(self, selectors, settle=1.0):
+        """
+        Scroll down until the number of job containers stops growing
+
+        Lazy-loaded tuples are appended while scrolling, so we keep scrolling
+        one viewport per poll and stop once we are at the bottom and the
+        count has not changed for `settle` seconds (or the budget runs out).
+
+        Returns:
+            Number of job containers on the page
+        """
+        selector = ", ".join(selectors)
+        last_count = -1
+        stable_since = time.monotonic()
+
+        while self.remaining() > 0:
+            count, at_bottom = self.driver.execute_script(_SCROLL_AND_COUNT_JS, selector)
+            now = time.monotonic()
+
+            if count != last_count:
+                last_count = count
+                stable_since = now
+            elif at_bottom and now - stable_since >= settle:
+                break
+
+            time.sleep(min(self.poll, self.remaining()))
+
+        return max(last_count, 0)
@@ -0,0 +1,220 @@
+import os
+import socket
+import threading
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app1.job_search import search_jobs, search_skill_for
+from app1.models import PipelineTask
+from app1.resume_cache import get_resume_cache
+
+
+STAGES = ('extract', 'classify', 'search')
+
+
+def enqueue(file, location=""):
+    """
+    Queue an uploaded resume and return its PipelineTask right away
+
+    Raises:
+        ValueError: The file is larger than PIPELINE_MAX_UPLOAD_BYTES
+    """
+    max_bytes = getattr(settings, 'PIPELINE_MAX_UPLOAD_BYTES', 10 * 1024 * 1024)
+    if file.size > max_bytes:
+        raise ValueError(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+
+    return PipelineTask.objects.create(
+        task_id=uuid.uuid4().hex,
+        filename=file.name[:255],
+        upload=file.read(),
+        location=location[:100],
+    )
+
+
+def task_status(task_id):
+    """
+    Lightweight status of a task for polling, or None if there is no such task
+
+    Reads only the status columns and the small result fields, never the
+    upload or the extracted text.
+    """
+    row = (
+        PipelineTask.objects
+        .filter(task_id=task_id)
+        .values('status', 'stage', 'error', 'result__category', 'result__confidence',
+                'result__total_jobs', 'result__tier')
+        .first()
+    )
+    if row is None:
+        return None
+
+    status = {'task_id': task_id, 'status': row['status'], 'stage': row['stage']}
+    if row['status'] == PipelineTask.FAILED:
+        status['error'] = row['error']
+    if row['result__category']:
+        status['category'] = row['result__category']
+        status['confidence'] = row['result__confidence']
+    if row['status'] == PipelineTask.DONE:
+        status['total_jobs'] = row['result__total_jobs']
+        status['tier'] = row['result__tier']
+    return status
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next(worker):
+    """
+    Atomically take the oldest queued task, or return None
+
+    The UPDATE only succeeds while the row is still 'queued', so when two
+    workers pick the same row exactly one of them gets it.
+    """
+    while True:
+        candidate = (
+            PipelineTask.objects
+            .filter(status=PipelineTask.QUEUED)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if candidate is None:
+            return None
+
+        claimed = PipelineTask.objects.filter(id=candidate, status=PipelineTask.QUEUED).update(
+            status=PipelineTask.RUNNING, worker=worker, heartbeat_at=timezone.now(),
+        )
+        if claimed:
+            return PipelineTask.objects.get(id=candidate)
+
+
+def requeue_stale(timeout=None, max_attempts=None):
+    """
+    Give tasks whose worker stopped heartbeating back to the queue
+
+    A task that already used max_attempts is marked failed instead.
+
+    Returns:
+        (requeued, failed) counts
+    """
+    timeout = timeout or getattr(settings, 'PIPELINE_TASK_TIMEOUT', 300)
+    max_attempts = max_attempts or getattr(settings, 'PIPELINE_MAX_ATTEMPTS', 3)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+
+    stale = PipelineTask.objects.filter(status=PipelineTask.RUNNING, heartbeat_at__lt=cutoff)
+    with transaction.atomic():
+        failed = stale.filter(attempts__gte=max_attempts).update(
+            status=PipelineTask.FAILED, error="Worker stopped responding", finished_at=timezone.now(),
+        )
+        requeued = stale.update(status=PipelineTask.QUEUED, worker='')
+    return requeued, failed
+
+
+def run_task(task):
+    """
+    Run the stages of a claimed task that have not finished yet
+
+    Each stage's output is saved before the next starts, so a task picked
+    up again after a crash resumes where it stopped. A timer thread keeps
+    heartbeating while a stage runs, so a slow scrape or extraction is not
+    mistaken for a dead worker and run a second time.
+    """
+    PipelineTask.objects.filter(id=task.id).update(attempts=task.attempts + 1)
+
+    try:
+        for stage in STAGES:
+            if stage in task.result.get('stages_done', []):
+                continue
+            with _heartbeating(task, stage):
+                STAGE_FUNCTIONS[stage](task)
+            task.result.setdefault('stages_done', []).append(stage)
+            PipelineTask.objects.filter(id=task.id).update(result=task.result)
+
+        PipelineTask.objects.filter(id=task.id).update(
+            status=PipelineTask.DONE, stage='', upload=None, finished_at=timezone.now(),
+        )
+        print(f"✅ Pipeline task {task.task_id} done: {task.result.get('category')}, "
+              f"{task.result.get('total_jobs')} jobs")
+
+    except Exception as e:
+        print(f"❌ Pipeline task {task.task_id} failed in {task.stage}: {e}")
+        traceback.print_exc()
+        PipelineTask.objects.filter(id=task.id).update(
+            status=PipelineTask.FAILED, error=str(e)[:1000], upload=None, finished_at=timezone.now(),
+        )
+
+
+@contextmanager
+def _heartbeating(task, stage):
+    """
+    Mark the task as in `stage` and refresh its heartbeat from a timer
+    thread every PIPELINE_HEARTBEAT_INTERVAL seconds until the block exits
+    """
+    task.stage = stage
+    PipelineTask.objects.filter(id=task.id).update(stage=stage, heartbeat_at=timezone.now())
+
+    interval = getattr(settings, 'PIPELINE_HEARTBEAT_INTERVAL', 30)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=_heartbeat_until, args=(task, stop, interval), name=f'heartbeat-{task.task_id}', daemon=True,
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _heartbeat_until(task, stop, interval):
+    try:
+        while not stop.wait(interval):
+            PipelineTask.objects.filter(id=task.id, status=PipelineTask.RUNNING).update(
+                heartbeat_at=timezone.now(),
+            )
+    except Exception as e:
+        print(f"⚠️ Heartbeat for pipeline task {task.task_id} failed: {e}")
+    finally:
+        connection.close()
+
+
+def _extract(task):
+    file = ContentFile(bytes(task.upload), name=task.filename)
+    text = get_resume_cache().extract(file)
+    if not text.strip():
+        raise ValueError("No text found in the resume")
+    task.result['resume_text'] = text[:20000]
+
+
+def _classify(task):
+    prediction = get_resume_cache().predict(task.result['resume_text'])
+    task.result['category'] = prediction['category']
+    task.result['confidence'] = prediction['confidence']
+
+
+def _search(task):
+    # The classification is already saved; like the synchronous upload, a
+    # failed scrape leaves the results page to fall back on its own search
+    try:
+        jobs, tier = search_jobs(search_skill_for(task.result['category']), task.location, max_results=10)
+    except Exception as e:
+        print(f"⚠️ Job search for pipeline task {task.task_id} failed: {e}")
+        jobs, tier = [], 'unavailable'
+        task.result['search_error'] = str(e)[:1000]
+    task.result['total_jobs'] = len(jobs)
+    task.result['tier'] = tier
+
+
+STAGE_FUNCTIONS = {
+    'extract': _extract,
+    'classify': _classify,
+    'search': _search,
+}
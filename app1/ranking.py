@@ -0,0 +1,111 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def job_text(job):
+    """Text of a job that gets vectorized: title, skills, description, company"""
+    return ' '.join([
+        job.get('title', ''),
+        ' '.join(job.get('skills', [])),
+        job.get('description', ''),
+        job.get('company', ''),
+    ])
+
+
+class ResumeJobRanker:
+    """
+    Re-orders candidate jobs by TF-IDF cosine similarity to the resume
+
+    Uses the same fitted vectorizer as the classifier. Job vectors are cached
+    by a hash of the text that gets vectorized, not by the job's URL, so a
+    listing edited in place is vectorized again. Only jobs not seen before
+    are vectorized, in one batched transform() call; the similarities for
+    all candidates come from a single sparse matrix-vector product.
+    """
+
+    def __init__(self, vectorizer, weight=0.5, cache_size=50000):
+        """
+        Args:
+            vectorizer: Fitted TfidfVectorizer from get_models()
+            weight: Share of the final score taken by resume similarity;
+                    the rest comes from the normalized relevance_score
+            cache_size: Job vectors kept in the LRU cache
+        """
+        self.vectorizer = vectorizer
+        self.weight = weight
+        self.cache_size = cache_size
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def rank(self, resume_text, jobs):
+        """
+        Score and sort jobs for one resume
+
+        Adds 'similarity_score' (cosine, 0-1) and 'match_score' (blend of
+        similarity and relevance_score) to every job and returns the jobs
+        sorted by match_score.
+        """
+        if not jobs:
+            return []
+
+        resume = self.vectorizer.transform([resume_text])
+        resume_vector = np.zeros(resume.shape[1])
+        resume_vector[resume.indices] = resume.data
+        resume_norm = np.linalg.norm(resume.data)
+
+        matrix, row_norms = self._job_matrix(jobs, resume.shape[1])
+        dots = matrix.dot(resume_vector)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarities = np.where(row_norms > 0, dots / (row_norms * resume_norm), 0.0)
+        if resume_norm == 0:
+            similarities = np.zeros(len(jobs))
+
+        relevance = np.array([job.get('relevance_score', 0) or 0 for job in jobs], dtype=float)
+        if relevance.max() > 0:
+            relevance = relevance / relevance.max()
+
+        scores = self.weight * similarities + (1 - self.weight) * relevance
+        for job, similarity, score in zip(jobs, np.round(similarities, 4).tolist(), np.round(scores, 4).tolist()):
+            job['similarity_score'] = similarity
+            job['match_score'] = score
+
+        order = np.argsort(-scores, kind='stable')
+        return [jobs[i] for i in order]
+
+    def _job_matrix(self, jobs, n_features):
+        texts = [job_text(job) for job in jobs]
+        fingerprints = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in texts]
+
+        with self._lock:
+            rows = [self._vectors.get(fp) for fp in fingerprints]
+            missing = [i for i, row in enumerate(rows) if row is None]
+            for fp, row in zip(fingerprints, rows):
+                if row is not None:
+                    self._vectors.move_to_end(fp)
+            self.stats['hits'] += len(jobs) - len(missing)
+            self.stats['misses'] += len(missing)
+
+        if missing:
+            fresh = self.vectorizer.transform([texts[i] for i in missing]).tocsr()
+            with self._lock:
+                for position, i in enumerate(missing):
+                    start, end = fresh.indptr[position], fresh.indptr[position + 1]
+                    row = (fresh.indices[start:end].copy(), fresh.data[start:end].copy())
+                    rows[i] = row
+                    self._vectors[fingerprints[i]] = row
+                while len(self._vectors) > self.cache_size:
+                    self._vectors.popitem(last=False)
+
+        lengths = np.fromiter((len(indices) for indices, _ in rows), dtype=np.int64, count=len(rows))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate([indices for indices, _ in rows])
+        data = np.concatenate([data for _, data in rows])
+        matrix = csr_matrix((data, indices, indptr), shape=(len(rows), n_features))
+
+        row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        return matrix, row_norms
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+from app1.extraction_pool import get_extraction_pool, text_or_raise
+from app1.ml_models import artifacts_version, classify_texts
+
+
+def normalized_text_hash(text):
+    """
+    SHA-256 of the text lowercased with whitespace collapsed
+
+    The TF-IDF vectorizer lowercases and tokenizes on word boundaries, so
+    texts that only differ in case or spacing get the same prediction.
+    """
+    normalized = ' '.join(text.lower().split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ResumeCache:
+    """
+    Memoizes resume text extraction and classification by content hash
+
+    Extracted text is keyed by the SHA-256 of the uploaded bytes, and
+    predictions by normalized_text_hash() of that text plus the model
+    artifacts' version, so a retrained model never serves old predictions.
+    Lookups go to an in-process LRU first (bounded by max_bytes), then to
+    the shared Django cache, whose backend bounds its own size.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, timeout=7 * 86400, version=''):
+        """
+        Args:
+            max_bytes: Approximate size bound of the in-process LRU
+            timeout: Seconds entries are kept in the Django cache
+            version: Prefix for prediction keys, e.g. artifacts_version()
+        """
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.version = version
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {
+            'text_memory_hits': 0, 'text_cache_hits': 0, 'text_misses': 0,
+            'prediction_memory_hits': 0, 'prediction_cache_hits': 0, 'prediction_misses': 0,
+            'evictions': 0,
+        }
+
+    def extract(self, file):
+        """Text of an uploaded resume via the ExtractionPool, skipped when the same bytes were seen"""
+        digest = hashlib.sha256()
+        for chunk in file.chunks() if hasattr(file, 'chunks') else [file.read()]:
+            digest.update(chunk)
+        file.seek(0)
+
+        key = f'resume_text_{digest.hexdigest()}'
+        text = self._get(key, 'text')
+        if text is None:
+            result = get_extraction_pool().extract(file)
+            text = text_or_raise(result, file.name)
+            # Partial text from a timeout is used once but not remembered
+            if not result['timed_out']:
+                self._set(key, text)
+        return text
+
+    def extract_many(self, files):
+        """
+        Texts of many uploads, extracted on all of the pool's workers at once
+
+        Returns:
+            One (text, exception) pair per file, in order
+        """
+        if not files:
+            return []
+        # One waiting thread per pool process keeps every worker busy while
+        # each file's timeout still starts when its extraction does
+        workers = min(get_extraction_pool().workers, len(files))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='extract') as executor:
+            futures = [executor.submit(self.extract, file) for file in files]
+        return [(None, future.exception()) if future.exception() else (future.result(), None) for future in futures]
+
+    def predict(self, text):
+        """Prediction dict for the text, as from classify_texts()"""
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts):
+        """Predictions for many texts; only the uncached ones are classified, in one batch"""
+        keys = [f'resume_prediction_{self.version}_{normalized_text_hash(text)}' for text in texts]
+        predictions = [self._get(key, 'prediction') for key in keys]
+
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if missing:
+            for i, prediction in zip(missing, classify_texts([texts[i] for i in missing])):
+                predictions[i] = prediction
+                self._set(keys[i], prediction)
+        return predictions
+
+    def hit_rates(self):
+        """Counters plus the share of lookups served without recomputing"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_bytes'] = self._memory_bytes
+            stats['memory_entries'] = len(self._memory)
+        for kind in ('text', 'prediction'):
+            hits = stats[f'{kind}_memory_hits'] + stats[f'{kind}_cache_hits']
+            lookups = hits + stats[f'{kind}_misses']
+            stats[f'{kind}_hit_rate'] = round(hits / lookups, 3) if lookups else None
+        return stats
+
+    def _get(self, key, kind):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.stats[f'{kind}_memory_hits'] += 1
+                return entry[0]
+
+        value = cache.get(key)
+        if value is not None:
+            self._remember(key, value)
+            with self._lock:
+                self.stats[f'{kind}_cache_hits'] += 1
+            return value
+
+        with self._lock:
+            self.stats[f'{kind}_misses'] += 1
+        return None
+
+    def _set(self, key, value):
+        self._remember(key, value)
+        try:
+            cache.set(key, value, self.timeout)
+        except Exception as e:
+            print(f"⚠️ Could not persist {key}: {e}")
+
+    def _remember(self, key, value):
+        size = len(value) if isinstance(value, str) else len(json.dumps(value))
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            self._memory[key] = (value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted
+                self.stats['evictions'] += 1
+
+
+_resume_cache = None
+_resume_cache_lock = threading.Lock()
+
+
+def get_resume_cache():
+    """Return the process-wide ResumeCache, created from settings on first use"""
+    global _resume_cache
+
+    if _resume_cache is None:
+        with _resume_cache_lock:
+            if _resume_cache is None:
+                _resume_cache = ResumeCache(
+                    max_bytes=getattr(settings, 'RESUME_CACHE_MEMORY_BYTES', 16 * 1024 * 1024),
+                    timeout=getattr(settings, 'RESUME_CACHE_TTL', 7 * 86400),
+                    version=artifacts_version(),
+                )
+    return _resume_cache
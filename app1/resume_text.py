@@ -0,0 +1,143 @@
+import zipfile
+from xml.etree import ElementTree
+
+import PyPDF2
+
+
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt')
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P, W_R, W_T, W_TAB, W_BR, W_CR, W_HYPERLINK = (
+    _W + tag for tag in ('p', 'r', 't', 'tab', 'br', 'cr', 'hyperlink')
+)
+
+
+class ExtractionTimeout(Exception):
+    """Raised inside an extraction when its time or CPU budget runs out"""
+
+
+def iter_text_chunks(file, max_pages=None):
+    """
+    Yield a resume's text piece by piece (PDF pages, Word paragraphs)
+
+    Args:
+        file: File-like object with a .name
+        max_pages: Stop after this many PDF pages (None = all)
+    """
+    name = file.name.lower()
+
+    if name.endswith('.pdf'):
+        yield from _reraise_as(_pdf_chunks(file, max_pages), "Error reading PDF")
+
+    elif name.endswith(('.doc', '.docx')):
+        yield from _reraise_as(_word_chunks(file), "Error reading Word document")
+
+    elif name.endswith('.txt'):
+        yield from _reraise_as(_text_chunks(file), "Error reading text file")
+
+    else:
+        raise Exception("Unsupported file format")
+
+
+def extract_text_from_file(file, max_pages=None, max_chars=None):
+    """Extract text from different file formats"""
+    chunks = []
+    collect_text(iter_text_chunks(file, max_pages), chunks, max_chars)
+    return join_text(chunks, max_chars)
+
+
+def collect_text(chunks, into, max_chars=None):
+    """
+    Append chunks to the list `into` until max_chars is reached
+
+    Filling a caller-owned list (joined once at the end, rather than
+    growing a string) means the text read so far survives an
+    ExtractionTimeout.
+
+    Returns:
+        True if extraction stopped early because of max_chars
+    """
+    total = sum(len(chunk) for chunk in into)
+    for chunk in chunks:
+        into.append(chunk)
+        total += len(chunk)
+        if max_chars and total >= max_chars:
+            return True
+    return False
+
+
+def join_text(chunks, max_chars=None):
+    text = ''.join(chunks)
+    if max_chars:
+        text = text[:max_chars]
+    return text.strip()
+
+
+def _pdf_chunks(file, max_pages):
+    pdf_reader = PyPDF2.PdfReader(file)
+    for number, page in enumerate(pdf_reader.pages):
+        if max_pages and number >= max_pages:
+            break
+        yield (page.extract_text() or '') + "\n"
+
+
+def _word_chunks(file):
+    """
+    Stream paragraph text out of word/document.xml in document order
+
+    Paragraphs inside table cells are included (python-docx's
+    Document.paragraphs skips them). Each top-level body element is
+    dropped once read, so memory stays flat however long the document is.
+    """
+    with zipfile.ZipFile(file) as archive, archive.open('word/document.xml') as xml:
+        depth = 0
+        body = None
+        for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2:
+                    body = element
+                continue
+
+            depth -= 1
+            if element.tag == W_P:
+                yield _paragraph_text(element) + "\n"
+            if depth == 2:
+                body.clear()
+
+
+def _paragraph_text(paragraph):
+    # Like python-docx Paragraph.text: runs directly in the paragraph or in
+    # its hyperlinks, so text boxes nested inside are not read twice
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            runs = [child]
+        elif child.tag == W_HYPERLINK:
+            runs = child.iterfind(W_R)
+        else:
+            continue
+        for run in runs:
+            for node in run:
+                if node.tag == W_T:
+                    parts.append(node.text or '')
+                elif node.tag == W_TAB:
+                    parts.append('\t')
+                elif node.tag in (W_BR, W_CR):
+                    parts.append('\n')
+    return ''.join(parts)
+
+
+def _text_chunks(file):
+    yield file.read().decode('utf-8')
+
+
+def _reraise_as(chunks, message):
+    # Parser errors become "<message>: <error>"; time and memory limits
+    # propagate unchanged so the caller can tell them apart
+    try:
+        yield from chunks
+    except (ExtractionTimeout, MemoryError):
+        raise
+    except Exception as e:
+        raise Exception(f"{message}: {str(e)}")
@@ -0,0 +1,395 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from scipy.sparse import csr_matrix, vstack
+
+
+MANIFEST = 'manifest.json'
+ARRAYS = ('fingerprints', 'row_ptr', 'row_idx', 'row_val', 'post_ptr', 'post_doc', 'post_weight')
+
+
+class JobVectorIndex:
+    """
+    Top-k retrieval over job TF-IDF vectors without scoring every job
+
+    Saved jobs form a base segment: an impact-ordered inverted index (each
+    term's postings sorted by weight) plus the forward rows, stored as .npy
+    files and memory-mapped on load, so every worker shares the OS page
+    cache. Jobs added after loading go to an in-memory delta segment that is
+    scored by brute force until the next save() folds it into the base.
+    Jobs discarded after loading are hidden from results at once and
+    dropped from the base segment by the next save().
+
+    Queries run term-at-a-time in order of decreasing upper bound. Once
+    there is a full candidate pool, a posting is only read if its
+    contribution could still lift an unseen job into the pool, so long
+    posting lists are cut short. Candidates are then re-scored exactly from
+    their forward rows.
+    """
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.path = None
+        self.generation = None
+        # When the jobs in the index were read from the Job table (ISO 8601)
+        self.built_at = None
+
+        self._fingerprints = np.empty(0, dtype='S40')
+        self._row_ptr = np.zeros(1, dtype=np.int64)
+        self._row_idx = np.empty(0, dtype=np.int32)
+        self._row_val = np.empty(0, dtype=np.float32)
+        self._post_ptr = np.zeros(n_features + 1, dtype=np.int64)
+        self._post_doc = np.empty(0, dtype=np.int32)
+        self._post_weight = np.empty(0, dtype=np.float32)
+
+        self._delta_fingerprints = []
+        self._delta_rows = []
+        self._delta_matrix = None
+        self._known = None
+        self._removed = set()
+        self._lock = threading.Lock()
+        self._scratch = threading.local()
+
+    def __len__(self):
+        return len(self._fingerprints) - len(self._removed) + len(self._delta_fingerprints)
+
+    def fingerprints(self):
+        """Fingerprints of every job in the index"""
+        with self._lock:
+            return set(self._known_fingerprints())
+
+    def add(self, fingerprints, matrix):
+        """
+        Insert job vectors; fingerprints already in the index are skipped
+
+        Args:
+            fingerprints: job_fingerprint() of each row
+            matrix: Sparse (n_jobs x n_features) TF-IDF rows
+
+        Returns:
+            Number of jobs added
+        """
+        matrix = csr_matrix(matrix, dtype=np.float32)
+        added = 0
+        with self._lock:
+            known = self._known_fingerprints()
+            for i, fingerprint in enumerate(fingerprints):
+                if fingerprint in known:
+                    continue
+                known.add(fingerprint)
+                self._delta_fingerprints.append(fingerprint)
+                self._delta_rows.append(matrix[i])
+                added += 1
+            if added:
+                self._delta_matrix = None
+        return added
+
+    def discard(self, fingerprints):
+        """
+        Remove jobs, e.g. listings that disappeared or changed (discard and
+        add() them again to refresh their vectors)
+
+        Returns:
+            Number of jobs removed
+        """
+        removed = 0
+        with self._lock:
+            known = self._known_fingerprints()
+            for fingerprint in set(fingerprints) & known:
+                known.discard(fingerprint)
+                if fingerprint in self._delta_fingerprints:
+                    i = self._delta_fingerprints.index(fingerprint)
+                    del self._delta_fingerprints[i]
+                    del self._delta_rows[i]
+                    self._delta_matrix = None
+                else:
+                    self._removed.add(fingerprint)
+                removed += 1
+        return removed
+
+    def _known_fingerprints(self):
+        # Built on first use: a search-only worker never needs it
+        if self._known is None:
+            self._known = {fp.decode('ascii') for fp in self._fingerprints} - self._removed
+            self._known.update(self._delta_fingerprints)
+        return self._known
+
+    def search(self, query, k=20, candidate_factor=8, max_query_terms=32):
+        """
+        Nearest jobs to a query vector by dot product (cosine for the
+        l2-normalized TF-IDF rows)
+
+        Args:
+            query: 1 x n_features sparse vector, e.g. a vectorized resume
+            k: Number of jobs to return
+            candidate_factor: Candidate pool is k * candidate_factor jobs
+                              before exact re-scoring; larger is slower but
+                              recalls more
+            max_query_terms: Only the heaviest query terms drive candidate
+                             selection (a resume has hundreds); all terms
+                             are used for the exact re-score
+
+        Returns:
+            [(fingerprint, score)] best first
+        """
+        query = csr_matrix(query)
+        terms = query.indices
+        weights = query.data.astype(np.float32)
+        pool = k * candidate_factor
+
+        results = []
+        if len(self._fingerprints) and len(terms):
+            heaviest = np.argsort(-weights)[:max_query_terms]
+            docs = self._select_base(terms[heaviest], weights[heaviest], pool)
+            scores = self._rescore(docs, terms, weights)
+            hits = zip((self._fingerprints[d].decode('ascii') for d in docs), scores.tolist())
+            results.extend(hit for hit in hits if hit[0] not in self._removed)
+
+        delta = self._delta()
+        if delta is not None and len(terms):
+            dense = np.zeros(self.n_features, dtype=np.float32)
+            dense[terms] = weights
+            scores = delta.dot(dense)
+            top = _top(scores, pool)
+            results.extend((self._delta_fingerprints[i], float(scores[i])) for i in top)
+
+        results.sort(key=lambda item: item[1], reverse=True)
+        return [item for item in results[:k] if item[1] > 0]
+
+    def _select_base(self, terms, weights, pool):
+        n_docs = len(self._fingerprints)
+        scratch = self._scratch
+        if getattr(scratch, 'size', None) != n_docs:
+            scratch.scores = np.zeros(n_docs, dtype=np.float32)
+            scratch.seen = np.zeros(n_docs, dtype=bool)
+            scratch.size = n_docs
+        scores, seen = scratch.scores, scratch.seen
+
+        starts = self._post_ptr[terms]
+        ends = self._post_ptr[terms + 1]
+        nonempty = ends > starts
+        term_max = np.zeros(len(terms), dtype=np.float32)
+        # Postings are sorted by ascending weight, so the last one is the max
+        term_max[nonempty] = self._post_weight[ends[nonempty] - 1]
+        bounds = weights * term_max
+        order = np.argsort(-bounds)
+        # Best score any job can still gain from the terms after position i
+        bound_after = np.concatenate((np.cumsum(bounds[order][::-1])[::-1][1:], [0.0]))
+
+        touched_parts = []
+        n_touched = 0
+        threshold = 0.0
+        try:
+            for position, i in enumerate(order):
+                if not nonempty[i]:
+                    continue
+                start, end = starts[i], ends[i]
+
+                # An unseen job needs at least this much from this term to
+                # still reach the pool; skip the postings that cannot give it
+                needed = threshold - bound_after[position]
+                if needed > 0:
+                    if bounds[i] < needed:
+                        continue
+                    start = start + np.searchsorted(self._post_weight[start:end], needed / weights[i], side='left')
+
+                docs = self._post_doc[start:end]
+                scores[docs] += weights[i] * self._post_weight[start:end]
+                new_docs = docs[~seen[docs]]
+                seen[new_docs] = True
+                touched_parts.append(new_docs)
+                n_touched += len(new_docs)
+
+                if n_touched >= pool:
+                    touched = np.concatenate(touched_parts)
+                    touched_parts = [touched]
+                    threshold = np.partition(scores[touched], -pool)[-pool]
+
+            touched = np.concatenate(touched_parts) if touched_parts else np.empty(0, dtype=np.int32)
+            candidates = touched[_top(scores[touched], pool)]
+            touched_parts = [touched]
+        finally:
+            touched = np.concatenate(touched_parts) if touched_parts else np.empty(0, dtype=np.int32)
+            scores[touched] = 0.0
+            seen[touched] = False
+
+        return candidates
+
+    def _rescore(self, docs, terms, weights):
+        dense = np.zeros(self.n_features, dtype=np.float32)
+        dense[terms] = weights
+        return np.array([
+            np.dot(self._row_val[self._row_ptr[d]:self._row_ptr[d + 1]],
+                   dense[self._row_idx[self._row_ptr[d]:self._row_ptr[d + 1]]])
+            for d in docs
+        ], dtype=np.float32)
+
+    def _delta(self):
+        with self._lock:
+            if self._delta_matrix is None and self._delta_rows:
+                self._delta_matrix = vstack(self._delta_rows, format='csr')
+            return self._delta_matrix
+
+    def save(self, path, built_at=None):
+        """
+        Fold the delta into the base segment, drop discarded jobs and write
+        it under `path`
+
+        Files of the new generation are written first and the manifest is
+        swapped atomically, so readers never see a half-written index.
+        """
+        if built_at is not None:
+            self.built_at = built_at
+
+        base = csr_matrix(
+            (np.asarray(self._row_val), np.asarray(self._row_idx), np.asarray(self._row_ptr)),
+            shape=(len(self._fingerprints), self.n_features)
+        )
+        base_fingerprints = np.asarray(self._fingerprints)
+        if self._removed:
+            keep = np.array([fp.decode('ascii') not in self._removed for fp in base_fingerprints], dtype=bool)
+            base = base[keep]
+            base_fingerprints = base_fingerprints[keep]
+        delta = self._delta()
+        rows = base if delta is None else vstack([base, delta], format='csr')
+        fingerprints = np.concatenate((
+            base_fingerprints,
+            np.array(self._delta_fingerprints, dtype='S40'),
+        ))
+
+        columns = rows.tocsc()
+        term_of_entry = np.repeat(np.arange(self.n_features), np.diff(columns.indptr))
+        impact_order = np.lexsort((columns.data, term_of_entry))
+
+        arrays = {
+            'fingerprints': fingerprints,
+            'row_ptr': rows.indptr.astype(np.int64),
+            'row_idx': rows.indices.astype(np.int32),
+            'row_val': rows.data.astype(np.float32),
+            'post_ptr': columns.indptr.astype(np.int64),
+            'post_doc': columns.indices[impact_order].astype(np.int32),
+            'post_weight': columns.data[impact_order].astype(np.float32),
+        }
+
+        os.makedirs(path, exist_ok=True)
+        generation = time.time_ns()
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f'{name}.{generation}.npy'), array)
+
+        manifest = {
+            'generation': generation,
+            'n_features': self.n_features,
+            'size': len(fingerprints),
+            'built_at': self.built_at,
+        }
+        tmp_manifest = os.path.join(path, MANIFEST + '.tmp')
+        with open(tmp_manifest, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_manifest, os.path.join(path, MANIFEST))
+
+        for filename in os.listdir(path):
+            parts = filename.split('.')
+            if len(parts) == 3 and parts[0] in ARRAYS and parts[1] != str(generation):
+                try:
+                    os.remove(os.path.join(path, filename))
+                except OSError:
+                    pass
+
+        loaded = self.load(path)
+        self.__dict__.update(loaded.__dict__)
+        return self
+
+    @classmethod
+    def load(cls, path):
+        """Open a saved index with every array memory-mapped read-only"""
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+
+        index = cls(manifest['n_features'])
+        index.path = path
+        index.generation = manifest['generation']
+        index.built_at = manifest.get('built_at')
+        for name in ARRAYS:
+            array = np.load(os.path.join(path, f"{name}.{manifest['generation']}.npy"), mmap_mode='r')
+            setattr(index, f'_{name}', array)
+        return index
+
+
+def _top(scores, count):
+    """Indices of the `count` largest scores, best first"""
+    if len(scores) > count:
+        top = np.argpartition(-scores, count - 1)[:count]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_vector_index():
+    """
+    Process-wide index loaded from settings.JOB_VECTOR_INDEX_DIR
+
+    Reloaded when `manage.py build_job_index` publishes a new generation;
+    returns None if no index has been built yet.
+    """
+    global _index
+
+    path = getattr(settings, 'JOB_VECTOR_INDEX_DIR', None)
+    if not path:
+        return None
+    manifest = os.path.join(path, MANIFEST)
+    if not os.path.exists(manifest):
+        return None
+
+    with open(manifest) as f:
+        generation = json.load(f)['generation']
+
+    with _index_lock:
+        if _index is None or _index.generation != generation:
+            _index = JobVectorIndex.load(path)
+        return _index
+
+
+def nearest_jobs(query, k=20, skill=None, location=None, candidate_factor=5):
+    """
+    Stored jobs closest to a query vector, as scraper-style dicts
+
+    Args:
+        skill, location: Only jobs stored for this search (the index spans
+                         every search, so k * candidate_factor neighbours
+                         are fetched and the rest filtered out)
+
+    Returns:
+        Job dicts with 'similarity_score', best first; [] if no index
+    """
+    from app1.models import Job
+    from app1.naukri_scrapper import normalize_search_term
+
+    index = get_job_vector_index()
+    if index is None:
+        return []
+
+    # The index is only rebuilt now and then; listings gone since are skipped
+    jobs = Job.objects.filter(disappeared_at__isnull=True)
+    if skill:
+        jobs = jobs.filter(search_skill=normalize_search_term(skill))
+    if location:
+        jobs = jobs.filter(search_location=normalize_search_term(location))
+    filtered = skill or location
+
+    hits = index.search(query, k=k * candidate_factor if filtered else k)
+    jobs_by_fingerprint = jobs.in_bulk([fingerprint for fingerprint, _ in hits], field_name='fingerprint')
+    results = []
+    for fingerprint, score in hits:
+        if fingerprint in jobs_by_fingerprint:
+            job = jobs_by_fingerprint[fingerprint].as_dict()
+            job['similarity_score'] = round(score, 4)
+            results.append(job)
+    return results[:k]
@@ -0,0 +1,339 @@
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+from app1.driver_pool import DriverPoolTimeout, get_driver_pool, pool_stats
+
+
+# Every message is a 4-byte big-endian length followed by that many bytes of
+# UTF-8 JSON. Requests: {'op': 'search', 'skill', 'location', 'max_results'}
+# or {'op': 'stats'}, plus 'secret' when the service has one. Responses:
+# {'ok': True, ...} or {'ok': False, 'error', 'busy'}.
+_HEADER = struct.Struct('>I')
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class ScraperServiceError(Exception):
+    """Raised when the scraper service cannot be reached or reports a failure"""
+
+
+class ScraperServiceBusy(ScraperServiceError):
+    """Raised when the scraper service is at its concurrency and queue limits"""
+
+
+def send_message(sock, message):
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock):
+    """Read one framed message, or return None if the peer closed the connection"""
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ScraperServiceError(f"Message of {length} bytes is too large")
+    data = _recv_exactly(sock, length)
+    if data is None:
+        raise ScraperServiceError("Connection closed mid-message")
+    return json.loads(data.decode('utf-8'))
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            if chunks:
+                raise ScraperServiceError("Connection closed mid-message")
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def parse_address(address):
+    """
+    'host:port' -> (AF_INET, (host, port)); a path ('/run/scraper.sock' or
+    'unix:/run/scraper.sock') -> (AF_UNIX, path)
+    """
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    if '/' in address:
+        return socket.AF_UNIX, address
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class ScraperService:
+    """
+    Runs Selenium searches for web workers that connect over a socket
+
+    Chrome then lives only in this process, so the web tier and the
+    scrapers can be sized (and placed on nodes) independently. At most
+    `concurrency` searches run at once; up to `max_queue` more wait for a
+    slot for at most `queue_timeout` seconds. Anything beyond that gets an
+    immediate 'busy' reply instead of piling up.
+
+    With a `secret`, every request must carry it. Without one the service
+    only listens on a Unix socket or a loopback address; it is sent in
+    clear, so reach it across nodes over a private network only.
+    """
+
+    def __init__(self, address, concurrency=2, max_queue=8, queue_timeout=30, secret=None):
+        """
+        Args:
+            address: 'host:port' or a Unix socket path
+            concurrency: Searches run at the same time
+            max_queue: Searches allowed to wait for a free slot
+            queue_timeout: Seconds a search waits for a slot before 'busy'
+            secret: Shared secret clients must send (see ScraperClient)
+        """
+        self.address = address
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.secret = secret
+
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._server = None
+        self.stats = {'searches': 0, 'errors': 0, 'rejected': 0, 'unauthorized': 0, 'connections': 0}
+
+    def serve_forever(self):
+        """
+        Raises:
+            ScraperServiceError: A non-loopback TCP address without a secret
+        """
+        family, bind_address = parse_address(self.address)
+        if family != socket.AF_UNIX and not self.secret and not _is_loopback(bind_address[0]):
+            raise ScraperServiceError(
+                f"Refusing to listen on {self.address} without SCRAPER_SERVICE_SECRET; "
+                "set one or bind to a loopback address or a Unix socket"
+            )
+        service = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                service._handle_connection(self.request)
+
+        if family == socket.AF_UNIX:
+            _remove_stale_socket(bind_address)
+            self._server = _UnixServer(bind_address, Handler)
+        else:
+            self._server = _TCPServer(bind_address, Handler)
+        print(f"🕸️ Scraper service listening on {self.address} "
+              f"(concurrency {self.concurrency}, queue {self.max_queue})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def shutdown(self):
+        """Stop serve_forever() (call from another thread or a signal handler)"""
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _handle_connection(self, sock):
+        self._bump('connections')
+        # A connection may carry several requests, one after another
+        while True:
+            try:
+                request = recv_message(sock)
+            except (OSError, ValueError, ScraperServiceError) as e:
+                print(f"⚠️ Dropping scraper client: {e}")
+                return
+            if request is None:
+                return
+            try:
+                send_message(sock, self._dispatch(request))
+            except OSError:
+                return
+
+    def _dispatch(self, request):
+        if self.secret and not hmac.compare_digest(str(request.get('secret', '')).encode(), self.secret.encode()):
+            self._bump('unauthorized')
+            return {'ok': False, 'error': "Unauthorized", 'busy': False}
+
+        op = request.get('op')
+        if op == 'search':
+            return self._search(request)
+        if op == 'stats':
+            with self._lock:
+                return {
+                    'ok': True, 'service': dict(self.stats),
+                    'running': self._running, 'waiting': self._waiting,
+                    'driver_pool': pool_stats(),
+                }
+        return {'ok': False, 'error': f"Unknown op {op!r}", 'busy': False}
+
+    def _search(self, request):
+        if not self._acquire():
+            self._bump('rejected')
+            return {'ok': False, 'error': "Scraper service is busy", 'busy': True}
+
+        started = time.perf_counter()
+        try:
+            with get_driver_pool().scraper() as scraper:
+                jobs = scraper.search_jobs(
+                    skill=request['skill'],
+                    location=request.get('location', ''),
+                    max_results=request.get('max_results', 20),
+                )
+                timings = getattr(scraper, 'last_timings', {})
+        except DriverPoolTimeout as e:
+            self._bump('rejected')
+            return {'ok': False, 'error': str(e), 'busy': True}
+        except Exception as e:
+            self._bump('errors')
+            print(f"❌ Scraper service search failed: {e}")
+            return {'ok': False, 'error': str(e), 'busy': False}
+        finally:
+            self._release()
+
+        self._bump('searches')
+        return {
+            'ok': True, 'jobs': jobs, 'timings': timings,
+            'elapsed': round(time.perf_counter() - started, 3),
+        }
+
+    def _acquire(self):
+        with self._lock:
+            if self._slots.acquire(blocking=False):
+                self._running += 1
+                return True
+            if self._waiting >= self.max_queue:
+                return False
+            self._waiting += 1
+
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._running += 1
+        return acquired
+
+    def _release(self):
+        with self._lock:
+            self._running -= 1
+        self._slots.release()
+
+    def _bump(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
+
+
+def _remove_stale_socket(path):
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def _is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ScraperClient:
+    """
+    Web-worker side of the scraper service
+
+    Opens one short-lived connection per call, so it is safe to share
+    between threads.
+    """
+
+    def __init__(self, address, timeout=60, connect_timeout=2, secret=None):
+        """
+        Args:
+            address: Same format as ScraperService's
+            timeout: Seconds to wait for a reply (queueing plus scraping)
+            connect_timeout: Seconds to wait for the connection itself
+            secret: The service's shared secret, if it has one
+        """
+        self.address = address
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.secret = secret
+
+    def search_jobs(self, skill, location="", max_results=20):
+        """
+        Run a Selenium search in the service
+
+        Raises:
+            ScraperServiceBusy: The service is at its limits; try later
+            ScraperServiceError: The service is unreachable or the search failed
+        """
+        reply = self._call({
+            'op': 'search', 'skill': skill, 'location': location, 'max_results': max_results,
+        })
+        return reply['jobs']
+
+    def stats(self):
+        return self._call({'op': 'stats'})
+
+    def _call(self, request):
+        if self.secret:
+            request = dict(request, secret=self.secret)
+        family, address = parse_address(self.address)
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.connect_timeout)
+                sock.connect(address)
+                sock.settimeout(self.timeout)
+                send_message(sock, request)
+                reply = recv_message(sock)
+        except OSError as e:
+            raise ScraperServiceError(f"Scraper service at {self.address} failed: {e}")
+
+        if reply is None:
+            raise ScraperServiceError("Scraper service closed the connection")
+        if not reply.get('ok'):
+            error = ScraperServiceBusy if reply.get('busy') else ScraperServiceError
+            raise error(reply.get('error', 'Unknown error'))
+        return reply
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_scraper_client():
+    """Return the process-wide ScraperClient, or None when SCRAPER_SERVICE_ADDRESS is unset"""
+    global _client
+
+    address = getattr(settings, 'SCRAPER_SERVICE_ADDRESS', None)
+    if not address:
+        return None
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ScraperClient(
+                    address,
+                    timeout=getattr(settings, 'SCRAPER_SERVICE_TIMEOUT', 60),
+                    secret=getattr(settings, 'SCRAPER_SERVICE_SECRET', None),
+                )
+    return _client
@@ -0,0 +1,137 @@
+import threading
+from collections import Counter, defaultdict
+
+import soupsieve
+
+
+class SelectorEngine:
+    """
+    CSS selector fallbacks, compiled once, that remember what worked
+
+    Each field (and the listing container itself) has an ordered list of
+    selectors. Compiling them up front avoids re-parsing the CSS for every
+    select_one() call. For every page layout (the container selector that
+    matched) the engine remembers which selector last produced each field
+    and tries it first, falling back to the full list in order only when
+    it finds nothing.
+    """
+
+    def __init__(self, field_selectors, container_selectors, memo_containers=None):
+        """
+        Args:
+            field_selectors: {field: [selector, ...]} in fallback order
+            container_selectors: Listing container selectors in fallback order
+            memo_containers: Container selectors allowed to be tried first
+                             once they have matched (default: all). Generic
+                             catch-alls like '.row' should not jump ahead of
+                             real listing containers.
+        """
+        self.fields = {
+            field: [(selector, soupsieve.compile(selector)) for selector in selectors]
+            for field, selectors in field_selectors.items()
+        }
+        self.containers = [(selector, soupsieve.compile(selector)) for selector in container_selectors]
+        self.memo_containers = set(container_selectors if memo_containers is None else memo_containers)
+
+        self._winners = {}
+        self._container_winner = None
+        self._lock = threading.Lock()
+        # field -> {'hit': winner worked first time, 'fallback': another
+        # selector was needed, 'miss': nothing matched}
+        self.stats = defaultdict(Counter)
+
+    def iter_containers(self, soup):
+        """
+        Yield (selector, elements) for container selectors in try order
+
+        The last container selector that produced jobs comes first; the
+        caller stops once a selector gives it jobs and reports that with
+        container_won().
+        """
+        winner = self._container_winner
+        if winner is not None:
+            yield winner, self._compiled_container(winner).select(soup)
+        for selector, compiled in self.containers:
+            if selector != winner:
+                yield selector, compiled.select(soup)
+
+    def container_won(self, selector):
+        if selector in self.memo_containers:
+            self._container_winner = selector
+
+    def find(self, element, field, layout, accept=None, counts=None):
+        """
+        First matching tag for a field inside a listing element, or None
+
+        Args:
+            layout: Key the remembered winner is stored under (the
+                    container selector of the page)
+            accept: Extra test a tag must pass (default: non-empty text)
+            counts: Counter to record hit/fallback/miss in; merge it with
+                    record() once per element to keep locking cheap
+        """
+        accept = accept or _has_text
+        rules = self.fields[field]
+        key = (layout, field)
+        winner = self._winners.get(key)
+
+        if winner is not None:
+            tag = rules[winner][1].select_one(element)
+            if tag is not None and accept(tag):
+                _count(counts, field, 'hit')
+                return tag
+
+        for index, (_, compiled) in enumerate(rules):
+            if index == winner:
+                continue
+            tag = compiled.select_one(element)
+            if tag is not None and accept(tag):
+                self._winners[key] = index
+                _count(counts, field, 'fallback')
+                return tag
+
+        _count(counts, field, 'miss')
+        return None
+
+    def record(self, counts):
+        """Merge per-element counts from find() into the shared stats"""
+        with self._lock:
+            for (field, outcome), count in counts.items():
+                self.stats[field][outcome] += count
+
+    def hit_rates(self):
+        """
+        Per field: lookups, share answered by the remembered winner, misses,
+        and the winning selector per layout
+        """
+        with self._lock:
+            stats = {field: dict(counts) for field, counts in self.stats.items()}
+        winners = defaultdict(dict)
+        for (layout, field), index in list(self._winners.items()):
+            winners[field][layout] = self.fields[field][index][0]
+
+        report = {}
+        for field, counts in stats.items():
+            lookups = sum(counts.values())
+            report[field] = {
+                'lookups': lookups,
+                'hit_rate': round(counts.get('hit', 0) / lookups, 3) if lookups else 0.0,
+                'misses': counts.get('miss', 0),
+                'winners': winners.get(field, {}),
+            }
+        report['container'] = self._container_winner
+        return report
+
+    def _compiled_container(self, selector):
+        for candidate, compiled in self.containers:
+            if candidate == selector:
+                return compiled
+
+
+def _has_text(tag):
+    return bool(tag.get_text().strip())
+
+
+def _count(counts, field, outcome):
+    if counts is not None:
+        counts[field, outcome] += 1
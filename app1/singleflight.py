@@ -0,0 +1,157 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within a process only
+    fcntl = None
+
+
+class SingleFlightTimeout(Exception):
+    """Raised when a waiting caller gives up on the in-flight scrape"""
+
+
+class Flight:
+    """One caller's view of a SingleFlight.flight()"""
+
+    def __init__(self, leader, result=None):
+        self.leader = leader
+        self.result = result
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapse identical concurrent calls into one
+
+    Within a process, the first caller for a key runs the function and every
+    other thread waits for its result. Across worker processes on the same
+    host, the leader also holds an flock() on a per-key lock file; a process
+    that finds the lock taken waits for it to be released and then reads the
+    result the leader stored (normally from the shared cache) via `lookup`.
+    """
+
+    def __init__(self, lock_dir, timeout=90, poll=0.1):
+        """
+        Args:
+            lock_dir: Directory for per-key lock files (must be host-local)
+            timeout: Seconds a waiting caller blocks before giving up
+            poll: Seconds between attempts to take a cross-process lock
+        """
+        self.lock_dir = lock_dir
+        self.timeout = timeout
+        self.poll = poll
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'leaders': 0,
+            'deduplicated_local': 0,
+            'deduplicated_remote': 0,
+            'timeouts': 0,
+        }
+
+    def run(self, key, fn, lookup=lambda: None):
+        """
+        Run fn() once per key across concurrent callers
+
+        Args:
+            key: Identity of the work, e.g. the search cache key
+            fn: Does the work and stores the result where lookup() finds it
+            lookup: Returns the stored result, or None if there is none
+        """
+        with self.flight(key, lookup) as flight:
+            if flight.leader:
+                flight.result = fn()
+                return flight.result
+        if flight.result is None:
+            # The leader stopped without a result
+            return fn()
+        return flight.result
+
+    @contextmanager
+    def flight(self, key, lookup=lambda: None):
+        """
+        run() for callers that do the work themselves, e.g. while streaming
+
+        Yields a Flight. If flight.leader is set, this caller does the work
+        inside the block and sets flight.result before leaving it; every
+        identical caller waits for that result. Otherwise flight.result is
+        the leader's result, or None when the leader stopped early (e.g. a
+        closed stream) and the caller has to do the work itself.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                self._bump('timeouts')
+                raise SingleFlightTimeout(f"Timed out waiting for in-flight '{key}'")
+            self._bump('deduplicated_local')
+            if call.error is not None:
+                raise call.error
+            yield Flight(False, call.result)
+            return
+
+        try:
+            with self._cross_process_lock(key):
+                # Another process may have finished the same work while we
+                # were waiting for (or just before we took) the lock
+                call.result = lookup()
+                if call.result is not None:
+                    self._bump('deduplicated_remote')
+                    yield Flight(False, call.result)
+                else:
+                    self._bump('leaders')
+                    flight = Flight(True)
+                    yield flight
+                    call.result = flight.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @contextmanager
+    def _cross_process_lock(self, key):
+        if fcntl is None:
+            yield
+            return
+
+        os.makedirs(self.lock_dir, exist_ok=True)
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.lock'
+        with open(os.path.join(self.lock_dir, name), 'a') as lock_file:
+            self._acquire(lock_file)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _acquire(self, lock_file):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    self._bump('timeouts')
+                    raise SingleFlightTimeout("Timed out waiting for another worker's scrape")
+                time.sleep(self.poll)
+
+    def _bump(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
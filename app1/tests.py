@@ -1,3 +1,1497 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import io
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import Counter
+from unittest import mock
 
-# Create your tests here.
+import docx
+import numpy as np
+from bs4 import BeautifulSoup
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.table import Table
+from scipy.sparse import csr_matrix
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import JsonResponse
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app1 import async_search, job_cache, job_search
+from app1.async_search import get_scrape_executor, get_stream_executor
+from app1.cache_backends import SQLiteCache
+from app1.crawler import Crawler, HostLimiter, enqueue_search
+from app1.driver_pool import DriverPool, DriverPoolTimeout
+from app1.extraction_pool import ExtractionPool, text_or_raise
+from app1.http_scraper import HttpNaukriScraper
+from app1.incremental import page_hash
+from app1.job_store import job_fingerprint, mark_disappeared, upsert_jobs
+from app1.management.commands.run_pipeline_worker import work
+from app1.ml_models import ARTIFACTS, ModelLoadError, classify_texts, get_models, load_models, models_dir
+from app1.models import CrawlTask, Job, PipelineTask
+from app1.page_readiness import PageReadiness
+from app1.naukri_scrapper import SeleniumNaukriScraper, selector_stats
+from app1.pipeline import requeue_stale, run_task
+from app1.ranking import ResumeJobRanker
+from app1.resume_cache import ResumeCache
+from app1.resume_text import extract_text_from_file
+from app1.retrieval_index import JobVectorIndex, nearest_jobs
+from app1.scraper_service import (
+    MAX_MESSAGE_BYTES, ScraperClient, ScraperService, ScraperServiceBusy, ScraperServiceError, recv_message,
+    send_message,
+)
+from app1.selector_engine import SelectorEngine
+from app1.views import JobRecommendationsView, _batch_uploads, vectorizer
+
+
+def results_page(job_ids, title="Python Developer"):
+    """A Naukri-style results page with one article.jobTuple per job id"""
+    cards = ''.join(
+        f'<article class="jobTuple"><a class="title" href="/job-listings-{job_id}">{title} {job_id}</a>'
+        f'<a class="subTitle">Acme {job_id}</a><li class="location"><span class="locWdth">Pune</span></li>'
+        f'<div class="job-description">Build APIs with Python and Django</div></article>'
+        for job_id in job_ids
+    )
+    return f'<html><head><title>Jobs</title></head><body><div class="list">{cards}</div></body></html>'
+
+
+CAPTCHA_PAGE = '<html><body><h1>Security check</h1><p>Please verify you are human</p></body></html>'
+EMPTY_PAGE = '<html><head><meta name="robots" content="noindex"></head><body><p>No jobs here</p></body></html>'
+
+
+class StandInNaukri:
+    """
+    Local HTTP server standing in for Naukri.com
+
+    `routes` maps a path to a (status, body) response, or to a list of
+    them that are served in turn (the last one repeats). Unknown paths 404.
+    Every response waits `delay` seconds first.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.delay = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append(self.path)
+                time.sleep(stand_in.delay)
+                response = stand_in.routes.get(self.path, (404, 'Not found'))
+                if isinstance(response, list):
+                    response = response.pop(0) if len(response) > 1 else response[0]
+                status, body = response
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StandInMixin:
+    """Runs a StandInNaukri for the test class and points the scrapers at it"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stand_in = StandInNaukri()
+        cls.lock_dir = tempfile.TemporaryDirectory()
+        cls._settings = override_settings(
+            NAUKRI_BASE_URL=cls.stand_in.base_url,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            SCRAPER_LOCK_DIR=cls.lock_dir.name,
+        )
+        cls._settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._settings.disable()
+        cls.stand_in.close()
+        cls.lock_dir.cleanup()
+
+    def setUp(self):
+        super().setUp()
+        self.stand_in.routes.clear()
+        self.stand_in.requests.clear()
+        self.stand_in.delay = 0
+        cache.clear()
+        # The process-wide scrapers were built for whatever base URL came first
+        job_search._http_scraper = None
+        job_search._singleflight = None
+        self.addCleanup(setattr, job_search, '_http_scraper', None)
+        self.addCleanup(setattr, job_search, '_singleflight', None)
+        # The parsers log every step; keep the test output readable
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+
+class HttpTierTests(StandInMixin, TestCase):
+    def test_http_tier_parses_listings(self):
+        self.stand_in.routes['/python-jobs-in-pune'] = (200, results_page([1, 2, 3]))
+
+        jobs, reason = HttpNaukriScraper(base_url=self.stand_in.base_url).search_jobs('python', 'pune')
+
+        self.assertIsNone(reason)
+        self.assertEqual([job['title'] for job in jobs], ['Python Developer 1', 'Python Developer 2', 'Python Developer 3'])
+        self.assertEqual(jobs[0]['url'], f'{self.stand_in.base_url}/job-listings-1')
+
+    def test_escalate_reasons(self):
+        scraper = HttpNaukriScraper(base_url=self.stand_in.base_url)
+        cases = {
+            'captcha': (200, CAPTCHA_PAGE),
+            'empty': (200, EMPTY_PAGE),
+            'error': (500, 'Internal error'),
+            'blocked': (429, 'Slow down'),
+        }
+        for expected, response in cases.items():
+            with self.subTest(expected):
+                self.stand_in.routes['/python-jobs'] = response
+                self.assertEqual(scraper.search_jobs('python'), ([], expected))
+
+    def test_search_jobs_served_by_http_tier(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page([1, 2]))
+
+        with mock.patch.object(job_search, '_scrape_selenium') as selenium:
+            jobs, tier = job_search.search_jobs('python')
+
+        self.assertEqual(tier, 'http')
+        self.assertEqual(len(jobs), 2)
+        selenium.assert_not_called()
+        self.assertEqual(Job.objects.count(), 2)
+
+        # The second search is answered from the cache without a request
+        jobs, tier = job_search.search_jobs('python')
+        self.assertEqual(tier, 'cache')
+        self.assertEqual(self.stand_in.requests, ['/python-jobs'])
+
+    def test_search_jobs_escalates_to_selenium(self):
+        browser_jobs = [{'title': 'From the browser', 'url': 'https://example.com/job/1'}]
+        for name, response in [('captcha', (200, CAPTCHA_PAGE)), ('error', (500, 'Oops')), ('empty', (200, EMPTY_PAGE))]:
+            with self.subTest(name):
+                self.stand_in.routes['/java-jobs'] = response
+                with mock.patch.object(job_search, '_scrape_selenium', return_value=(browser_jobs, 'selenium')) as selenium:
+                    jobs, tier = job_search.search_jobs('java')
+
+                self.assertEqual((jobs, tier), (browser_jobs, 'selenium'))
+                selenium.assert_called_once()
+                self.assertEqual(selenium.call_args.args[:2], ('java', ''))
+
+    def test_selenium_scraper_uses_base_url_setting(self):
+        with mock.patch.object(SeleniumNaukriScraper, '_init_driver'):
+            scraper = SeleniumNaukriScraper()
+
+        self.assertEqual(scraper._build_search_url('python', 'pune'), f'{self.stand_in.base_url}/python-jobs-in-pune')
+        self.assertEqual(
+            scraper._build_search_url('python', 'pune'),
+            HttpNaukriScraper(base_url=self.stand_in.base_url)._build_search_url('python', 'pune'),
+        )
+
+
+class CrawlerTests(StandInMixin, TransactionTestCase):
+    def crawl(self, **kwargs):
+        crawler = Crawler(
+            workers=1,
+            limiter=HostLimiter(rate=0),
+            scraper=HttpNaukriScraper(base_url=self.stand_in.base_url),
+            retry_delay=0,
+            poll=0,
+            **kwargs
+        )
+        return crawler.run()
+
+    def test_follows_pages_until_max_results(self):
+        self.stand_in.routes.update({
+            '/python-jobs': (200, results_page(range(0, 10))),
+            '/python-jobs-2': (200, results_page(range(10, 20))),
+            '/python-jobs-3': (200, results_page(range(20, 30))),
+            '/python-jobs-4': (200, results_page(range(30, 40))),
+        })
+        enqueue_search('python', max_results=25)
+
+        stats = self.crawl()
+
+        self.assertEqual(stats['pages'], 3)
+        self.assertNotIn('/python-jobs-4', self.stand_in.requests)
+        self.assertEqual(Job.objects.count(), 30)
+        self.assertEqual(set(CrawlTask.objects.values_list('status', flat=True)), {CrawlTask.DONE})
+
+    def test_stops_at_an_empty_page(self):
+        self.stand_in.routes.update({
+            '/python-jobs': (200, results_page(range(0, 10))),
+            '/python-jobs-2': (200, EMPTY_PAGE),
+        })
+        enqueue_search('python', max_results=50)
+
+        stats = self.crawl()
+
+        self.assertEqual(stats['pages'], 2)
+        self.assertEqual(CrawlTask.objects.get(page=2).jobs_found, 0)
+
+    def test_retries_a_rate_limited_page(self):
+        self.stand_in.routes.update({
+            '/python-jobs': [(429, 'Slow down'), (200, results_page(range(0, 10)))],
+            '/python-jobs-2': (200, EMPTY_PAGE),
+        })
+        enqueue_search('python', max_results=50)
+
+        stats = self.crawl()
+
+        self.assertEqual(stats['retries'], 1)
+        first = CrawlTask.objects.get(page=1)
+        self.assertEqual((first.status, first.attempts, first.jobs_found), (CrawlTask.DONE, 2, 10))
+        self.assertTrue(CrawlTask.objects.filter(page=2).exists())
+
+    def test_gives_up_after_max_attempts(self):
+        self.stand_in.routes['/python-jobs'] = (500, 'Internal error')
+        enqueue_search('python', max_results=50)
+
+        stats = self.crawl(max_attempts=2)
+
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(CrawlTask.objects.get().status, CrawlTask.FAILED)
+
+
+class IncrementalCrawlTests(StandInMixin, TransactionTestCase):
+    def crawl(self, max_results=10):
+        enqueue_search('python', max_results=max_results, recrawl=True)
+        return Crawler(
+            workers=1,
+            limiter=HostLimiter(rate=0),
+            scraper=HttpNaukriScraper(base_url=self.stand_in.base_url),
+            max_pages=1,
+        ).run()
+
+    def test_unchanged_page_is_not_parsed(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(10)))
+        self.crawl()
+
+        stats = self.crawl()
+
+        self.assertEqual((stats.get('pages_parsed', 0), stats['pages_skipped']), (0, 1))
+        self.assertEqual(stats['listings_skipped'], 10)
+
+    def test_only_changed_listings_are_parsed(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(10)))
+        self.crawl()
+
+        # Listing 0 is edited, listing 9 is gone
+        page = results_page(range(9)).replace('Python Developer 0<', 'Senior Python Developer 0<')
+        self.stand_in.routes['/python-jobs'] = (200, page)
+        stats = self.crawl()
+
+        self.assertEqual((stats['listings_parsed'], stats['listings_skipped'], stats['disappeared']), (1, 8, 1))
+        self.assertEqual(Job.objects.get(url__endswith='/job-listings-0').title, 'Senior Python Developer 0')
+        self.assertIsNotNone(Job.objects.get(url__endswith='/job-listings-9').disappeared_at)
+
+    def test_listing_below_the_cutoff_has_not_disappeared(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(10)))
+        self.crawl(max_results=10)
+
+        # Two new listings push the last two below max_results
+        self.stand_in.routes['/python-jobs'] = (200, results_page([100, 101] + list(range(10))))
+        stats = self.crawl(max_results=10)
+
+        self.assertEqual(stats['disappeared'], 0)
+        self.assertFalse(Job.objects.filter(disappeared_at__isnull=False).exists())
+
+    def test_disappearance_is_limited_to_the_search(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(3)))
+        self.crawl()
+        # Another search lists job 2 last
+        self.stand_in.routes['/django-jobs'] = (200, results_page([2]))
+        with mock.patch.object(job_search, '_scrape_selenium'):
+            job_search.search_jobs('django')
+
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(2)))
+        stats = self.crawl()
+
+        self.assertEqual(stats['disappeared'], 0)
+        self.assertIsNone(Job.objects.get(url__endswith='/job-listings-2').disappeared_at)
+
+
+def zip_upload(members):
+    """A .zip upload holding {name: bytes}"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return SimpleUploadedFile('resumes.zip', buffer.getvalue())
+
+
+class BatchUploadTests(TestCase):
+    def test_expands_zip_members(self):
+        uploads = _batch_uploads([
+            zip_upload({'a.txt': b'Python developer', 'notes.md': b'skipped', 'b.pdf': b'%PDF'}),
+            SimpleUploadedFile('c.docx', b'docx'),
+        ])
+
+        self.assertEqual([name for name, _ in uploads], ['a.txt', 'b.pdf', 'c.docx'])
+        self.assertEqual(uploads[0][1].read(), b'Python developer')
+
+    @override_settings(RESUME_BATCH_MAX_FILES=5)
+    def test_file_count_is_checked_before_inflating(self):
+        upload = zip_upload({f'{i}.txt': b'resume' for i in range(50)})
+
+        with mock.patch.object(zipfile.ZipFile, 'read', autospec=True, side_effect=zipfile.ZipFile.read) as read:
+            with self.assertRaisesMessage(ValueError, 'At most 5 resumes'):
+                _batch_uploads([upload])
+
+        self.assertEqual(read.call_count, 5)
+
+    @override_settings(RESUME_BATCH_MAX_TOTAL_BYTES=2 * 2**20, RESUME_BATCH_MAX_FILE_BYTES=2**20)
+    def test_total_uncompressed_size_is_capped(self):
+        # 3MB of zeros compress to a few KB
+        upload = zip_upload({f'{i}.txt': bytes(2**20 - 1) for i in range(3)})
+
+        with mock.patch.object(zipfile.ZipFile, 'read', autospec=True, side_effect=zipfile.ZipFile.read) as read:
+            with self.assertRaisesMessage(ValueError, 'at most 2MB'):
+                _batch_uploads([upload])
+
+        self.assertEqual(read.call_count, 2)
+
+    @override_settings(RESUME_BATCH_MAX_FILE_BYTES=100)
+    def test_oversized_member_is_not_read(self):
+        with mock.patch.object(zipfile.ZipFile, 'read') as read:
+            uploads = _batch_uploads([zip_upload({'big.txt': bytes(1000)})])
+
+        self.assertEqual(uploads, [('big.txt', None)])
+        read.assert_not_called()
+
+    @override_settings(RESUME_BATCH_MAX_FILE_BYTES=100)
+    def test_oversized_upload_is_dropped(self):
+        uploads = _batch_uploads([SimpleUploadedFile('big.docx', bytes(1000)), SimpleUploadedFile('a.txt', b'resume')])
+
+        self.assertEqual([(name, file is None) for name, file in uploads], [('big.docx', True), ('a.txt', False)])
+
+    @override_settings(RESUME_BATCH_MAX_TOTAL_BYTES=2 * 2**20, RESUME_BATCH_MAX_FILE_BYTES=2**20)
+    def test_uploads_count_towards_the_total_size(self):
+        upload = zip_upload({'a.txt': bytes(2**20 - 1)})
+        files = [SimpleUploadedFile(f'{i}.pdf', bytes(2**20 - 1)) for i in range(2)]
+
+        with self.assertRaisesMessage(ValueError, 'at most 2MB'):
+            _batch_uploads([upload] + files)
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(API_KEYS=['batch-key'], CACHES=LOCMEM_CACHES)
+class BatchApiTests(TestCase):
+    def setUp(self):
+        # A script, not a browser: no CSRF cookie or token
+        self.client = Client(enforce_csrf_checks=True)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def post(self, **headers):
+        upload = zip_upload({'a.txt': b'Python developer Django REST APIs', 'b.txt': b'Java Spring Boot developer'})
+        return self.client.post(reverse('classify_batch'), {'resume_files': [upload]}, headers=headers)
+
+    def test_script_can_post_a_zip_without_a_csrf_token(self):
+        response = self.post(Authorization='Bearer batch-key')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['total'], response.json()['classified']), (2, 2))
+
+    def test_api_key_is_required(self):
+        self.assertEqual(self.post().status_code, 401)
+        self.assertEqual(self.post(Authorization='Bearer wrong').status_code, 401)
+        with override_settings(API_KEYS=[]):
+            self.assertEqual(self.post(Authorization='Bearer batch-key').status_code, 403)
+
+
+class FakeExtractionPool:
+    """Stands in for ExtractionPool: each extraction takes `delay` seconds"""
+
+    def __init__(self, workers, delay=0.1):
+        self.workers = workers
+        self.delay = delay
+        self.running = 0
+        self.most_running = 0
+        self._lock = threading.Lock()
+
+    def extract(self, file):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        text = file.read().decode()
+        file.seek(0)
+        if text == 'broken':
+            return {'text': '', 'timed_out': False, 'truncated': False, 'error': 'Bad file'}
+        return {'text': text, 'timed_out': False, 'truncated': False, 'error': None}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ParallelExtractionTests(TestCase):
+    def test_batch_is_extracted_on_every_worker_at_once(self):
+        pool = FakeExtractionPool(workers=3)
+        files = [SimpleUploadedFile(f'{i}.txt', f'resume {i}'.encode()) for i in range(6)]
+        files.append(SimpleUploadedFile('bad.txt', b'broken'))
+
+        started = time.perf_counter()
+        with mock.patch('app1.resume_cache.get_extraction_pool', return_value=pool):
+            extracted = ResumeCache().extract_many(files)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(pool.most_running, 3)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual([text for text, _ in extracted[:6]], [f'resume {i}' for i in range(6)])
+        self.assertEqual((extracted[6][0], str(extracted[6][1])), (None, 'Bad file'))
+
+
+
+def resume_upload(text, name='resume.txt'):
+    return SimpleUploadedFile(name, text.encode())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ResumeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.pool = FakeExtractionPool(workers=1, delay=0)
+        patcher = mock.patch('app1.resume_cache.get_extraction_pool', return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.extractions = mock.patch.object(self.pool, 'extract', wraps=self.pool.extract).start()
+        self.addCleanup(mock.patch.stopall)
+        self.classify = mock.patch(
+            'app1.resume_cache.classify_texts',
+            side_effect=lambda texts: [{'category': text.split()[0].title(), 'confidence': 90.0} for text in texts],
+        ).start()
+
+    def test_text_is_keyed_by_the_uploaded_bytes(self):
+        resumes = ResumeCache()
+
+        self.assertEqual(resumes.extract(resume_upload('Python developer', 'a.txt')), 'Python developer')
+        # Same bytes under another name, then in another process sharing the Django cache
+        self.assertEqual(resumes.extract(resume_upload('Python developer', 'b.pdf')), 'Python developer')
+        self.assertEqual(ResumeCache().extract(resume_upload('Python developer')), 'Python developer')
+        resumes.extract(resume_upload('python developer'))
+
+        self.assertEqual(self.extractions.call_count, 2)
+        stats = resumes.hit_rates()
+        self.assertEqual((stats['text_memory_hits'], stats['text_cache_hits'], stats['text_misses']), (1, 0, 2))
+
+    def test_predictions_are_keyed_by_the_normalized_text_and_version(self):
+        resumes = ResumeCache(version='v1')
+
+        first = resumes.predict('Python  Developer\n')
+        self.assertEqual(resumes.predict_many(['python developer', 'java developer', 'PYTHON DEVELOPER']), [
+            first, {'category': 'Java', 'confidence': 90.0}, first,
+        ])
+        # Only the uncached text went to the model, in one batch
+        self.assertEqual([call.args[0] for call in self.classify.call_args_list], [
+            ['Python  Developer\n'], ['java developer'],
+        ])
+
+        ResumeCache(version='v2').predict('python developer')
+        self.assertEqual(self.classify.call_count, 3)
+
+    def test_memory_layer_evicts_least_recently_used(self):
+        resumes = ResumeCache(max_bytes=10)
+        resumes.extract(resume_upload('aaaa'))
+        resumes.extract(resume_upload('bbbb'))
+        resumes.extract(resume_upload('aaaa'))
+        resumes.extract(resume_upload('cccc'))
+
+        stats = resumes.hit_rates()
+        self.assertEqual((stats['evictions'], stats['memory_entries'], stats['memory_bytes']), (1, 2, 8))
+
+        # The evicted text comes back from the Django cache, not the extractor
+        resumes.extract(resume_upload('bbbb'))
+        resumes.extract(resume_upload('cccc'))
+        self.assertEqual(self.extractions.call_count, 3)
+        stats = resumes.hit_rates()
+        self.assertEqual((stats['text_memory_hits'], stats['text_cache_hits'], stats['text_misses']), (2, 1, 3))
+        # Bringing it back pushed out the least recently used 'aaaa'
+        self.assertEqual(stats['evictions'], 2)
+
+    def test_hit_rates(self):
+        resumes = ResumeCache()
+        self.assertIsNone(resumes.hit_rates()['text_hit_rate'])
+
+        for text in ('a', 'a', 'a', 'b'):
+            resumes.predict(resumes.extract(resume_upload(text)))
+
+        stats = resumes.hit_rates()
+        self.assertEqual(stats['text_hit_rate'], 0.5)
+        self.assertEqual(stats['prediction_hit_rate'], 0.5)
+        self.assertEqual(stats['memory_entries'], 4)
+
+def docx_upload(body, name='resume.docx'):
+    """A .docx upload whose document body is the given WordprocessingML"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>'
+        ))
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+
+def word_resume(table=True):
+    """A .docx saved by python-docx with a hyperlink, line breaks, tabs and optionally a table"""
+    document = docx.Document()
+    document.add_heading('Jane Doe', level=1)
+
+    contact = document.add_paragraph('Email: ')
+    hyperlink = OxmlElement('w:hyperlink')
+    hyperlink.set(qn('r:id'), document.part.relate_to('mailto:jane@example.com', RT.HYPERLINK, is_external=True))
+    link_run = OxmlElement('w:r')
+    link_text = OxmlElement('w:t')
+    link_text.text = 'jane@example.com'
+    link_run.append(link_text)
+    hyperlink.append(link_run)
+    contact._p.append(hyperlink)
+    contact.add_run(' | Pune')
+
+    run = document.add_paragraph().add_run('Python Developer')
+    run.add_break()
+    run.add_text('Django')
+    run.add_tab()
+    run.add_text('REST APIs')
+
+    if table:
+        skills = document.add_table(rows=2, cols=2)
+        skills.cell(0, 0).text = 'Skill'
+        skills.cell(0, 1).text = 'Years'
+        skills.cell(1, 0).text = 'Python'
+        skills.cell(1, 1).text = '5'
+        skills.cell(1, 1).add_paragraph('since 2020')
+    document.add_paragraph('References on request')
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return SimpleUploadedFile('resume.docx', buffer.getvalue())
+
+
+class WordExtractionTests(SimpleTestCase):
+    def test_matches_the_python_docx_extractor(self):
+        upload = word_resume(table=False)
+        # The extractor views.py used before the streaming reader
+        expected = ''.join(paragraph.text + "\n" for paragraph in docx.Document(upload).paragraphs).strip()
+        upload.seek(0)
+
+        self.assertEqual(extract_text_from_file(upload), expected)
+        self.assertIn('Email: jane@example.com | Pune\nPython Developer\nDjango\tREST APIs\nReferences', expected)
+
+    def test_table_cells_are_read_in_document_order(self):
+        upload = word_resume()
+        expected = []
+        for block in docx.Document(upload).iter_inner_content():
+            if isinstance(block, Table):
+                expected += [paragraph.text for row in block.rows for cell in row.cells for paragraph in cell.paragraphs]
+            else:
+                expected.append(block.text)
+        upload.seek(0)
+
+        text = extract_text_from_file(upload)
+        self.assertEqual(text, '\n'.join(expected))
+        self.assertTrue(text.endswith('Skill\nYears\nPython\n5\nsince 2020\nReferences on request'))
+
+class ExtractionPoolTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # A million paragraphs: seconds of parsing from a few hundred KB
+        cls.long_docx = docx_upload('<w:p><w:r><w:t>Python developer</w:t></w:r></w:p>' * 1_000_000, 'long.docx')
+
+    def pool(self, **kwargs):
+        pool = ExtractionPool(workers=1, **kwargs)
+        self.addCleanup(pool.close)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+        return pool
+
+    def test_timeout_keeps_the_text_read_so_far(self):
+        pool = self.pool(timeout=0.5, cpu_time=5, max_chars=10**8)
+
+        result = pool.extract(self.long_docx)
+
+        self.assertTrue(result['timed_out'])
+        self.assertIsNone(result['error'])
+        self.assertTrue(result['text'].startswith('Python developer'))
+        self.assertLess(len(result['text']), 17_000_000)
+        self.assertEqual(text_or_raise(result, 'long.docx'), result['text'])
+        self.assertEqual((pool.stats['timed_out'], pool.stats['recycled']), (1, 0))
+
+    def test_memory_limit_stops_a_zip_bomb(self):
+        # One 300MB run of text inflated from a few hundred KB
+        bomb = docx_upload('<w:p><w:r><w:t>' + 'a' * 300_000_000 + '</w:t></w:r></w:p>', 'bomb.docx')
+        pool = self.pool(timeout=30, cpu_time=30, memory_limit=256 * 2**20)
+
+        result = pool.extract(bomb)
+
+        self.assertEqual(result['error'], "File needs too much memory to extract")
+        # The worker survives its MemoryError
+        self.assertEqual(pool.extract(SimpleUploadedFile('a.txt', b'Python developer'))['text'], 'Python developer')
+        self.assertEqual(pool.stats['recycled'], 0)
+
+    def test_stuck_worker_is_killed_and_other_files_are_retried(self):
+        # Worker timers past the 1s the caller waits stand in for a parser
+        # stuck in C code, which never sees them
+        pool = self.pool(timeout=5, cpu_time=5, grace=-4, max_chars=10**8)
+        pool.extract(SimpleUploadedFile('warm.txt', b'warm'))
+        results = {}
+
+        def extract(file):
+            results[file.name] = pool.extract(file)
+
+        stuck = threading.Thread(target=extract, args=(self.long_docx,))
+        stuck.start()
+        time.sleep(0.2)
+        # Queued behind the stuck file when its worker is killed
+        extract(SimpleUploadedFile('queued.txt', b'Java developer'))
+        stuck.join()
+
+        self.assertTrue(results['long.docx']['timed_out'])
+        self.assertEqual(results['long.docx']['text'], '')
+        self.assertEqual((results['queued.txt']['text'], results['queued.txt']['error']), ('Java developer', None))
+        self.assertEqual((pool.stats['recycled'], pool.stats['retried']), (1, 1))
+
+
+class PipelineTests(TransactionTestCase):
+    def classified_task(self):
+        return PipelineTask.objects.create(
+            task_id='a' * 32, filename='resume.txt', upload=b'resume', status=PipelineTask.RUNNING,
+            result={'resume_text': 'Python developer', 'category': 'Python Developer',
+                    'confidence': 91.0, 'stages_done': ['extract', 'classify']},
+        )
+
+    def test_search_failure_keeps_the_classification(self):
+        task = self.classified_task()
+
+        with mock.patch('app1.pipeline.search_jobs', side_effect=RuntimeError("Chrome crashed")):
+            run_task(task)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, PipelineTask.DONE)
+        self.assertEqual(task.result['category'], 'Python Developer')
+        self.assertEqual((task.result['total_jobs'], task.result['tier']), (0, 'unavailable'))
+        self.assertEqual(task.result['search_error'], 'Chrome crashed')
+
+    @override_settings(PIPELINE_HEARTBEAT_INTERVAL=0.05)
+    def test_heartbeat_continues_during_a_slow_stage(self):
+        task = self.classified_task()
+        requeued_mid_stage = []
+
+        def slow_search(*args, **kwargs):
+            time.sleep(0.5)
+            requeued_mid_stage.append(requeue_stale(timeout=0.25))
+            return [], 'http'
+
+        with mock.patch('app1.pipeline.search_jobs', side_effect=slow_search):
+            run_task(task)
+
+        self.assertEqual(requeued_mid_stage, [(0, 0)])
+        self.assertEqual(PipelineTask.objects.get(id=task.id).status, PipelineTask.DONE)
+
+    @override_settings(API_KEYS=['pipeline-key'])
+    def test_script_can_upload_without_a_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        upload = SimpleUploadedFile('resume.txt', b'Python developer')
+
+        response = client.post(reverse('pipeline_upload'), {'resume_file': upload, 'location': 'pune'},
+                               headers={'Authorization': 'Bearer pipeline-key'})
+
+        self.assertEqual(response.status_code, 202)
+        task = PipelineTask.objects.get(task_id=response.json()['task_id'])
+        self.assertEqual((task.status, task.location), (PipelineTask.QUEUED, 'pune'))
+        self.assertEqual(client.get(response.json()['status_url']).json()['status'], PipelineTask.QUEUED)
+
+    @override_settings(API_KEYS=['pipeline-key'])
+    def test_upload_needs_an_api_key(self):
+        upload = SimpleUploadedFile('resume.txt', b'Python developer')
+
+        response = Client(enforce_csrf_checks=True).post(reverse('pipeline_upload'), {'resume_file': upload})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(PipelineTask.objects.exists())
+
+    @override_settings(PIPELINE_TASK_TIMEOUT=0.2)
+    def test_single_worker_requeues_tasks_that_go_stale_later(self):
+        ran = []
+
+        def run_and_stop(task):
+            ran.append(task.task_id)
+            raise SystemExit()
+
+        with mock.patch('app1.management.commands.run_pipeline_worker.run_task', side_effect=run_and_stop):
+            worker = threading.Thread(target=work, args=(0.02, False), daemon=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                worker.start()
+                # Claimed by a worker that dies after this one started
+                time.sleep(0.1)
+                task = self.classified_task()
+                PipelineTask.objects.filter(id=task.id).update(worker='dead:1', heartbeat_at=timezone.now())
+                worker.join(5)
+
+        self.assertEqual(ran, [task.task_id])
+        self.assertEqual(PipelineTask.objects.get(id=task.id).worker.split(':')[-1], str(os.getpid()))
+
+    def test_status_next_url_encodes_the_location(self):
+        task = self.classified_task()
+        PipelineTask.objects.filter(id=task.id).update(status=PipelineTask.DONE, location='new delhi&x=1')
+        session = self.client.session
+        session['pipeline_task'] = task.task_id
+        session.save()
+
+        status = self.client.get(reverse('pipeline_status', args=[task.task_id])).json()
+
+        self.assertEqual(status['next_url'], f"{reverse('test_scraper')}?location=new+delhi%26x%3D1")
+
+
+class RecommendationCandidateTests(TestCase):
+    def test_stored_matches_are_merged_with_the_scrape(self):
+        view = JobRecommendationsView()
+        scraped = view._match_jobs_with_skill([
+            {'title': f'Python Developer {i}', 'url': f'https://example.com/job/{i}', 'skills': ['python']}
+            for i in range(10)
+        ], 'python')
+        ranked = [
+            {'title': 'Python Developer 3', 'url': 'https://example.com/job/3', 'relevance_score': 2.5},
+            {'title': 'Data Analyst', 'url': 'https://example.com/job/stored', 'relevance_score': 0.4},
+        ]
+
+        jobs = view._merge_candidates(scraped, ranked)
+
+        self.assertEqual(len(jobs), 11)
+        self.assertEqual(len({job['url'] for job in jobs}), 11)
+        self.assertEqual(jobs[-1]['url'], 'https://example.com/job/stored')
+        # The best BM25 hit beats the substring scores of the rest
+        self.assertEqual(jobs[0]['url'], 'https://example.com/job/3')
+
+
+@override_settings(CACHES=LOCMEM_CACHES, RECOMMENDATION_SCRAPE_TIMEOUT=0.2)
+class AsyncRecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+        # A scrape executor of this test's size, shut down afterwards
+        patcher = mock.patch.object(async_search, '_executor', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(lambda: async_search._executor and async_search._executor.shutdown())
+        # The page as the jobs it lists
+        render = mock.patch('app1.views.render', side_effect=lambda request, template, context: JsonResponse(
+            {'jobs': [(job['title'], job['company']) for job in context['jobs']]}
+        ))
+        render.start()
+        self.addCleanup(render.stop)
+
+    async def recommendations(self, prediction='Data Science', location='pune'):
+        """The page's status and the titles and companies it would render"""
+        await self.upload(prediction)
+        response = await self.async_client.get(reverse('job_recommendations'), {'location': location})
+        return response.status_code, [tuple(job) for job in response.json()['jobs']]
+
+    async def upload(self, prediction):
+        session = await self.async_client.asession()
+        session['prediction_result'] = prediction
+        await session.asave()
+
+    def stuck_scrape(self):
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def scrape(skill, location, max_results):
+            released.wait(5)
+            return [], 'none'
+        return mock.patch('app1.async_search.scrape_jobs', side_effect=scrape)
+
+    async def test_timed_out_scrape_shows_stored_jobs(self):
+        # Stored for another search, so only the BM25 candidates find it
+        await sync_to_async(upsert_jobs)([stored_job(1, 'Data Science Engineer')], 'machine learning', 'pune')
+
+        with self.stuck_scrape():
+            started = time.perf_counter()
+            status, jobs = await self.recommendations()
+
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertEqual(status, 200)
+        self.assertEqual(jobs, [('Data Science Engineer', 'Acme 1')])
+
+    async def test_timed_out_scrape_with_nothing_stored_shows_sample_jobs(self):
+        with self.stuck_scrape():
+            status, jobs = await self.recommendations()
+
+        self.assertEqual(status, 200)
+        self.assertIn(('Data Science Developer', 'Tech Solutions Inc.'), jobs)
+
+    @override_settings(SCRAPER_ASYNC_WORKERS=2, RECOMMENDATION_SCRAPE_TIMEOUT=5)
+    async def test_scrapes_are_bounded_by_the_executor(self):
+        lock = threading.Lock()
+        running = Counter()
+
+        def scrape(skill, location, max_results):
+            with lock:
+                running['now'] += 1
+                running['peak'] = max(running['peak'], running['now'])
+            time.sleep(0.2)
+            with lock:
+                running['now'] -= 1
+            return [], 'none'
+
+        with mock.patch('app1.async_search.scrape_jobs', side_effect=scrape) as scrape_jobs:
+            pages = await asyncio.gather(*(
+                self.recommendations(location=f'city {i}') for i in range(5)
+            ))
+
+        self.assertEqual([status for status, _ in pages], [200] * 5)
+        self.assertEqual(scrape_jobs.call_count, 5)
+        self.assertEqual(running['peak'], 2)
+
+
+    async def test_cards_stream_before_the_scrape_finishes(self):
+        first_card_sent = threading.Event()
+        waited = []
+
+        def stream_jobs(skill, location, max_results):
+            yield stored_job(1, 'Data Science Engineer'), 'http'
+            # The rest of the scrape waits until the client has the first card
+            waited.append(first_card_sent.wait(5))
+            yield stored_job(2, 'Data Scientist'), 'http'
+
+        await self.upload('Data Science')
+        with mock.patch('app1.views.stream_jobs', side_effect=stream_jobs):
+            response = await self.async_client.get(reverse('job_recommendations'), {'location': 'pune', 'stream': '1'})
+            chunks = []
+            async for chunk in response.streaming_content:
+                chunks.append(chunk.decode())
+                if 'Data Science Engineer' in chunks[-1]:
+                    first_card_sent.set()
+
+        self.assertEqual(waited, [True])
+        self.assertEqual(len(chunks), 4)
+        self.assertIn('Data Science Engineer', chunks[1])
+        self.assertIn('Data Scientist', chunks[2])
+
+
+class StreamingSearchTests(StandInMixin, TransactionTestCase):
+    def test_leader_streams_and_identical_streams_share_its_fetch(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(5)))
+        self.stand_in.delay = 0.3
+        results = [None] * 4
+
+        def stream(i):
+            results[i] = [(job['title'], tier) for job, tier in job_search.stream_jobs('python')]
+
+        threads = [threading.Thread(target=stream, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.stand_in.requests, ['/python-jobs'])
+        expected = [(f'Python Developer {i}', 'http') for i in range(5)]
+        self.assertEqual(results, [expected] * 4)
+        self.assertEqual(job_search.get_singleflight().stats['deduplicated_local'], 3)
+
+    def test_closed_stream_releases_the_search(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(5)))
+
+        stream = job_search.stream_jobs('python')
+        next(stream)
+        stream.close()
+
+        self.assertEqual(job_search.get_singleflight()._calls, {})
+        jobs, tier = job_search.search_jobs('python')
+        self.assertEqual((len(jobs), tier), (5, 'http'))
+
+    def test_streamed_scrape_keeps_the_incremental_state(self):
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(3)))
+
+        streamed = [job['title'] for job, _ in job_search.stream_jobs('python', max_results=2)]
+
+        self.assertEqual(streamed, ['Python Developer 0', 'Python Developer 1'])
+        entry = job_cache.get_entry('python')
+        self.assertEqual(entry['page_hash'], page_hash(results_page(range(3))))
+        self.assertEqual(len(entry['jobs']), 3)
+        self.assertEqual(sorted(entry['containers'].values()), sorted(job_fingerprint(job) for job in entry['jobs']))
+        self.assertEqual(Job.objects.count(), 3)
+
+        # The next scrape of the page only reuses listings and flags the gone one
+        self.stand_in.routes['/python-jobs'] = (200, results_page(range(2)))
+        with mock.patch.object(HttpNaukriScraper, '_parse_job_element') as parse:
+            jobs, tier = job_search._scrape('python', '')
+        parse.assert_not_called()
+        self.assertEqual((len(jobs), tier), (2, 'http'))
+        self.assertIsNotNone(Job.objects.get(url__endswith='/job-listings-2').disappeared_at)
+
+    def test_streams_step_on_their_own_executor(self):
+        self.assertIsNot(get_stream_executor(), get_scrape_executor())
+
+
+class SQLiteCacheTests(TestCase):
+    def cache(self, **options):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return SQLiteCache(f'{directory.name}/cache.sqlite3', {'OPTIONS': options})
+
+    def stored(self, cache):
+        return cache._connection().execute('SELECT COUNT(*), SUM(size) FROM cache').fetchone()
+
+    def test_culls_every_nth_write_only(self):
+        cache = self.cache(MAX_SIZE=5000, CULL_EVERY=10, COMPRESS_MIN_BYTES=10**6)
+
+        for i in range(9):
+            cache.set(f'key{i}', b'x' * 1000)
+        self.assertEqual(self.stored(cache)[0], 9)
+
+        cache.set('key9', b'x' * 1000)
+        entries, size = self.stored(cache)
+        self.assertLessEqual(size, 5000)
+        # The most recently written entries survive
+        self.assertIsNotNone(cache.get('key9'))
+        self.assertIsNone(cache.get('key0'))
+
+    def test_max_entries(self):
+        cache = self.cache(MAX_ENTRIES=3, CULL_EVERY=1)
+
+        for i in range(6):
+            cache.set(f'key{i}', i)
+
+        self.assertEqual(self.stored(cache)[0], 3)
+        self.assertEqual([cache.get(f'key{i}') for i in range(6)], [None, None, None, 3, 4, 5])
+
+    def test_expired_entries_are_never_served(self):
+        cache = self.cache(CULL_EVERY=1000)
+        cache.set('old', 1, timeout=-1)
+        cache.set('new', 2)
+
+        self.assertIsNone(cache.get('old'))
+        self.assertTrue(cache.add('old', 3))
+        self.assertEqual(cache.get('old'), 3)
+
+
+def index_rows(*rows):
+    """l2-normalized sparse rows from dense lists"""
+    dense = np.array(rows, dtype=np.float32)
+    return csr_matrix(dense / np.linalg.norm(dense, axis=1, keepdims=True))
+
+
+class JobVectorIndexTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+        self.index = JobVectorIndex(4)
+        self.index.add(['a', 'b', 'c'], index_rows([1, 0, 0, 0], [1, 1, 0, 0], [0, 0, 1, 1]))
+
+    def test_search_ranks_by_similarity(self):
+        hits = self.index.search(index_rows([1, 0, 0, 0]), k=5)
+
+        self.assertEqual([fingerprint for fingerprint, _ in hits], ['a', 'b'])
+        self.assertAlmostEqual(hits[0][1], 1.0, places=5)
+
+    def test_add_skips_known_jobs_and_discard_hides_them(self):
+        self.assertEqual(self.index.add(['a', 'd'], index_rows([0, 1, 0, 0], [0, 1, 0, 0])), 1)
+        self.assertEqual(self.index.discard(['b', 'missing']), 1)
+
+        self.assertEqual(self.index.fingerprints(), {'a', 'c', 'd'})
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual([fp for fp, _ in self.index.search(index_rows([0, 1, 0, 0]), k=5)], ['d'])
+
+    def test_save_and_load_round_trip(self):
+        self.index.save(self.path, built_at='2026-01-01T00:00:00+00:00')
+        # Discarded after loading: hidden at once, dropped by the next save
+        self.index.discard(['a'])
+        self.index.add(['d'], index_rows([1, 0, 0, 1]))
+        query = index_rows([1, 0, 0, 1])
+        before = self.index.search(query, k=5)
+        self.index.save(self.path)
+
+        loaded = JobVectorIndex.load(self.path)
+
+        self.assertEqual(loaded.search(query, k=5), before)
+        self.assertEqual([fp for fp, _ in before], ['d', 'b', 'c'])
+        self.assertEqual((len(loaded), loaded.built_at), (3, '2026-01-01T00:00:00+00:00'))
+        self.assertIsInstance(loaded._row_val, np.memmap)
+
+
+def stored_job(job_id, title, location='Pune'):
+    return {
+        'title': title, 'company': f'Acme {job_id}', 'location': location,
+        'description': f'{title} building APIs', 'url': f'https://example.com/job/{job_id}',
+    }
+
+
+class NearestJobsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(JOB_VECTOR_INDEX_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def build(self, *args):
+        output = io.StringIO()
+        call_command('build_job_index', *args, stdout=output)
+        return output.getvalue()
+
+    def nearest(self, text, **kwargs):
+        return [job['url'] for job in nearest_jobs(vectorizer.transform([text]), **kwargs)]
+
+    def test_neighbours_are_limited_to_the_search(self):
+        upsert_jobs([stored_job(1, 'Python Django Developer')], 'python developer', 'pune')
+        upsert_jobs([stored_job(2, 'Python Django Developer', 'Chennai')], 'python developer', 'chennai')
+        upsert_jobs([stored_job(3, 'Python Data Engineer')], 'data engineer', 'pune')
+        self.build()
+
+        self.assertEqual(len(self.nearest('python django developer')), 3)
+        self.assertEqual(
+            self.nearest('python django developer', skill='Python Developer', location='Pune'),
+            ['https://example.com/job/1'],
+        )
+
+    def test_incremental_rebuild(self):
+        upsert_jobs([stored_job(i, 'Python Developer') for i in range(3)], 'python developer')
+        self.assertIn('Added 3 jobs, refreshed 0, removed 0', self.build())
+
+        # Job 0 becomes a Java listing, job 1 disappears, job 3 is new
+        upsert_jobs([dict(stored_job(0, 'Java Spring Developer'), description='Java Spring Boot')], 'java developer')
+        mark_disappeared([job_fingerprint(stored_job(1, ''))], 'python developer')
+        upsert_jobs([stored_job(3, 'Python Developer')], 'python developer')
+
+        self.assertIn('Added 1 jobs, refreshed 1, removed 1; index now holds 3 jobs', self.build())
+        self.assertEqual(self.nearest('java spring boot', k=1), ['https://example.com/job/0'])
+        self.assertNotIn('https://example.com/job/1', self.nearest('python developer'))
+        self.assertIn('Added 0 jobs, refreshed 0, removed 0', self.build())
+
+
+
+class ClassifierTests(SimpleTestCase):
+    def predict_category(self, models, resume_text):
+        """The per-resume model.predict plus predict_proba that classify_texts replaced"""
+        text_tfidf = models.vectorizer.transform([resume_text])
+        prediction_label = models.encoder.inverse_transform([models.model.predict(text_tfidf)[0]])[0]
+        probabilities = models.model.predict_proba(text_tfidf)[0]
+        return {
+            'category': prediction_label,
+            'confidence': round(max(probabilities) * 100, 2),
+            'all_probabilities': {
+                category: round(prob * 100, 2) for category, prob in zip(models.encoder.classes_, probabilities)
+            },
+        }
+
+    def test_batch_matches_one_prediction_per_resume(self):
+        models = get_models()
+        texts = [
+            'Python Django developer building REST APIs with PostgreSQL and Celery',
+            'Data scientist: pandas, scikit-learn, machine learning, deep learning, statistics',
+            'Advocate practising civil and criminal law at the high court',
+            'Recruitment, onboarding, payroll and employee relations in HR',
+            'Selenium automation testing, test cases, regression, JIRA',
+            '',
+        ]
+
+        predictions = classify_texts(texts, models)
+
+        for text, prediction in zip(texts, predictions):
+            expected = self.predict_category(models, text)
+            self.assertEqual(prediction['category'], expected['category'])
+            self.assertEqual(prediction['confidence'], expected['confidence'])
+            self.assertEqual(prediction['all_probabilities'].keys(), expected['all_probabilities'].keys())
+            for category, percentage in expected['all_probabilities'].items():
+                self.assertAlmostEqual(prediction['all_probabilities'][category], percentage, places=2)
+        self.assertEqual(classify_texts([], models), [])
+
+    def test_missing_artifact_raises_model_load_error(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for name in ('model', 'vectorizer'):
+            os.symlink(os.path.join(models_dir(), ARTIFACTS[name]), os.path.join(directory.name, ARTIFACTS[name]))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaisesMessage(ModelLoadError, 'Could not load encoder from label_encoder.pkl'):
+                load_models(directory.name)
+
+class RankerTests(SimpleTestCase):
+    def test_listing_edited_in_place_is_vectorized_again(self):
+        ranker = ResumeJobRanker(vectorizer)
+        job = {'title': 'Python Developer', 'description': 'Django REST APIs', 'url': 'https://example.com/job/1'}
+        resume = 'Java Spring Boot microservices developer'
+
+        before = ranker.rank(resume, [dict(job)])[0]['similarity_score']
+        ranker.rank(resume, [dict(job)])
+        edited = dict(job, title='Java Developer', description='Spring Boot microservices')
+        after = ranker.rank(resume, [edited])[0]['similarity_score']
+
+        self.assertEqual(ranker.stats, {'hits': 1, 'misses': 2})
+        self.assertGreater(after, before)
+
+
+class SelectorEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = SelectorEngine(
+            {'title': ['a.title', 'h2 a', 'a']},
+            ['article.jobTuple', '.srp-jobtuple-wrapper', '.row'],
+            memo_containers=['article.jobTuple', '.srp-jobtuple-wrapper'],
+        )
+
+    def element(self, html):
+        return BeautifulSoup(f'<div>{html}</div>', 'html.parser').div
+
+    def title(self, html, layout, counts=None):
+        tag = self.engine.find(self.element(html), 'title', layout, counts=counts)
+        return tag.get_text() if tag is not None else None
+
+    def test_winner_is_remembered_per_layout(self):
+        counts = Counter()
+        self.title('<h2><a>Dev 1</a></h2>', 'wrapper', counts)
+        self.assertEqual(self.title('<h2><a>Dev 2</a></h2>', 'wrapper', counts), 'Dev 2')
+        self.title('<a class="title">Dev 3</a>', 'tuple', counts)
+
+        self.assertEqual(counts, Counter({('title', 'fallback'): 2, ('title', 'hit'): 1}))
+        self.assertEqual(self.engine._winners, {('wrapper', 'title'): 1, ('tuple', 'title'): 0})
+
+    def test_falls_back_when_the_winner_stops_matching(self):
+        self.title('<h2><a>Dev 1</a></h2>', 'wrapper')
+        counts = Counter()
+
+        self.assertEqual(self.title('<a class="title">Dev 2</a>', 'wrapper', counts), 'Dev 2')
+        # Empty tags are skipped like missing ones
+        self.assertEqual(self.title('<a class="title"> </a><span>x</span>', 'wrapper', counts), None)
+
+        self.assertEqual(counts, Counter({('title', 'fallback'): 1, ('title', 'miss'): 1}))
+        self.assertEqual(self.engine._winners[('wrapper', 'title')], 0)
+
+    def test_container_winner_is_tried_first(self):
+        soup = BeautifulSoup('<div class="srp-jobtuple-wrapper"></div><div class="row"></div>', 'html.parser')
+
+        self.assertEqual([selector for selector, _ in self.engine.iter_containers(soup)][0], 'article.jobTuple')
+        self.engine.container_won('.srp-jobtuple-wrapper')
+        order = [(selector, len(found)) for selector, found in self.engine.iter_containers(soup)]
+        self.assertEqual(order[0], ('.srp-jobtuple-wrapper', 1))
+        self.assertEqual(len(order), 3)
+
+        # A catch-all never jumps the queue
+        self.engine.container_won('.row')
+        self.assertEqual(next(self.engine.iter_containers(soup))[0], '.srp-jobtuple-wrapper')
+
+    def test_selector_stats(self):
+        counts = Counter()
+        for html in ['<h2><a>Dev 1</a></h2>', '<h2><a>Dev 2</a></h2>', '<h2><a>Dev 3</a></h2>', '<p>none</p>']:
+            self.title(html, 'wrapper', counts)
+        self.engine.record(counts)
+        self.engine.container_won('.srp-jobtuple-wrapper')
+
+        with mock.patch('app1.naukri_scrapper._selector_engine', self.engine):
+            stats = selector_stats()
+
+        self.assertEqual(stats['title'], {'lookups': 4, 'hit_rate': 0.5, 'misses': 1, 'winners': {'wrapper': 'h2 a'}})
+        self.assertEqual(stats['container'], '.srp-jobtuple-wrapper')
+        with mock.patch('app1.naukri_scrapper._selector_engine', None):
+            self.assertEqual(selector_stats(), {})
+
+
+class FakeScraper:
+    """Stands in for SeleniumNaukriScraper in the driver pool"""
+
+    def __init__(self, number):
+        self.number = number
+        self.pages_loaded = 0
+        self.alive = True
+        self.closed = False
+        self.resets = 0
+        self.reset_error = None
+
+    def is_alive(self):
+        return self.alive
+
+    def reset_session(self):
+        self.resets += 1
+        if self.reset_error:
+            raise self.reset_error
+
+    def close(self):
+        self.closed = True
+
+    def search_jobs(self, skill, location="", max_results=20):
+        self.pages_loaded += 1
+        if getattr(self, 'gate', None) is not None:
+            self.gate.wait(5)
+        return [{'title': f'{skill} job {i}', 'location': location} for i in range(max_results)]
+
+
+class DriverPoolTests(SimpleTestCase):
+    def pool(self, **kwargs):
+        self.started = []
+
+        def factory():
+            self.started.append(FakeScraper(len(self.started) + 1))
+            return self.started[-1]
+
+        pool = DriverPool(factory=factory, **kwargs)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+        return pool
+
+    def test_most_recently_used_browser_is_reused(self):
+        pool = self.pool(size=2)
+        first, second = pool.checkout(), pool.checkout()
+        pool.checkin(first)
+        pool.checkin(second)
+
+        self.assertIs(pool.checkout().scraper, second.scraper)
+        self.assertEqual((pool.stats['created'], pool.stats['reused']), (2, 1))
+        self.assertEqual((first.scraper.resets, second.scraper.resets), (1, 1))
+
+    def test_checkout_waits_for_a_free_slot(self):
+        pool = self.pool(size=1)
+        pooled = pool.checkout()
+
+        with self.assertRaises(DriverPoolTimeout):
+            pool.checkout(timeout=0.05)
+        threading.Timer(0.05, pool.checkin, args=(pooled,)).start()
+        self.assertIs(pool.checkout(timeout=5).scraper, pooled.scraper)
+        self.assertEqual((pool.stats['timeouts'], pool.stats['created']), (1, 1))
+
+    def test_worn_out_browser_is_recycled(self):
+        pool = self.pool(max_pages=3)
+        with pool.scraper() as scraper:
+            scraper.pages_loaded = 3
+
+        with pool.scraper() as replacement:
+            self.assertIsNot(replacement, scraper)
+        self.assertTrue(scraper.closed)
+        self.assertEqual((pool.stats['recycled'], pool.stats['created']), (1, 2))
+
+    def test_broken_browsers_are_dropped(self):
+        pool = self.pool(size=3)
+        crashed, unresettable, died_idle = pool.checkout(), pool.checkout(), pool.checkout()
+        crashed.scraper.alive = False
+        unresettable.scraper.reset_error = RuntimeError("session deleted")
+        pool.checkin(crashed)
+        pool.checkin(unresettable)
+        pool.checkin(died_idle)
+        died_idle.scraper.alive = False
+
+        fresh = pool.checkout()
+
+        self.assertEqual(fresh.scraper.number, 4)
+        self.assertTrue(all(pooled.scraper.closed for pooled in (crashed, unresettable, died_idle)))
+        self.assertEqual(pool.stats['crashed'], 3)
+
+    def test_scraper_is_checked_in_after_an_error(self):
+        pool = self.pool(size=1)
+        with self.assertRaises(ValueError):
+            with pool.scraper():
+                raise ValueError("parse failed")
+
+        with pool.scraper() as scraper:
+            self.assertEqual(scraper.number, 1)
+
+
+class ScriptedDriver:
+    """Stub WebDriver whose execute_script returns `results` in turn (the last one repeats)"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+class PageReadinessTests(SimpleTestCase):
+    def test_returns_once_jobs_are_in_the_dom(self):
+        driver = ScriptedDriver(None, None, 'jobs')
+
+        result = PageReadiness(driver, budget=5, poll=0.01).wait_for_jobs(['article.jobTuple', '.srp-jobtuple-wrapper'])
+
+        self.assertEqual(result, 'jobs')
+        self.assertEqual(driver.calls, [('article.jobTuple, .srp-jobtuple-wrapper',)] * 3)
+
+    def test_reports_a_captcha(self):
+        self.assertEqual(PageReadiness(ScriptedDriver(None, 'captcha'), budget=5, poll=0.01).wait_for_jobs(['a']), 'captcha')
+
+    def test_gives_up_when_the_budget_runs_out(self):
+        readiness = PageReadiness(ScriptedDriver(None), budget=0.1, poll=0.01)
+
+        started = time.monotonic()
+        self.assertIsNone(readiness.wait_for_jobs(['a']))
+        self.assertLess(time.monotonic() - started, 1)
+
+        # Nothing is left for a second wait
+        driver = ScriptedDriver('jobs')
+        readiness.driver = driver
+        self.assertIsNone(readiness.wait_for_jobs(['a']))
+        self.assertEqual(driver.calls, [])
+
+    def test_scrolls_until_the_count_settles_at_the_bottom(self):
+        driver = ScriptedDriver([5, False], [10, False], [20, True], [20, True])
+        readiness = PageReadiness(driver, budget=5, poll=0.01)
+
+        with readiness.phase('scroll'):
+            count = readiness.wait_for_stable_count(['a'], settle=0.05)
+
+        self.assertEqual(count, 20)
+        self.assertLess(readiness.timings['scroll'], 1)
+        self.assertGreater(readiness.remaining(), 0)
+
+    def test_stable_count_stops_at_the_budget(self):
+        counts = iter(range(1000))
+        driver = ScriptedDriver()
+        driver.execute_script = lambda script, selector: [next(counts), False]
+
+        count = PageReadiness(driver, budget=0.1, poll=0.01).wait_for_stable_count(['a'], settle=0.05)
+
+        self.assertGreater(count, 0)
+
+
+class ScraperServiceTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.address = os.path.join(directory.name, 'scraper.sock')
+        self.gate = None
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def start(self, **kwargs):
+        """Serve on a Unix socket with a pool of fake scrapers"""
+        def factory():
+            scraper = FakeScraper(1)
+            scraper.gate = self.gate
+            return scraper
+
+        pool = DriverPool(size=4, factory=factory)
+        patcher = mock.patch('app1.scraper_service.get_driver_pool', return_value=pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        service = ScraperService(self.address, **kwargs)
+        threading.Thread(target=service.serve_forever, daemon=True).start()
+        self.addCleanup(service.shutdown)
+        for _ in range(100):
+            if os.path.exists(self.address):
+                break
+            time.sleep(0.01)
+        return service
+
+    def test_framing_round_trip(self):
+        left, right = socket.socketpair()
+        self.addCleanup(left.close)
+        self.addCleanup(right.close)
+        message = {'op': 'search', 'skill': 'python', 'jobs': ['x' * 100000]}
+
+        send_message(left, message)
+        send_message(left, {'op': 'stats'})
+        self.assertEqual(recv_message(right), message)
+        self.assertEqual(recv_message(right), {'op': 'stats'})
+
+        left.sendall(struct.pack('>I', MAX_MESSAGE_BYTES + 1))
+        with self.assertRaisesMessage(ScraperServiceError, 'too large'):
+            recv_message(right)
+
+    def test_peer_closing_mid_message(self):
+        left, right = socket.socketpair()
+        self.addCleanup(right.close)
+        left.sendall(struct.pack('>I', 10) + b'{"op"')
+        left.close()
+
+        with self.assertRaisesMessage(ScraperServiceError, 'mid-message'):
+            recv_message(right)
+        self.assertIsNone(recv_message(right))
+
+    def test_search_round_trip(self):
+        service = self.start()
+        client = ScraperClient(self.address, timeout=5)
+
+        jobs = client.search_jobs('python', 'pune', max_results=3)
+
+        self.assertEqual(jobs, [{'title': f'python job {i}', 'location': 'pune'} for i in range(3)])
+        stats = client.stats()
+        self.assertEqual((stats['service']['searches'], stats['running'], stats['waiting']), (1, 0, 0))
+        self.assertEqual(service.stats['connections'], 2)
+
+    def test_busy_beyond_concurrency_and_queue(self):
+        self.gate = threading.Event()
+        service = self.start(concurrency=1, max_queue=1, queue_timeout=5)
+        client = ScraperClient(self.address, timeout=10)
+        results = []
+
+        def search():
+            results.append(len(client.search_jobs('python', max_results=2)))
+
+        threads = [threading.Thread(target=search) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        # One search running, one waiting for its slot
+        for _ in range(200):
+            if (service._running, service._waiting) == (1, 1):
+                break
+            time.sleep(0.01)
+
+        with self.assertRaisesMessage(ScraperServiceBusy, 'busy'):
+            client.search_jobs('python')
+        self.gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [2, 2])
+        self.assertEqual((service.stats['searches'], service.stats['rejected']), (2, 1))
+
+    def test_secret_is_required_when_configured(self):
+        service = self.start(secret='s3cret')
+
+        with self.assertRaisesMessage(ScraperServiceError, 'Unauthorized'):
+            ScraperClient(self.address, timeout=5).search_jobs('python')
+        with self.assertRaisesMessage(ScraperServiceError, 'Unauthorized'):
+            ScraperClient(self.address, timeout=5, secret='wrong').stats()
+        self.assertEqual(len(ScraperClient(self.address, timeout=5, secret='s3cret').search_jobs('python', max_results=1)), 1)
+        self.assertEqual(service.stats['unauthorized'], 2)
+
+    def test_refuses_non_loopback_tcp_without_a_secret(self):
+        with self.assertRaisesMessage(ScraperServiceError, 'without SCRAPER_SERVICE_SECRET'):
+            ScraperService('0.0.0.0:0').serve_forever()
+
+        service = ScraperService('127.0.0.1:0')
+        threading.Thread(target=service.serve_forever, daemon=True).start()
+        for _ in range(100):
+            if service._server is not None:
+                break
+            time.sleep(0.01)
+        self.assertIsNotNone(service._server)
+        service.shutdown()
@@ -1,108 +1,39 @@
 from django.shortcuts import render,redirect
-import PyPDF2
-import docx
-import joblib
-import os
+from django.urls import reverse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.template.loader import render_to_string
+from django.views.decorators.csrf import csrf_exempt
+from asgiref.sync import sync_to_async
+import functools
+import hmac
+import time
+import zipfile
+from urllib.parse import urlencode
+from django.core.files.base import ContentFile
 from django.conf import settings
-from app1.naukri_scrapper import SeleniumNaukriScraper
+from app1.async_search import SearchTimeout, iterate_in_executor, search_jobs_async
+from app1.extraction_pool import extraction_stats
+from app1.job_index import top_jobs_for_skill
+from app1.job_search import search_jobs, search_skill_for, search_stats, stream_jobs
+from app1.ml_models import get_models, memory_usage
+from app1.models import PipelineTask
+from app1.pipeline import enqueue, task_status
+from app1.ranking import ResumeJobRanker
+from app1.resume_cache import get_resume_cache
+from app1.resume_text import RESUME_EXTENSIONS
+from app1.retrieval_index import nearest_jobs
+from app1.job_store import job_fingerprint
 
 from django.views import View 
 from django.contrib import messages  
 
 
-def load_models():
+# Loaded once per process, failing loudly (see app1/ml_models.py); under
+# gunicorn the master loads them before forking the workers
+model, vectorizer, encoder = get_models()
 
-    try:
-            
-        models_dir = os.path.join(settings.BASE_DIR, 'job_suggestor', 'trained_models')
-        
-        model_path = os.path.join(models_dir, 'resume_classifier_model.pkl')
-        vectorizer_path = os.path.join(models_dir, 'tfidf_vectorizer.pkl')
-        encoder_path = os.path.join(models_dir, 'label_encoder.pkl')
-        
-        print(f"🔍 Loading models from: {models_dir}")
-        
-        
-        model = joblib.load(model_path)
-        vectorizer = joblib.load(vectorizer_path)
-        encoder = joblib.load(encoder_path)
-
-       
-
-        
-        print("✅ Models loaded successfully!")
-        print(f"📊 Categories: {list(encoder.classes_)}")
-
-       
-        
-        return model, vectorizer, encoder
-        
-    except Exception as e:
-        print(f"❌ Error loading models: {e}")
-        return None, None, None
-
-
-model, vectorizer, encoder = load_models()
-
-def extract_text_from_file(file):
-    """Extract text from different file formats"""
-    text = ""
-    
-    if file.name.endswith('.pdf'):
-        try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        except Exception as e:
-            raise Exception(f"Error reading PDF: {str(e)}")
-    
-    elif file.name.endswith(('.doc', '.docx')):
-        try:
-            doc = docx.Document(file)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-        except Exception as e:
-            raise Exception(f"Error reading Word document: {str(e)}")
-    
-    elif file.name.endswith('.txt'):
-        try:
-            text = file.read().decode('utf-8')
-        except Exception as e:
-            raise Exception(f"Error reading text file: {str(e)}")
-    
-    else:
-        raise Exception("Unsupported file format")
-    
-    return text.strip()
-
-def predict_category(resume_text):
-    """Make prediction using loaded models"""
-    if model is None or vectorizer is None or encoder is None:
-        raise Exception("ML models are not loaded properly")
-    
-    
-    text_tfidf = vectorizer.transform([resume_text])
-    
-    
-    prediction_encoded = model.predict(text_tfidf)[0]
-    prediction_label = encoder.inverse_transform([prediction_encoded])[0]
-    
-    
-    probabilities = model.predict_proba(text_tfidf)[0]
-    confidence = max(probabilities)
-    
-    
-    all_categories = encoder.classes_
-    category_probabilities = {
-        category: round(prob * 100, 2) 
-        for category, prob in zip(all_categories, probabilities)
-    }
-    
-    return {
-        'category': prediction_label,
-        'confidence': round(confidence * 100, 2),
-        'all_probabilities': category_probabilities
-    }
+ranker = ResumeJobRanker(vectorizer, weight=getattr(settings, 'RESUME_SIMILARITY_WEIGHT', 0.5))
 
 def home(request):
     resume_text = ""
@@ -115,16 +46,27 @@ def home(request):
             uploaded_file = request.FILES['resume_file']
             
             
-            resume_text = extract_text_from_file(uploaded_file)
+            # Hand the slow stages to the pipeline workers and let the
+            # page poll for the result
+            if getattr(settings, 'PIPELINE_ASYNC_UPLOADS', False):
+                task = enqueue(uploaded_file, location=request.POST.get('location', 'bangalore'))
+                request.session['pipeline_task'] = task.task_id
+                return redirect('pipeline_progress', task_id=task.task_id)
+            
+            
+            # Repeat uploads of the same file skip extraction and inference
+            resume_cache = get_resume_cache()
+            resume_text = resume_cache.extract(uploaded_file)
             
             
             
             
             if resume_text.strip():
-                prediction_result = predict_category(resume_text)
+                prediction_result = resume_cache.predict(resume_text)
                 print(f"🎯 PREDICTION: {prediction_result['category']}")
                 print(f"📊 CONFIDENCE: {prediction_result['confidence']}%")
                 request.session['prediction_result'] = prediction_result['category']
+                request.session['resume_text'] = resume_text[:20000]
                 return redirect('test_scraper')
             
         except Exception as e:
@@ -152,45 +94,23 @@ def result_views(request):
 class JobRecommendationsView(View):
     """
     Show job recommendations from Naukri.com using Selenium
+
+    An async view: under ASGI, session, cache and DB work is awaited and a
+    scrape runs on the bounded scrape executor (see app1/async_search.py)
+    with a per-request timeout, so one process serves many users while a
+    few scrapes are in flight. It works unchanged under WSGI.
     """
-    def get(self, request):
-        prediction_result = request.session.get('prediction_result')
+    async def get(self, request):
+        prediction_result, resume_text, confidence = await sync_to_async(self._session_values)(request)
         
         print(f"\n🎯 Starting Selenium-based job search for: {prediction_result}")
         
         if not prediction_result:
-            messages.warning(request, 'Please upload a resume first to get job recommendations')
+            await sync_to_async(messages.warning)(request, 'Please upload a resume first to get job recommendations')
             return redirect('home')
         
         
-        skill_mapping = {
-            'Data Science': 'data science',
-            'HR': 'human resources',
-            'Design': 'graphic design',
-            'Information Technology': 'software development',
-            'Teacher': 'teaching',
-            'Advocate': 'lawyer',
-            'Business Development': 'business development',
-            'Healthcare': 'healthcare',
-            'Fitness': 'fitness trainer',
-            'Agriculture': 'agriculture',
-            'BPO': 'customer service',
-            'Sales': 'sales',
-            'Mechanical Engineer': 'mechanical engineering',
-            'Java Developer': 'java developer',
-            'Automobile': 'automobile engineering',
-            'Digital Marketing': 'digital marketing',
-            'Civil Engineer': 'civil engineering',
-            'Operations Manager': 'operations management',
-            'Electrical Engineering': 'electrical engineering',
-            'Network Security Engineer': 'network security',
-            'Python Developer': 'python developer',
-            'ERP': 'ERP consultant',
-            'DotNet Developer': '.net developer',
-            'Web Designing': 'web designer',
-        }
-        
-        search_skill = skill_mapping.get(prediction_result, prediction_result.lower())
+        search_skill = search_skill_for(prediction_result)
         
         
         location = request.GET.get('location', 'bangalore')
@@ -201,23 +121,24 @@ class JobRecommendationsView(View):
         print(f"  Location: {location}")
         print(f"  Experience: {experience}")
         
+        stream = request.GET.get('stream')
+        if stream == '1' or (stream is None and getattr(settings, 'RECOMMENDATION_STREAMING', False)):
+            return self._streaming_response(request, prediction_result, search_skill, location, confidence)
         
-        scraper = None
         jobs = []
         
         try:
             
-            scraper = SeleniumNaukriScraper(headless=True)
-            
-            
-            jobs = scraper.search_jobs(
+            jobs, tier = await search_jobs_async(
                 skill=search_skill,
                 location=location,
-                experience=experience,
                 max_results=15
             )
             
-            print(f"\n✅ Selenium search completed: {len(jobs)} jobs found")
+            print(f"\n✅ Search completed ({tier} tier): {len(jobs)} jobs found")
+            
+        except SearchTimeout as e:
+            print(f"⏱️ {e}; showing stored jobs")
             
         except Exception as e:
             print(f"❌ Selenium error: {e}")
@@ -229,17 +150,13 @@ class JobRecommendationsView(View):
                 print("🔄 Providing fallback sample jobs...")
                 jobs = self._get_sample_jobs(search_skill, location)
         
-        finally:
-        
-            if scraper:
-                try:
-                    scraper.close()
-                except:
-                    pass
         
+        jobs = await sync_to_async(self._recommend)(jobs, search_skill, location, resume_text)
         
-        jobs = self._match_jobs_with_skill(jobs, search_skill)
-        
+        # A timed-out scrape with nothing stored for the search still shows something
+        if not jobs:
+            print("🔄 Providing fallback sample jobs...")
+            jobs = self._get_sample_jobs(search_skill, location)
         
         if jobs:
             print(f"\n📋 FINAL JOBS TO DISPLAY ({len(jobs)}):")
@@ -254,10 +171,136 @@ class JobRecommendationsView(View):
             'jobs': jobs,
             'location': location,
             'total_jobs': len(jobs),
-            'confidence': request.session.get('confidence', 0)
+            'confidence': confidence
         }
         
-        return render(request, 'jobs/job_recommendations.html', context)
+        return await sync_to_async(render)(request, 'jobs/job_recommendations.html', context)
+    
+    def _streaming_response(self, request, prediction_result, search_skill, location, confidence):
+        """
+        Chunked HTML version of the page (?stream=1)
+        
+        The page head goes out at once, then one card per job as it is
+        found: cached or stored jobs first, then scraped jobs as the parser
+        yields them. Cards arrive in the order found, not ranked.
+        """
+        chunks = self._stream_chunks({
+            'prediction_result': prediction_result,
+            'search_skill': search_skill,
+            'location': location,
+            'confidence': confidence,
+        })
+        if isinstance(request, ASGIRequest):
+            chunks = iterate_in_executor(chunks)
+        
+        response = StreamingHttpResponse(chunks, content_type='text/html; charset=utf-8')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
+    def _stream_chunks(self, context):
+        search_skill, location = context['search_skill'], context['location']
+        yield render_to_string('job_stream_head.html', context)
+        
+        started = time.perf_counter()
+        shown = 0
+        tier = None
+        try:
+            for job, tier in stream_jobs(search_skill, location, max_results=15):
+                if shown == 0:
+                    print(f"⚡ First job streamed after {time.perf_counter() - started:.2f}s ({tier} tier)")
+                shown += 1
+                yield self._job_card(job, search_skill)
+        except Exception as e:
+            print(f"❌ Streaming search error: {e}")
+            import traceback
+            traceback.print_exc()
+            
+            if not shown:
+                print("🔄 Providing fallback sample jobs...")
+                for job in self._get_sample_jobs(search_skill, location):
+                    shown += 1
+                    yield self._job_card(job, search_skill)
+        
+        print(f"\n✅ Streamed {shown} jobs in {time.perf_counter() - started:.2f}s")
+        yield render_to_string('job_stream_tail.html', dict(context, total_jobs=shown, tier=tier))
+    
+    def _job_card(self, job, search_skill):
+        if 'relevance_score' not in job:
+            self._match_jobs_with_skill([job], search_skill)
+        return render_to_string('job_card.html', {'job': job})
+    
+    def _session_values(self, request):
+        """Session reads hit the session store, so they run off the event loop"""
+        return (
+            request.session.get('prediction_result'),
+            request.session.get('resume_text'),
+            request.session.get('confidence', 0),
+        )
+    
+    def _recommend(self, jobs, search_skill, location, resume_text):
+        """Rank and personalize the candidates (DB and CPU work, run in a thread)"""
+        # Candidates are the fresh scrape plus the stored jobs BM25 ranks for
+        # this search, so a few weak stored matches cannot crowd out a full scrape
+        ranked_jobs = self._rank_stored_jobs(
+            search_skill, location,
+            limit=getattr(settings, 'RECOMMENDATION_CANDIDATES', 200)
+        )
+        jobs = self._merge_candidates(self._match_jobs_with_skill(jobs, search_skill), ranked_jobs)
+        
+        
+        # Personalize: blend each job's similarity to the uploaded resume
+        if resume_text:
+            jobs = self._add_nearest_jobs(jobs, resume_text, search_skill, location)
+            jobs = ranker.rank(resume_text, jobs)
+        return jobs[:15]
+    
+    def _merge_candidates(self, scraped_jobs, ranked_jobs):
+        """
+        Scraped and BM25-ranked jobs, one per fingerprint, best first
+        
+        The two scores are on different scales, so each list's
+        relevance_score is scaled to 0-1 first (substring scores by their
+        maximum of 6, BM25 by the best hit) and a job in both lists keeps
+        the higher one.
+        """
+        best_bm25 = max((job['relevance_score'] for job in ranked_jobs), default=0) or 1
+        merged = {}
+        for jobs, scale in ((scraped_jobs, 6), (ranked_jobs, best_bm25)):
+            for job in jobs:
+                score = round(max(job.get('relevance_score', 0), 0) / scale, 3)
+                fingerprint = job_fingerprint(job)
+                if fingerprint not in merged or score > merged[fingerprint]['relevance_score']:
+                    merged[fingerprint] = dict(job, relevance_score=score)
+        return sorted(merged.values(), key=lambda job: job['relevance_score'], reverse=True)
+    
+    def _rank_stored_jobs(self, skill, location, limit=15):
+        """Top jobs for the skill from the BM25 full-text index"""
+        try:
+            return top_jobs_for_skill(skill, location, limit=limit)
+        except Exception as e:
+            print(f"⚠️ Full-text ranking unavailable: {e}")
+            return []
+    
+    def _add_nearest_jobs(self, jobs, resume_text, skill, location):
+        """Add the stored jobs for this search closest to the resume from the vector index"""
+        try:
+            nearest = nearest_jobs(
+                vectorizer.transform([resume_text]),
+                k=getattr(settings, 'JOB_VECTOR_INDEX_TOPK', 100),
+                skill=skill, location=location,
+            )
+        except Exception as e:
+            print(f"⚠️ Vector index unavailable: {e}")
+            return jobs
+        
+        seen = {job_fingerprint(job) for job in jobs}
+        for job in nearest:
+            if job_fingerprint(job) not in seen:
+                seen.add(job_fingerprint(job))
+                jobs.append(job)
+        return jobs
     
     def _match_jobs_with_skill(self, jobs, skill):
         """Calculate relevance score for each job"""
@@ -316,19 +359,21 @@ class JobRecommendationsView(View):
 
 def test_selenium_view(request):
     """Test Selenium scraper directly"""
-    skill =  request.session.get('prediction_result')
+    category = request.session.get('prediction_result')
+    if not category:
+        return redirect('home')
+    
+    skill = search_skill_for(category)
     location = request.GET.get('location', 'bangalore')
     
     print(f"\n🧪 TESTING SELENIUM SCRAPER")
     print(f"Skill: {skill}")
     print(f"Location: {location}")
     
-    scraper = SeleniumNaukriScraper(headless=True)  
-    
     try:
-        jobs = scraper.search_jobs(skill, location, max_results=10)
+        jobs, tier = search_jobs(skill, location, max_results=10)
         
-        print(f"\n✅ Found {len(jobs)} jobs")
+        print(f"\n✅ Found {len(jobs)} jobs ({tier} tier)")
         
         
         for i, job in enumerate(jobs, 1):
@@ -352,7 +397,197 @@ def test_selenium_view(request):
             'location': location,
             'jobs': []
         })
-    
-    finally:
-        if 'scraper' in locals():
-            scraper.close()
\ No newline at end of file
+
+
+def scraper_stats(request):
+    """Scraping and resume cache counters and memory of this worker process"""
+    stats = search_stats()
+    stats['resume_cache'] = get_resume_cache().hit_rates()
+    stats['extraction'] = extraction_stats()
+    stats['memory'] = memory_usage()
+    return JsonResponse(stats)
+
+
+def _batch_uploads(files):
+    """
+    Uploaded resumes as (name, file) pairs, expanding .zip archives
+
+    Limits are checked against each uploaded file's size and each zip
+    member's header before it is inflated (zipfile never reads past the
+    declared file_size), so a zip bomb or an archive of thousands of files
+    is rejected up front. A file over settings.RESUME_BATCH_MAX_FILE_BYTES
+    is paired with None instead of its contents.
+
+    Raises:
+        ValueError: More files than settings.RESUME_BATCH_MAX_FILES, or
+                    more than settings.RESUME_BATCH_MAX_TOTAL_BYTES of
+                    resumes in all
+    """
+    max_files = getattr(settings, 'RESUME_BATCH_MAX_FILES', 500)
+    max_bytes = getattr(settings, 'RESUME_BATCH_MAX_FILE_BYTES', 10 * 1024 * 1024)
+    max_total_bytes = getattr(settings, 'RESUME_BATCH_MAX_TOTAL_BYTES', 200 * 1024 * 1024)
+
+    uploads = []
+    total_bytes = 0
+    for uploaded in files:
+        if not uploaded.name.lower().endswith('.zip'):
+            _check_batch_size(uploads, max_files)
+            if uploaded.size > max_bytes:
+                uploads.append((uploaded.name, None))
+                continue
+            total_bytes = _check_batch_bytes(total_bytes + uploaded.size, max_total_bytes)
+            uploads.append((uploaded.name, uploaded))
+            continue
+        with zipfile.ZipFile(uploaded) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or not member.filename.lower().endswith(RESUME_EXTENSIONS):
+                    continue
+                _check_batch_size(uploads, max_files)
+                if member.file_size > max_bytes:
+                    uploads.append((member.filename, None))
+                    continue
+                total_bytes = _check_batch_bytes(total_bytes + member.file_size, max_total_bytes)
+                uploads.append((member.filename, ContentFile(archive.read(member), name=member.filename)))
+    return uploads
+
+
+def _check_batch_size(uploads, max_files):
+    """Raise before adding one more file to a full batch"""
+    if len(uploads) >= max_files:
+        raise ValueError(f"At most {max_files} resumes per batch")
+
+
+def _check_batch_bytes(total_bytes, max_total_bytes):
+    """The batch's running size, raising once it is over the limit"""
+    if total_bytes > max_total_bytes:
+        raise ValueError(f"Batches may hold at most {max_total_bytes // 2**20}MB of resumes")
+    return total_bytes
+
+
+def api_key_required(view):
+    """
+    Open a JSON API view to scripts: exempt it from CSRF and require
+    'Authorization: Bearer <key>' with one of settings.API_KEYS instead
+
+    With no keys configured the API is closed.
+    """
+    @csrf_exempt
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        keys = getattr(settings, 'API_KEYS', [])
+        if not keys:
+            return JsonResponse({'error': 'The API is disabled; set API_KEYS to enable it'}, status=403)
+        scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not any(hmac.compare_digest(key.encode(), k.encode()) for k in keys):
+            return JsonResponse({'error': 'Invalid or missing API key'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@api_key_required
+def classify_batch(request):
+    """
+    Classify many resumes in one request
+
+    POST one or more 'resume_files' (PDF, DOCX, TXT or a .zip of them).
+    Text is extracted from all files in parallel on the extraction pool,
+    then all resumes are vectorized and classified in a single pass.
+    Returns JSON with one result per file. Needs an API key (see
+    api_key_required).
+    """
+    if request.method != "POST":
+        return JsonResponse({'error': 'POST resume_files to classify them'}, status=405)
+
+    files = request.FILES.getlist('resume_files')
+    if not files:
+        return JsonResponse({'error': 'No resume_files uploaded'}, status=400)
+
+    try:
+        uploads = _batch_uploads(files)
+    except (ValueError, zipfile.BadZipFile) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    resume_cache = get_resume_cache()
+    results = [{'file': name} for name, _ in uploads]
+    for result, (_, file) in zip(results, uploads):
+        if file is None:
+            result['error'] = 'File too large'
+
+    # Every file is handed to the extraction pool before any is waited on
+    extracting = [(result, file) for result, (_, file) in zip(results, uploads) if file is not None]
+    extracted = resume_cache.extract_many([file for _, file in extracting])
+    texts = []
+    for (result, _), (text, error) in zip(extracting, extracted):
+        if error is not None:
+            result['error'] = str(error)
+        elif not text:
+            result['error'] = 'No text found'
+        else:
+            texts.append((result, text))
+
+    started = time.perf_counter()
+    predictions = resume_cache.predict_many([text for _, text in texts])
+    for (result, _), prediction in zip(texts, predictions):
+        result.update(prediction)
+    elapsed = time.perf_counter() - started
+
+    print(f"📊 Batch classified {len(texts)}/{len(results)} resumes in {elapsed * 1e3:.1f}ms")
+    return JsonResponse({
+        'total': len(results),
+        'classified': len(texts),
+        'failed': len(results) - len(texts),
+        'results': results,
+    })
+
+
+@api_key_required
+def pipeline_upload(request):
+    """
+    Queue a resume for background processing
+
+    POST 'resume_file' (and optionally 'location'); returns 202 with the
+    task ID and the URL to poll. Needs an API key (see api_key_required).
+    """
+    if request.method != "POST" or not request.FILES.get('resume_file'):
+        return JsonResponse({'error': 'POST a resume_file'}, status=400)
+
+    try:
+        task = enqueue(request.FILES['resume_file'], location=request.POST.get('location', 'bangalore'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    request.session['pipeline_task'] = task.task_id
+    return JsonResponse({
+        'task_id': task.task_id,
+        'status_url': reverse('pipeline_status', args=[task.task_id]),
+    }, status=202)
+
+
+def pipeline_progress(request, task_id):
+    """Page that polls pipeline_status until the upload has been processed"""
+    return render(request, 'pipeline_progress.html', {
+        'task_id': task_id,
+        'status_url': reverse('pipeline_status', args=[task_id]),
+    })
+
+
+def pipeline_status(request, task_id):
+    """
+    Status of a queued upload as JSON
+
+    Once the task is done, the session that uploaded it gets the prediction
+    and resume text (as the synchronous upload would have stored) and a
+    'next_url' to the job results, which the search stage already cached.
+    """
+    status = task_status(task_id)
+    if status is None:
+        return JsonResponse({'error': 'Unknown task'}, status=404)
+
+    if status['status'] == PipelineTask.DONE and request.session.get('pipeline_task') == task_id:
+        result = PipelineTask.objects.values_list('result', 'location').get(task_id=task_id)
+        request.session['prediction_result'] = result[0]['category']
+        request.session['resume_text'] = result[0]['resume_text']
+        request.session.pop('pipeline_task')
+        status['next_url'] = f"{reverse('test_scraper')}?{urlencode({'location': result[1]})}"
+
+    return JsonResponse(status)
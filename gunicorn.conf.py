@@ -0,0 +1,36 @@
+"""
+Gunicorn settings: gunicorn -c gunicorn.conf.py
+
+The app (and with it the ML models, see app1/ml_models.py) is loaded once in
+the master before the workers fork, so they share its memory copy-on-write;
+the model arrays themselves are memory-mapped and shared via the page cache.
+"""
+
+import os
+
+wsgi_app = 'job_suggestor.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 3))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = True
+
+
+def _memory_line(label):
+    from app1.ml_models import memory_usage
+
+    usage = memory_usage()
+    parts = ', '.join(f"{key}={usage[key] / 1024:.1f}MB" for key in ('rss', 'rss_anon', 'rss_file') if key in usage)
+    return f"📊 {label} pid {usage['pid']}: {parts}"
+
+
+def when_ready(server):
+    server.log.info(_memory_line("Master"))
+
+
+def post_fork(server, worker):
+    server.log.info(_memory_line(f"Worker {worker.age}"))
+
+
+def post_worker_init(worker):
+    # Report again once the worker has touched its own imports
+    worker.log.info(_memory_line(f"Worker {worker.age} ready"))
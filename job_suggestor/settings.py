@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -82,6 +83,23 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared on-disk cache so every worker process (and restarts) reuse scraped
+# job results; see app1/cache_backends.py
+
+CACHES = {
+    'default': {
+        'BACKEND': 'app1.cache_backends.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache.sqlite3',
+        'TIMEOUT': 7200,
+        'OPTIONS': {
+            'MAX_SIZE': 64 * 1024 * 1024,
+            'CULL_EVERY': 100,
+        },
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -122,3 +140,156 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Trained classifier artifacts (see app1/ml_models.py). With ML_MODELS_MMAP
+# their numpy arrays are memory-mapped and shared by all worker processes
+
+ML_MODELS_DIR = BASE_DIR / 'job_suggestor' / 'trained_models'
+ML_MODELS_MMAP = True
+
+# Resume text is extracted in separate, limited processes (see
+# app1/extraction_pool.py); a file that runs out of time keeps the text read
+# so far
+
+RESUME_EXTRACTION_WORKERS = 2
+RESUME_EXTRACTION_TIMEOUT = 10
+RESUME_EXTRACTION_CPU_TIME = 10
+RESUME_EXTRACTION_MEMORY_LIMIT = 1024 * 1024 * 1024
+RESUME_EXTRACTION_MAX_PAGES = 50
+RESUME_EXTRACTION_MAX_CHARS = 100000
+
+# Extracted resume text and predictions memoized by content hash (see
+# app1/resume_cache.py): an in-process LRU of this many bytes in front of
+# the shared cache, where entries live for RESUME_CACHE_TTL seconds
+
+RESUME_CACHE_MEMORY_BYTES = 16 * 1024 * 1024
+RESUME_CACHE_TTL = 7 * 86400
+
+# With PIPELINE_ASYNC_UPLOADS, uploads are queued in the PipelineTask table
+# and processed by `manage.py run_pipeline_worker` (see app1/pipeline.py)
+# while the page polls. The worker is REQUIRED: without one running, every
+# upload waits on its status page forever. Off by default, so uploads are
+# processed inside the request; set the PIPELINE_ASYNC_UPLOADS=1 environment
+# variable on deployments that run the worker.
+
+PIPELINE_ASYNC_UPLOADS = os.environ.get('PIPELINE_ASYNC_UPLOADS', '').lower() in ('1', 'true', 'yes')
+PIPELINE_WORKERS = 2
+PIPELINE_POLL_INTERVAL = 0.5
+PIPELINE_TASK_TIMEOUT = 300
+# Running tasks refresh heartbeat_at this often; keep well under the timeout
+PIPELINE_HEARTBEAT_INTERVAL = 30
+PIPELINE_MAX_ATTEMPTS = 3
+PIPELINE_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+# POST /classify-batch/ limits (files after expanding .zip uploads)
+RESUME_BATCH_MAX_FILES = 500
+RESUME_BATCH_MAX_FILE_BYTES = 10 * 1024 * 1024
+# Uncompressed size of everything read out of .zip uploads in one batch
+RESUME_BATCH_MAX_TOTAL_BYTES = 200 * 1024 * 1024
+DATA_UPLOAD_MAX_NUMBER_FILES = RESUME_BATCH_MAX_FILES
+
+# Keys accepted as 'Authorization: Bearer <key>' by the JSON upload APIs,
+# which scripts call without a CSRF token (comma-separated in the
+# API_KEYS environment variable; none configured closes the APIs)
+API_KEYS = [key for key in os.environ.get('API_KEYS', '').split(',') if key]
+
+
+# Job search tiers (see app1/job_search.py)
+
+NAUKRI_BASE_URL = 'https://www.naukri.com'
+SCRAPER_HTTP_TIER_ENABLED = True
+SCRAPER_HTTP_TIMEOUT = 10
+SCRAPER_SEARCH_BUDGET = 20
+
+# Parse only the job listing containers of a page with lxml (needs lxml;
+# falls back to a full html.parser parse when no container is found)
+SCRAPER_FAST_PARSE = True
+
+# Identical concurrent searches wait this long for the one in flight
+SCRAPER_SINGLEFLIGHT_TIMEOUT = 90
+
+# Cached searches are served fresh for JOB_CACHE_FRESH_FOR seconds, then
+# served stale while a background refresh runs, and dropped after JOB_CACHE_TTL
+JOB_CACHE_FRESH_FOR = 3600
+JOB_CACHE_TTL = 6 * 3600
+JOB_CACHE_MAX_RESULTS = 20
+
+# Scraped jobs persisted in the Job table are served (and refreshed in the
+# background) on a cache miss if they were seen within this many seconds
+JOB_STORE_MAX_AGE = 24 * 3600
+
+# `manage.py prewarm_job_cache` (run it from cron or with --loop)
+JOB_CACHE_PREWARM_LOCATIONS = ['bangalore', 'pune', 'hyderabad', 'chennai', 'mumbai', 'delhi']
+JOB_CACHE_PREWARM_CONCURRENCY = 2
+JOB_CACHE_PREWARM_RATE = 20
+JOB_CACHE_PREWARM_LEAD = 600
+JOB_CACHE_PREWARM_INTERVAL = 300
+
+
+# Selenium driver pool (see app1/driver_pool.py)
+
+SCRAPER_POOL_SIZE = 2
+SCRAPER_POOL_PREWARM = 1
+SCRAPER_POOL_MAX_PAGES = 50
+SCRAPER_POOL_MAX_AGE = 1800
+SCRAPER_POOL_CHECKOUT_TIMEOUT = 60
+
+# Run Selenium in a separate `manage.py run_scraper_service` process instead
+# of inside web workers: set to 'host:port' or a Unix socket path. The
+# service runs SCRAPER_POOL_SIZE searches at once, queues up to
+# SCRAPER_SERVICE_MAX_QUEUE more and answers 'busy' beyond that
+# (see app1/scraper_service.py)
+SCRAPER_SERVICE_ADDRESS = None
+# Shared secret every request to the service carries (the
+# SCRAPER_SERVICE_SECRET environment variable). Required for the service to
+# listen on anything but a Unix socket or a loopback address; it travels in
+# clear, so keep the service on a private network
+SCRAPER_SERVICE_SECRET = os.environ.get('SCRAPER_SERVICE_SECRET') or None
+SCRAPER_SERVICE_TIMEOUT = 60
+SCRAPER_SERVICE_MAX_QUEUE = 8
+SCRAPER_SERVICE_QUEUE_TIMEOUT = 30
+
+
+# Crawl frontier for `manage.py crawl_jobs` (see app1/crawler.py): follow
+# pagination up to CRAWL_MAX_RESULTS jobs per search, at most
+# CRAWL_HOST_RATE requests per second and CRAWL_HOST_CONCURRENCY in flight
+# per host. The limits apply per crawler process.
+
+CRAWL_MAX_RESULTS = 100
+CRAWL_MAX_PAGES = 10
+CRAWL_WORKERS = 4
+CRAWL_HOST_RATE = 0.5
+CRAWL_HOST_CONCURRENCY = 2
+CRAWL_MAX_ATTEMPTS = 3
+CRAWL_RETRY_DELAY = 60
+CRAWL_TASK_TIMEOUT = 120
+
+
+# Recommendations: candidates pulled from the full-text index are re-ranked
+# by TF-IDF similarity to the resume (see app1/ranking.py)
+
+RECOMMENDATION_CANDIDATES = 200
+# Share of a job's final score taken by its similarity to the resume; the
+# rest is its search relevance
+RESUME_SIMILARITY_WEIGHT = 0.5
+
+# JobRecommendationsView is async: scrapes run on a pool of this many threads
+# per process and a request waits at most RECOMMENDATION_SCRAPE_TIMEOUT
+# seconds for one before showing stored jobs (see app1/async_search.py)
+SCRAPER_ASYNC_WORKERS = 4
+RECOMMENDATION_SCRAPE_TIMEOUT = 25
+
+# Send the recommendations page as chunked HTML, one job card at a time,
+# without needing ?stream=1 (?stream=0 still gets the ranked page). Under
+# ASGI the streams step through their generators on their own pool of
+# SCRAPER_STREAM_WORKERS threads, so open streams cannot starve scrapes
+RECOMMENDATION_STREAMING = False
+SCRAPER_STREAM_WORKERS = 8
+
+
+# Top-k retrieval index over stored job vectors (see app1/retrieval_index.py);
+# rebuilt incrementally by `manage.py build_job_index`
+
+JOB_VECTOR_INDEX_DIR = BASE_DIR / 'job_index'
+JOB_VECTOR_INDEX_TOPK = 100
@@ -25,4 +25,9 @@ urlpatterns = [
     path('result/', result_views, name='result'),
     path('job-recommendations/', JobRecommendationsView.as_view(), name='job_recommendations'),
     path('test-scraper/', test_selenium_view, name='test_scraper'),
+    path('scraper-stats/', scraper_stats, name='scraper_stats'),
+    path('classify-batch/', classify_batch, name='classify_batch'),
+    path('pipeline/upload/', pipeline_upload, name='pipeline_upload'),
+    path('pipeline/<str:task_id>/', pipeline_progress, name='pipeline_progress'),
+    path('pipeline/<str:task_id>/status/', pipeline_status, name='pipeline_status'),
 ]
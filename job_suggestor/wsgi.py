@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_suggestor.settings')
 
 application = get_wsgi_application()
+
+# Load the ML models now rather than on the first request, so a broken
+# artifact stops the server from starting and, with gunicorn's preload_app,
+# the forked workers share the master's copy
+from app1.ml_models import get_models  # noqa: E402
+
+get_models()